@@ -4,7 +4,7 @@ from authors.validators import AuthorRecipeValidator
 from django import forms
 from django.core.exceptions import ValidationError
 from recipes.models import Recipe
-from utils.django_forms import add_attr
+from utils.django_forms import CoverImageField, add_attr
 
 
 class AuthorRecipeForm(forms.ModelForm):
@@ -20,6 +20,9 @@ class AuthorRecipeForm(forms.ModelForm):
         fields = 'title', 'description', 'preparation_time', \
             'preparation_time_unit', 'servings', 'servings_unit', \
             'preparation_steps', 'cover'
+        field_classes = {
+            'cover': CoverImageField,
+        }
         widgets = {
             'cover': forms.FileInput(
                 attrs={
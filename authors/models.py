@@ -1,9 +1,28 @@
 from django.contrib.auth import get_user_model
-from django.db import models
+from django.db import models, router
 
 User = get_user_model()
 
 
+class ProfileManager(models.Manager):
+    def create_missing(self, batch_size=1000):
+        """Creates the profiles that the post_save signal did not create.
+
+        Needed after bulk inserts of users, which skip the signal. Users
+        are read from the database the profiles are written to.
+        """
+        using = self._db or router.db_for_write(self.model)
+        user_ids = User.objects.using(using).filter(
+            profile__isnull=True
+        ).values_list('pk', flat=True)
+
+        return self.db_manager(using).bulk_create(
+            (self.model(author_id=user_id) for user_id in user_ids.iterator()),
+            batch_size=batch_size,
+        )
+
+
 class Profile(models.Model):
+    objects = ProfileManager()
     author = models.OneToOneField(User, on_delete=models.CASCADE)
     bio = models.TextField(default='', blank=True)
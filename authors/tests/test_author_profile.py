@@ -0,0 +1,35 @@
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+
+from authors.models import Profile
+
+
+class ReadFromReplicaRouter:
+    def db_for_read(self, model, **hints):
+        return 'replica'
+
+
+class AuthorProfileTest(TestCase):
+    def test_create_missing_creates_the_profiles_skipped_by_bulk_create(self):
+        users = User.objects.bulk_create(
+            User(username=f'user{i}') for i in range(3)
+        )
+
+        Profile.objects.create_missing()
+
+        self.assertEqual(
+            set(Profile.objects.values_list('author__username', flat=True)),
+            {user.username for user in users},
+        )
+
+    @override_settings(DATABASE_ROUTERS=[ReadFromReplicaRouter()])
+    def test_create_missing_reads_users_from_the_database_it_writes(self):
+        User.objects.bulk_create([User(username='user')])
+
+        Profile.objects.create_missing()
+
+        self.assertTrue(
+            Profile.objects.using('default').filter(
+                author__username='user'
+            ).exists()
+        )
@@ -0,0 +1,163 @@
+import os
+from io import BytesIO
+from pathlib import Path
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from PIL import Image
+from recipes.models import Recipe
+from recipes.tests.test_recipe_api import RecipeApiV2TestMixin
+from recipes.tests.test_recipe_base import TemporaryDirectoryMixin
+from recipes.tests.test_recipe_cover_metadata import make_uploaded_image
+from rest_framework.test import APITestCase
+from utils.uploads import CoverUploadHandler
+
+
+class CoverUploadMixin(TemporaryDirectoryMixin):
+    def get_directory_settings(self, directory):
+        self.temp_dir = Path(directory) / 'covers-tmp'
+        return {
+            **super().get_directory_settings(directory),
+            'COVER_UPLOAD_TEMP_DIR': self.temp_dir,
+        }
+
+    def get_leftover_uploads(self):
+        if not self.temp_dir.exists():
+            return []
+        return os.listdir(self.temp_dir)
+
+
+class AuthorRecipeCoverUploadTest(CoverUploadMixin, TestCase):
+    def setUp(self) -> None:
+        super_setup = super().setUp()
+        User.objects.create_user(username='my_user', password='my_pass')
+        self.client.login(username='my_user', password='my_pass')
+        return super_setup
+
+    def post_recipe(self, cover):
+        return self.client.post(
+            reverse('authors:dashboard_recipe_new'),
+            data={
+                'title': 'Recipe with cover',
+                'description': 'Recipe description',
+                'preparation_time': 10,
+                'preparation_time_unit': 'Minutos',
+                'servings': 2,
+                'servings_unit': 'Porções',
+                'preparation_steps': 'Steps',
+                'cover': cover,
+            },
+            follow=True,
+        )
+
+    def test_cover_upload_is_saved_without_leftover_temp_files(self):
+        self.post_recipe(make_uploaded_image())
+
+        recipe = Recipe.objects.get()
+        self.assertTrue(os.path.exists(recipe.cover.path))
+        self.assertEqual(recipe.cover_width, Recipe.COVER_WIDTH)
+        self.assertEqual(self.get_leftover_uploads(), [])
+
+    @override_settings(COVER_UPLOAD_MAX_BYTES=1000)
+    def test_cover_upload_over_the_byte_limit_is_rejected(self):
+        response = self.post_recipe(make_uploaded_image())
+
+        self.assertIn(
+            'Cover must be smaller than', response.content.decode('utf-8')
+        )
+        self.assertFalse(Recipe.objects.exists())
+        self.assertEqual(self.get_leftover_uploads(), [])
+
+    @override_settings(COVER_UPLOAD_MAX_WIDTH=1000)
+    def test_cover_upload_over_the_dimension_limit_is_rejected(self):
+        response = self.post_recipe(make_uploaded_image(size=(1200, 600)))
+
+        self.assertIn(
+            'Cover must be at most 1000x8000 pixels',
+            response.content.decode('utf-8'),
+        )
+        self.assertFalse(Recipe.objects.exists())
+        self.assertEqual(self.get_leftover_uploads(), [])
+
+    def test_cover_header_is_parsed_once(self):
+        buffer = BytesIO()
+        # The image size comes after a few upload chunks of ICC profile
+        Image.new('RGB', (1200, 600)).save(
+            buffer, 'JPEG', icc_profile=b'\0' * 200 * 1024
+        )
+        cover = SimpleUploadedFile(
+            'cover.jpg', buffer.getvalue(), content_type='image/jpeg'
+        )
+        check_header = CoverUploadHandler.check_header
+
+        with patch.object(
+            CoverUploadHandler, 'check_header', autospec=True,
+            side_effect=check_header,
+        ) as mock:
+            self.post_recipe(cover)
+
+        self.assertEqual(mock.call_count, 1)
+        self.assertTrue(Recipe.objects.exists())
+
+
+class AdminRecipeCoverUploadTest(CoverUploadMixin, TestCase):
+    def setUp(self) -> None:
+        super_setup = super().setUp()
+        User.objects.create_superuser(username='admin', password='pass')
+        self.client.login(username='admin', password='pass')
+        return super_setup
+
+    @override_settings(COVER_UPLOAD_MAX_WIDTH=1000)
+    def test_admin_reports_why_a_cover_was_rejected(self):
+        response = self.client.post(
+            reverse('admin:recipes_recipe_add'),
+            data={
+                'title': 'Recipe with cover',
+                'cover': make_uploaded_image(size=(1200, 600)),
+            },
+        )
+
+        self.assertContains(response, 'Cover must be at most 1000x8000')
+        self.assertFalse(Recipe.objects.exists())
+
+
+class RecipeApiCoverUploadTest(
+    CoverUploadMixin, APITestCase, RecipeApiV2TestMixin
+):
+    def post_recipe(self, cover):
+        auth_data = self.get_auth_data()
+        return self.client.post(
+            reverse('recipes:recipes-api-list'),
+            data={**self.get_recipe_raw_data(), 'cover': cover},
+            HTTP_AUTHORIZATION=f'Bearer {auth_data.get("access_token")}',
+        )
+
+    def test_recipe_api_accepts_cover_within_limits(self):
+        response = self.post_recipe(make_uploaded_image())
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['cover_width'], Recipe.COVER_WIDTH)
+
+    @override_settings(COVER_UPLOAD_MAX_HEIGHT=100)
+    def test_recipe_api_rejects_cover_over_the_dimension_limit(self):
+        response = self.post_recipe(make_uploaded_image())
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            response.data['cover'], ['Cover must be at most 8000x100 pixels']
+        )
+
+    def test_recipe_api_rejects_a_cover_that_is_not_a_file(self):
+        auth_data = self.get_auth_data()
+        response = self.client.post(
+            reverse('recipes:recipes-api-list'),
+            data={**self.get_recipe_raw_data(), 'cover': 'not-a-file'},
+            format='json',
+            HTTP_AUTHORIZATION=f'Bearer {auth_data.get("access_token")}',
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('cover', response.data)
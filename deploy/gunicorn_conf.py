@@ -0,0 +1,110 @@
+"""Gunicorn settings, used with:
+
+    gunicorn -c deploy/gunicorn_conf.py project.wsgi:application
+
+Every value can be overridden with the GUNICORN_* environment variables
+below or on the command line.
+"""
+import gc
+import multiprocessing
+import os
+
+
+def env_int(name, default):
+    return int(os.environ.get(name) or default)
+
+
+cpu_count = multiprocessing.cpu_count()
+
+bind = os.environ.get('GUNICORN_BIND', 'unix:/run/gunicorn.socket')
+
+# Sync workers for the CPU bound rendering, GUNICORN_THREADS > 1 switches to
+# gthread for deployments that wait a lot on the database or the network
+workers = env_int('GUNICORN_WORKERS', cpu_count * 2 + 1)
+threads = env_int('GUNICORN_THREADS', 1)
+worker_class = 'gthread' if threads > 1 else 'sync'
+
+# Django is imported and warmed up once in the master, the workers get it
+# through copy-on-write pages instead of importing it again
+preload_app = os.environ.get('GUNICORN_PRELOAD', '1') == '1'
+
+# Recycling bounds slow memory growth, the jitter keeps the workers from
+# restarting all at once
+max_requests = env_int('GUNICORN_MAX_REQUESTS', 1000)
+max_requests_jitter = env_int(
+    'GUNICORN_MAX_REQUESTS_JITTER', max(max_requests // 10, 1)
+)
+
+timeout = env_int('GUNICORN_TIMEOUT', 30)
+graceful_timeout = env_int('GUNICORN_GRACEFUL_TIMEOUT', 30)
+keepalive = env_int('GUNICORN_KEEPALIVE', 5)
+
+# The heartbeat file is touched on every request, keep it off the disk
+if os.path.isdir('/dev/shm'):
+    worker_tmp_dir = '/dev/shm'
+
+# Static and media files are handed to the kernel with sendfile() when the
+# workers serve them themselves (WhiteNoise, FileResponse)
+sendfile = True
+
+loglevel = os.environ.get('GUNICORN_LOG_LEVEL', 'info')
+accesslog = os.environ.get('GUNICORN_ACCESS_LOG', '-')
+errorlog = os.environ.get('GUNICORN_ERROR_LOG', '-')
+
+
+def on_starting(server):
+    from dotenv import load_dotenv
+
+    # Django is not set up yet here (and never in the master without
+    # preload_app), read the .env like project/wsgi.py does
+    load_dotenv()
+
+    # Metrics files left by the workers of the previous run
+    directory = os.environ.get('METRICS_DIR', '')
+
+    if directory and os.path.isdir(directory):
+        for entry in os.scandir(directory):
+            if entry.name.startswith('metrics-'):
+                os.remove(entry.path)
+
+
+def child_exit(server, worker):
+    """Runs in the master when a worker exits or is recycled."""
+    from instrumentation.metrics import archive_process
+
+    directory = os.environ.get('METRICS_DIR', '')
+
+    # Counters must not go back when a worker is recycled, its values are
+    # added to the archive file that /metrics reads with the live workers
+    if directory:
+        archive_process(directory, worker.pid)
+
+
+def when_ready(server):
+    """Runs in the master after the app is loaded, before any fork."""
+    if not server.cfg.preload_app:
+        return
+
+    from django.conf import settings
+    from django.db import connections
+    from instrumentation.db.pool import close_pools
+    from utils.warmup import warm_up
+
+    # project/wsgi.py already compiled the templates with TEMPLATES_WARMUP
+    warm_up_steps = warm_up(templates=not settings.TEMPLATES_WARMUP)
+
+    for step, (count, seconds) in warm_up_steps.items():
+        server.log.info(
+            'Warm-up %s: %d loaded in %.0f ms', step, count, seconds * 1000
+        )
+
+    # Sockets opened in the master must not be shared by the workers
+    connections.close_all()
+    close_pools()
+
+    # Objects that survive until here live as long as the workers. Freezing
+    # them keeps the garbage collector from writing to their pages, which
+    # would copy them into every worker.
+    gc.collect()
+    gc.freeze()
+    server.log.info('Froze %d objects before forking', gc.get_freeze_count())
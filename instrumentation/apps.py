@@ -0,0 +1,16 @@
+from django.apps import AppConfig
+
+
+class InstrumentationConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'instrumentation'
+
+    def ready(self, *args, **kwargs) -> None:
+        from django.db.backends.signals import connection_created
+
+        from .db.sqlite import configure_connection
+        from .timings import instrument_template_rendering
+
+        instrument_template_rendering()
+        connection_created.connect(configure_connection)
+        return super().ready(*args, **kwargs)
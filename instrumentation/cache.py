@@ -0,0 +1,38 @@
+from django.core.cache.backends import locmem
+
+from .metrics import REGISTRY
+
+CACHE_REQUESTS = REGISTRY.counter(
+    'cache_requests_total', 'Cache lookups by cache alias and result.',
+    ['cache', 'result'],
+)
+
+
+class InstrumentedCacheMixin:
+    """Counts hits and misses of a cache backend for /metrics.
+
+    Only get() is wrapped, BaseCache builds get_many() and get_or_set() on
+    top of it.
+    """
+
+    def __init__(self, name, params):
+        options = dict(params.get('OPTIONS', {}))
+        self.metrics_name = options.pop('METRICS_NAME', name or 'default')
+        super().__init__(name, {**params, 'OPTIONS': options})
+
+    def record(self, hits, misses):
+        if hits:
+            CACHE_REQUESTS.inc(hits, cache=self.metrics_name, result='hit')
+        if misses:
+            CACHE_REQUESTS.inc(misses, cache=self.metrics_name, result='miss')
+
+    def get(self, key, default=None, version=None):
+        missing = object()
+        value = super().get(key, missing, version)
+        hit = value is not missing
+        self.record(hit, not hit)
+        return value if hit else default
+
+
+class LocMemCache(InstrumentedCacheMixin, locmem.LocMemCache):
+    pass
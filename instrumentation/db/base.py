@@ -0,0 +1,184 @@
+"""Database backend wrapping the engine set in WRAPPED_ENGINE.
+
+It adds connection metrics, health checks of persistent connections and an
+optional in-process pool::
+
+    'ENGINE': 'instrumentation.db',
+    'WRAPPED_ENGINE': 'django.db.backends.postgresql',
+    'CONN_MAX_AGE': 60,
+    'HEALTH_CHECKS': True,
+    'POOL_SIZE': 0,
+    'POOL_TIMEOUT': 10,
+"""
+import threading
+
+from django.db import DEFAULT_DB_ALIAS
+from django.db.utils import load_backend
+
+from ..metrics import REGISTRY
+from .pool import PoolTimeout, get_pool
+from .sqlite import optimize_before_close
+
+CONNECTIONS_OPENED = REGISTRY.counter(
+    'db_connections_opened_total', 'New database connections.', ['alias'],
+)
+CONNECTIONS_REUSED = REGISTRY.counter(
+    'db_connections_reused_total',
+    'Requests served by a persistent or pooled connection.', ['alias'],
+)
+POOL_WAITS = REGISTRY.counter(
+    'db_connection_pool_waits_total',
+    'Times a thread waited for a pooled connection.', ['alias'],
+)
+HEALTH_CHECK_FAILURES = REGISTRY.counter(
+    'db_connection_health_check_failures_total',
+    'Reused connections found broken and replaced.', ['alias'],
+)
+
+
+class ConnectionManagementMixin:
+    """Health checks, pooling and metrics for a Django DatabaseWrapper.
+
+    A persistent connection is checked with is_usable() the first time it
+    is used in a request (Django 4.1's CONN_HEALTH_CHECKS, which 4.0 does
+    not have). With POOL_SIZE, closing a connection gives it back to a pool
+    shared by the threads of the process, meant for gthread workers with
+    CONN_MAX_AGE = 0.
+    """
+
+    def __init__(self, settings_dict, alias=DEFAULT_DB_ALIAS):
+        super().__init__(settings_dict, alias)
+        self.health_checks = settings_dict.get('HEALTH_CHECKS', True)
+        # Whether the connection was checked since the request started
+        self.health_check_done = False
+        # Pool the current connection came from
+        self.pool = None
+        # Whether the current connection ran queries, see
+        # optimize_before_close()
+        self.queries_run = False
+
+    def get_new_connection(self, conn_params):
+        self.pool = None
+        self.queries_run = False
+
+        if not self.settings_dict.get('POOL_SIZE'):
+            CONNECTIONS_OPENED.inc(alias=self.alias)
+            return super().get_new_connection(conn_params)
+
+        self.pool = get_pool(
+            self.alias, conn_params, self.settings_dict['POOL_SIZE'],
+            self.settings_dict.get('POOL_TIMEOUT', 10),
+        )
+
+        while True:
+            try:
+                connection, reused, waited = self.pool.acquire(
+                    lambda: super(
+                        ConnectionManagementMixin, self
+                    ).get_new_connection(conn_params)
+                )
+            except PoolTimeout as error:
+                raise self.Database.OperationalError(str(error)) from error
+
+            if waited is not None:
+                POOL_WAITS.inc(alias=self.alias)
+
+            if not reused:
+                CONNECTIONS_OPENED.inc(alias=self.alias)
+                return connection
+
+            CONNECTIONS_REUSED.inc(alias=self.alias)
+            self.connection = connection
+
+            if not self.health_checks or self.is_usable():
+                return connection
+
+            # Broken while idle, e.g. closed by the database server
+            HEALTH_CHECK_FAILURES.inc(alias=self.alias)
+            self.connection = None
+            self.pool.discard()
+            close_quietly(connection)
+
+    def connect(self):
+        # A new connection needs no check, set before connect() as setting
+        # it up already goes through ensure_connection()
+        self.health_check_done = True
+        super().connect()
+
+    def ensure_connection(self):
+        if self.connection is not None and not self.health_check_done:
+            self.health_check_done = True
+            CONNECTIONS_REUSED.inc(alias=self.alias)
+
+            if self.health_checks and not self.in_atomic_block \
+                    and not self.is_usable():
+                HEALTH_CHECK_FAILURES.inc(alias=self.alias)
+                self.close()
+
+        super().ensure_connection()
+
+    def _cursor(self, *args, **kwargs):
+        # After super(), a new connection resets the flag
+        cursor = super()._cursor(*args, **kwargs)
+        self.queries_run = True
+        return cursor
+
+    def close_if_unusable_or_obsolete(self):
+        # Runs when a request starts and finishes. Its own queries must not
+        # count as the reuse of the connection.
+        self.health_check_done = True
+        super().close_if_unusable_or_obsolete()
+        self.health_check_done = False
+
+    def _close(self):
+        if self.connection is not None:
+            optimize_before_close(self)
+
+        if self.pool is None or self.connection is None:
+            return super()._close()
+
+        if self.in_atomic_block or (
+            self.errors_occurred and not self.is_usable()
+        ):
+            try:
+                return super()._close()
+            finally:
+                self.pool.discard()
+
+        if not self.autocommit:
+            self._rollback()
+
+        self.pool.release(self.connection)
+
+
+def close_quietly(connection):
+    try:
+        connection.close()
+    except Exception:
+        pass
+
+
+wrapper_classes = {}
+wrapper_classes_lock = threading.Lock()
+
+
+def DatabaseWrapper(settings_dict, alias=DEFAULT_DB_ALIAS):
+    """Instance of the wrapped engine's DatabaseWrapper with the mixin.
+
+    A function instead of a class so any engine can be wrapped, and engines
+    whose driver is not installed are never imported.
+    """
+    engine = settings_dict['WRAPPED_ENGINE']
+
+    with wrapper_classes_lock:
+        wrapper_class = wrapper_classes.get(engine)
+
+        if wrapper_class is None:
+            base_class = load_backend(engine).DatabaseWrapper
+            wrapper_class = wrapper_classes[engine] = type(
+                base_class.__name__,
+                (ConnectionManagementMixin, base_class),
+                {'__module__': __name__},
+            )
+
+    return wrapper_class(settings_dict, alias)
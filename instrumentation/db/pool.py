@@ -0,0 +1,109 @@
+import threading
+import time
+
+
+class PoolTimeout(Exception):
+    pass
+
+
+class ConnectionPool:
+    """Raw DB-API connections shared by the threads of a process.
+
+    At most ``max_size`` connections exist at once, a thread asking for one
+    while all are in use waits up to ``timeout`` seconds for another thread
+    to release one.
+    """
+
+    def __init__(self, max_size, timeout):
+        self.max_size = max_size
+        self.timeout = timeout
+        self.idle = []
+        self.size = 0
+        self.condition = threading.Condition()
+
+    def acquire(self, connect):
+        """Returns (connection, reused, waited seconds or None).
+
+        ``connect`` opens a new connection when none is idle and the pool
+        is not full.
+        """
+        waited = None
+
+        with self.condition:
+            if not self.idle and self.size >= self.max_size:
+                start = time.monotonic()
+
+                while not self.idle and self.size >= self.max_size:
+                    remaining = self.timeout - (time.monotonic() - start)
+
+                    if remaining <= 0:
+                        raise PoolTimeout(
+                            f'No connection released in {self.timeout}s, '
+                            f'all {self.max_size} are in use'
+                        )
+                    self.condition.wait(remaining)
+
+                waited = time.monotonic() - start
+
+            if self.idle:
+                # Last in first out, the least recently used ones can expire
+                return self.idle.pop(), True, waited
+
+            self.size += 1
+
+        try:
+            return connect(), False, waited
+        except BaseException:
+            self.discard()
+            raise
+
+    def release(self, connection):
+        with self.condition:
+            self.idle.append(connection)
+            self.condition.notify()
+
+    def discard(self):
+        """Frees the place of a connection that was closed."""
+        with self.condition:
+            self.size -= 1
+            self.condition.notify()
+
+    def close(self):
+        with self.condition:
+            idle, self.idle = self.idle, []
+            self.size -= len(idle)
+            self.condition.notify_all()
+
+        for connection in idle:
+            connection.close()
+
+
+pools = {}
+pools_lock = threading.Lock()
+
+
+def get_pool(alias, conn_params, max_size, timeout):
+    """Pool of the connections opened with ``conn_params``.
+
+    Changing the database settings of an alias (e.g. when the test database
+    is created) gives a new pool, idle connections to the old database are
+    never handed out for the new one.
+    """
+    key = (alias, repr(sorted(conn_params.items())))
+
+    with pools_lock:
+        pool = pools.get(key)
+
+        if pool is None:
+            pool = pools[key] = ConnectionPool(max_size, timeout)
+
+        return pool
+
+
+def close_pools():
+    """Closes the idle connections, e.g. before gunicorn forks."""
+    with pools_lock:
+        current = list(pools.values())
+
+    for pool in current:
+        pool.close()
@@ -0,0 +1,94 @@
+"""SQLite settings for several gunicorn workers sharing one database file.
+
+configure_connection() runs on connection_created with the PRAGMAs in
+SQLITE_PRAGMAS:
+
+- journal_mode=WAL lets readers go on while a writer commits, with the
+  default rollback journal a write blocks every reader.
+- synchronous=NORMAL syncs the WAL at checkpoints instead of at every
+  commit. A power loss can lose the last commits, never corrupt the file.
+- mmap_size and cache_size keep the hot pages in memory.
+- busy_timeout makes a writer wait for the lock instead of failing at once
+  with "database is locked".
+
+It also runs ``PRAGMA optimize`` at most once every SQLITE_OPTIMIZE_INTERVAL
+seconds per process, so the planner statistics follow the data. Before
+SQLite 3.46 it only analyzes what the connection's own queries used, so it
+runs when a connection that ran queries is closed or goes back to the pool
+(optimize_before_close(), called by instrumentation.db.base). That depends
+on connections being recycled: at the end of the first request after
+CONN_MAX_AGE seconds, or of every request with CONN_MAX_AGE = 0. With
+CONN_MAX_AGE = None it only runs when the worker exits. From 3.46 on
+``PRAGMA optimize=0x10002`` also works right after connecting.
+"""
+import logging
+import time
+
+from django.conf import settings
+
+logger = logging.getLogger('instrumentation.db')
+
+last_optimize = None
+
+
+def is_memory_database(connection):
+    name = str(connection.settings_dict['NAME'])
+    return name == ':memory:' or 'mode=memory' in name
+
+
+def apply_pragmas(raw_connection, pragmas):
+    for name, value in pragmas.items():
+        raw_connection.execute(f'PRAGMA {name} = {value}')
+
+
+def optimize(raw_connection, statement='PRAGMA optimize'):
+    global last_optimize
+
+    interval = settings.SQLITE_OPTIMIZE_INTERVAL
+    now = time.monotonic()
+
+    if not interval or (
+        last_optimize is not None and now - last_optimize < interval
+    ):
+        return False
+
+    last_optimize = now
+    raw_connection.execute(statement)
+    return True
+
+
+def is_tuned(connection):
+    return connection.vendor == 'sqlite' and bool(settings.SQLITE_PRAGMAS) \
+        and not is_memory_database(connection)
+
+
+def configure_connection(sender, connection, **kwargs):
+    if not is_tuned(connection):
+        return
+
+    # The driver connection, these statements are not the app's queries.
+    # Pooled connections go through here again on every request, the
+    # PRAGMAs take microseconds.
+    raw_connection = connection.connection
+
+    try:
+        apply_pragmas(raw_connection, settings.SQLITE_PRAGMAS)
+
+        if connection.Database.sqlite_version_info >= (3, 46):
+            optimize(raw_connection, 'PRAGMA optimize = 0x10002')
+    except connection.Database.Error:
+        # A locked database must not fail the request, the next connection
+        # tries again
+        logger.exception('Could not configure the SQLite connection')
+
+
+def optimize_before_close(connection):
+    # ANALYZE must not end up in a transaction that is rolled back
+    if not is_tuned(connection) or not connection.queries_run \
+            or connection.in_atomic_block or not connection.autocommit:
+        return
+
+    try:
+        optimize(connection.connection)
+    except connection.Database.Error:
+        logger.exception('Could not optimize the SQLite database')
@@ -0,0 +1,17 @@
+import os
+import sysconfig
+
+LIBRARY_PATHS = tuple({
+    sysconfig.get_paths()[name] + os.sep
+    for name in ('stdlib', 'purelib', 'platlib')
+}) + ('<', )
+INSTRUMENTATION_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def is_project_file(file_name):
+    """False for library, stdlib and frozen code and for the
+    instrumentation modules themselves, which never are the origin of a
+    query or an allocation.
+    """
+    return not file_name.startswith(LIBRARY_PATHS) \
+        and os.path.dirname(file_name) != INSTRUMENTATION_DIR
@@ -0,0 +1,59 @@
+import os
+import pstats
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from instrumentation.profiling import (get_profile_route_slug,
+                                       get_route_slug, list_profiles)
+
+
+class Command(BaseCommand):
+    help = (
+        'Merges the profiles saved by ProfilerMiddleware and prints the top '
+        'functions, optionally for a single URL name.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--directory', default=None,
+            help='Defaults to PROFILER_DIR.',
+        )
+        parser.add_argument('--route', help='Only this URL name.')
+        parser.add_argument(
+            '--sort', default='cumulative',
+            choices=['cumulative', 'tottime', 'ncalls'],
+        )
+        parser.add_argument('--limit', type=int, default=30)
+        parser.add_argument(
+            '--full-paths', action='store_true',
+            help='Keep the directories of the source files.',
+        )
+
+    def handle(self, *args, **options):
+        directory = options['directory'] or settings.PROFILER_DIR
+        paths = list_profiles(directory)
+
+        if options['route']:
+            slug = get_route_slug(options['route'])
+            paths = [
+                path for path in paths
+                if get_profile_route_slug(os.path.basename(path)) == slug
+            ]
+
+        if not paths:
+            raise CommandError(f'No profiles found in {directory}')
+
+        routes = sorted({
+            get_profile_route_slug(os.path.basename(path)) for path in paths
+        })
+        self.stdout.write(
+            f'{len(paths)} profiles, routes: {", ".join(routes)}'
+        )
+
+        stats = pstats.Stats(*paths, stream=self.stdout)
+
+        if not options['full_paths']:
+            stats.strip_dirs()
+
+        stats.sort_stats(options['sort']).print_stats(options['limit'])
@@ -0,0 +1,122 @@
+import json
+import sys
+from collections import Counter, defaultdict
+
+from django.core.management.base import BaseCommand, CommandError
+from utils.stats import percentile
+
+SORT_KEYS = {
+    'total': lambda group: sum(group['durations']),
+    'count': lambda group: len(group['durations']),
+    'p95': lambda group: percentile(sorted(group['durations']), 95),
+}
+
+
+def iter_slow_query_entries(lines):
+    """The slow query entries of a log, whatever the line prefix.
+
+    >>> list(iter_slow_query_entries([
+    ...     'WARNING {"event": "slow_query", "duration_ms": 3}',
+    ...     'INFO route=recipes:home',
+    ... ]))
+    [{'event': 'slow_query', 'duration_ms': 3}]
+    """
+    for line in lines:
+        start = line.find('{"event": "slow_query"')
+
+        if start == -1:
+            continue
+
+        try:
+            yield json.loads(line[start:])
+        except ValueError:
+            continue
+
+
+class Command(BaseCommand):
+    help = (
+        'Aggregates the slow query log by statement fingerprint and shows '
+        'which routes run each one, how often and how slowly.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'files', nargs='*', default=['-'],
+            help='Log files to read, - or nothing reads stdin.',
+        )
+        parser.add_argument('--route', help='Only this URL name.')
+        parser.add_argument(
+            '--sort', choices=sorted(SORT_KEYS), default='total',
+        )
+        parser.add_argument('--limit', type=int, default=20)
+        parser.add_argument(
+            '--plans', action='store_true',
+            help='Show the last captured plan of each statement.',
+        )
+
+    def read_entries(self, files):
+        for file_name in files:
+            if file_name == '-':
+                yield from iter_slow_query_entries(sys.stdin)
+                continue
+
+            try:
+                with open(file_name, encoding='utf-8') as file:
+                    yield from iter_slow_query_entries(file)
+            except OSError as error:
+                raise CommandError(str(error))
+
+    def group_entries(self, entries, route):
+        groups = defaultdict(lambda: {
+            'durations': [], 'routes': Counter(), 'params': set(),
+            'fingerprint': '', 'plan': None,
+        })
+
+        for entry in entries:
+            if route and entry.get('route') != route:
+                continue
+
+            group = groups[entry['fingerprint_id']]
+            group['durations'].append(entry['duration_ms'])
+            group['routes'][entry.get('route') or '-'] += 1
+            group['params'].add(entry.get('params_fingerprint'))
+            group['fingerprint'] = entry['fingerprint']
+            group['plan'] = entry.get('plan') or group['plan']
+
+        return groups
+
+    def handle(self, *args, **options):
+        groups = self.group_entries(
+            self.read_entries(options['files']), options['route']
+        )
+
+        if not groups:
+            self.stdout.write('No slow queries found')
+            return
+
+        ranked = sorted(
+            groups.items(), key=lambda item: SORT_KEYS[options['sort']](
+                item[1]
+            ), reverse=True,
+        )
+
+        for fingerprint_id, group in ranked[:options['limit']]:
+            durations = sorted(group['durations'])
+            routes = ', '.join(
+                f'{name} ({count})'
+                for name, count in group['routes'].most_common()
+            )
+            self.stdout.write(self.style.WARNING(
+                f'{fingerprint_id}  count={len(durations)} '
+                f'total={sum(durations):.0f}ms '
+                f'p50={percentile(durations, 50):.0f}ms '
+                f'p95={percentile(durations, 95):.0f}ms '
+                f'max={durations[-1]:.0f}ms '
+                f'distinct_params={len(group["params"])}'
+            ))
+            self.stdout.write(f'  routes: {routes}')
+            self.stdout.write(f'  {group["fingerprint"]}')
+
+            if options['plans'] and group['plan']:
+                for line in group['plan'].splitlines():
+                    self.stdout.write(f'    {line}')
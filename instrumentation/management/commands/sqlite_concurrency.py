@@ -0,0 +1,177 @@
+import logging
+import multiprocessing
+import os
+import sqlite3
+import tempfile
+import time
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.test import Client, override_settings
+from django.urls import reverse
+from recipes.models import Recipe
+from utils.stats import percentile
+
+WRITER_USERNAME = 'sqlite-concurrency-{}'
+
+
+def read(client, iteration):
+    return client.get(reverse('recipes:home'))
+
+
+def write(client, iteration):
+    recipe_id = client.recipe_id
+    return client.post(
+        reverse('authors:dashboard_recipe_edit', args=(recipe_id,)), {
+            'title': f'Benchmark recipe {recipe_id}',
+            'description': f'Edited {iteration} times',
+            'preparation_time': 10,
+            'preparation_time_unit': 'Minutos',
+            'servings': 2,
+            'servings_unit': 'Porções',
+            'preparation_steps': 'Mix everything.',
+        }
+    )
+
+
+def run_client(kind, number, deadline):
+    """Sends requests until the deadline, in a forked process."""
+    # Thousands of request log lines would hide the report
+    logging.disable(logging.CRITICAL)
+    client = Client(raise_request_exception=False)
+    request = read if kind == 'read' else write
+
+    if kind == 'write':
+        user = User.objects.get(username=WRITER_USERNAME.format(number))
+        client.force_login(user)
+        client.recipe_id = Recipe.objects.get(author=user).pk
+
+    latencies = []
+    errors = 0
+
+    while time.monotonic() < deadline:
+        start = time.perf_counter()
+        response = request(client, len(latencies))
+        latencies.append(time.perf_counter() - start)
+        errors += response.status_code >= 500
+
+    connections.close_all()
+    return kind, latencies, errors
+
+
+class Command(BaseCommand):
+    help = (
+        'Measures public page reads and dashboard recipe edits made at the '
+        'same time by several processes, like gunicorn workers sharing one '
+        'SQLite file. It runs on a copy of the default database, compare '
+        'the SQLite settings with --no-tuning.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--readers', type=int, default=4)
+        parser.add_argument('--writers', type=int, default=2)
+        parser.add_argument('--seconds', type=float, default=10)
+        parser.add_argument(
+            '--no-tuning', action='store_true',
+            help="SQLite's defaults instead of SQLITE_PRAGMAS.",
+        )
+
+    def copy_database(self, source, tuning):
+        directory = tempfile.mkdtemp()
+        name = os.path.join(directory, 'db.sqlite3')
+
+        with sqlite3.connect(source) as source_db, \
+                sqlite3.connect(name) as copy_db:
+            source_db.backup(copy_db)
+            # The journal mode is stored in the file
+            copy_db.execute(
+                f'PRAGMA journal_mode = {"WAL" if tuning else "DELETE"}'
+            )
+
+        copy_db.close()
+        source_db.close()
+        return directory, name
+
+    def create_writers(self, count):
+        for number in range(count):
+            user = User.objects.create_user(
+                WRITER_USERNAME.format(number), password=None
+            )
+            Recipe.objects.create(
+                author=user, title=f'Benchmark recipe {number}',
+                description='Not edited yet', preparation_time=10,
+                preparation_time_unit='Minutos', servings=2,
+                servings_unit='Porções', preparation_steps='Mix everything.',
+                is_published=False,
+            )
+
+    def run_clients(self, options):
+        deadline = time.monotonic() + options['seconds']
+        arguments = [
+            ('read', number, deadline) for number in range(options['readers'])
+        ] + [
+            ('write', number, deadline) for number in range(options['writers'])
+        ]
+        # Every process opens its own connection after the fork
+        connections.close_all()
+
+        with multiprocessing.get_context('fork').Pool(len(arguments)) as pool:
+            return pool.starmap(run_client, arguments)
+
+    def report(self, results, seconds):
+        header = (
+            f'{"requests":<10} {"count":>7} {"rps":>8} {"p50 ms":>8} '
+            f'{"p95 ms":>8} {"p99 ms":>8} {"errors":>7}'
+        )
+        self.stdout.write(header)
+        self.stdout.write('-' * len(header))
+
+        for kind in 'read', 'write':
+            latencies = sorted(
+                latency for result_kind, values, _ in results
+                if result_kind == kind for latency in values
+            )
+            errors = sum(
+                count for result_kind, _, count in results
+                if result_kind == kind
+            )
+            count = len(latencies)
+            self.stdout.write(
+                f'{kind:<10} {count:>7} {count / seconds:>8.1f} '
+                f'{percentile(latencies, 50) * 1000:>8.1f} '
+                f'{percentile(latencies, 95) * 1000:>8.1f} '
+                f'{percentile(latencies, 99) * 1000:>8.1f} '
+                f'{errors:>7}'
+            )
+
+    def handle(self, *args, **options):
+        connection = connections['default']
+
+        if connection.vendor != 'sqlite':
+            raise CommandError('The default database is not SQLite')
+
+        tuning = not options['no_tuning']
+        directory, name = self.copy_database(
+            connection.settings_dict['NAME'], tuning
+        )
+        connection.close()
+        connection.settings_dict['NAME'] = name
+
+        try:
+            with override_settings(
+                # The test client's host, and every read on the copy
+                ALLOWED_HOSTS=['testserver'], DATABASE_REPLICAS=[],
+                SQLITE_PRAGMAS=settings.SQLITE_PRAGMAS if tuning else {},
+            ):
+                self.create_writers(options['writers'])
+                results = self.run_clients(options)
+        finally:
+            connections.close_all()
+
+            for file_name in os.listdir(directory):
+                os.remove(os.path.join(directory, file_name))
+            os.rmdir(directory)
+
+        self.report(results, options['seconds'])
@@ -0,0 +1,185 @@
+import json
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Modules that should only be loaded by the code paths that need them
+HEAVY_MODULES = ('PIL', 'selenium', 'debug_toolbar')
+
+IMPORTTIME_RE = re.compile(
+    r'^import time:\s+(?P<self>\d+) \|\s+(?P<cumulative>\d+) \| '
+    r'(?P<indent>\s*)(?P<module>\S+)$'
+)
+
+# Runs in a fresh interpreter so the numbers are those of a cold start
+PROFILE_SCRIPT = '''
+import json, sys
+from time import perf_counter
+
+start = perf_counter()
+import django
+from django.apps import config
+from django.conf import settings
+
+phases = {}
+ready_times = {}
+create = config.AppConfig.create.__func__
+
+def timed_create(cls, entry):
+    app_config = create(cls, entry)
+    ready = app_config.ready
+
+    def timed_ready():
+        ready_start = perf_counter()
+        ready()
+        ready_times[app_config.label] = perf_counter() - ready_start
+
+    app_config.ready = timed_ready
+    return app_config
+
+config.AppConfig.create = classmethod(timed_create)
+phases['import django'] = perf_counter() - start
+
+step = perf_counter()
+settings.INSTALLED_APPS
+phases['settings'] = perf_counter() - step
+
+step = perf_counter()
+django.setup()
+phases['apps and models'] = \\
+    perf_counter() - step - sum(ready_times.values())
+phases['ready()'] = sum(ready_times.values())
+
+step = perf_counter()
+from django.urls import get_resolver
+get_resolver().url_patterns
+phases['urls and views'] = perf_counter() - step
+
+step = perf_counter()
+from django.core.wsgi import get_wsgi_application
+get_wsgi_application()
+phases['middleware'] = perf_counter() - step
+phases['total'] = perf_counter() - start
+
+sys.stdout.write(json.dumps({
+    'phases': phases,
+    'ready': ready_times,
+    'modules': sorted(sys.modules),
+}))
+'''
+
+
+def parse_importtime(output):
+    """{module: (self_us, cumulative_us, depth)} from -X importtime.
+
+    >>> parse_importtime(
+    ...     'import time: self [us] | cumulative | imported package\\n'
+    ...     'import time:       120 |        300 |   json.decoder\\n'
+    ...     'import time:        80 |        380 | json\\n'
+    ... )
+    {'json.decoder': (120, 300, 1), 'json': (80, 380, 0)}
+    """
+    modules = {}
+
+    for line in output.splitlines():
+        match = IMPORTTIME_RE.match(line)
+
+        if match:
+            modules[match['module']] = (
+                int(match['self']), int(match['cumulative']),
+                len(match['indent']) // 2,
+            )
+
+    return modules
+
+
+class Command(BaseCommand):
+    help = (
+        'Starts Django in a fresh interpreter and reports the time spent '
+        'per startup phase, per app ready() and per imported package.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=20)
+        parser.add_argument(
+            '--modules', action='store_true',
+            help='List single modules instead of top-level packages.',
+        )
+
+    def run_profile(self):
+        env = {
+            **os.environ,
+            'DJANGO_SETTINGS_MODULE': settings.SETTINGS_MODULE,
+        }
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', PROFILE_SCRIPT],
+            capture_output=True, text=True, env=env,
+            cwd=settings.BASE_DIR,
+        )
+
+        if result.returncode:
+            raise CommandError(f'Startup failed:\n{result.stderr}')
+
+        return json.loads(result.stdout), parse_importtime(result.stderr)
+
+    def get_import_rows(self, imports, single_modules):
+        """(name, self us, cumulative us or module count) rows."""
+        if single_modules:
+            return [
+                (name, self_us, cumulative)
+                for name, (self_us, cumulative, _) in imports.items()
+            ]
+
+        # Self time summed per top-level package, nested imports count for
+        # the package that owns them and not for the one importing them
+        packages = defaultdict(lambda: [0, 0])
+
+        for name, (self_us, _, _) in imports.items():
+            package = packages[name.split('.')[0]]
+            package[0] += self_us
+            package[1] += 1
+
+        return [(name, *values) for name, values in packages.items()]
+
+    def handle(self, *args, **options):
+        profile, imports = self.run_profile()
+
+        self.stdout.write(self.style.MIGRATE_HEADING('Startup phases'))
+
+        for phase, seconds in profile['phases'].items():
+            self.stdout.write(f'  {phase:<26} {seconds * 1000:>8.1f} ms')
+
+        self.stdout.write(self.style.MIGRATE_HEADING('App ready()'))
+
+        for label, seconds in sorted(
+            profile['ready'].items(), key=lambda item: -item[1]
+        ):
+            self.stdout.write(f'  {label:<26} {seconds * 1000:>8.2f} ms')
+
+        if options['modules']:
+            heading = 'Imports by self time (self ms / cumulative ms)'
+        else:
+            heading = 'Imports by package (self ms / modules)'
+
+        self.stdout.write(self.style.MIGRATE_HEADING(heading))
+        rows = sorted(
+            self.get_import_rows(imports, options['modules']),
+            key=lambda row: -row[1],
+        )
+
+        for name, self_us, extra in rows[:options['limit']]:
+            extra = f'{extra / 1000:>8.1f}' if options['modules'] \
+                else f'{extra:>8}'
+            self.stdout.write(f'  {name:<40} {self_us / 1000:>8.1f} {extra}')
+
+        self.stdout.write(self.style.MIGRATE_HEADING('Heavy modules'))
+        loaded = set(profile['modules'])
+
+        for module in HEAVY_MODULES:
+            state = 'loaded' if module in loaded else 'not loaded'
+            self.stdout.write(f'  {module:<26} {state}')
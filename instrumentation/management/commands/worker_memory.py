@@ -0,0 +1,98 @@
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+SMAPS_FIELDS = ('Rss', 'Pss', 'Shared_Clean', 'Shared_Dirty',
+                'Private_Clean', 'Private_Dirty')
+
+
+def read_smaps_rollup(pid):
+    """Memory totals of a process in kB, from /proc (Linux only)."""
+    values = {}
+
+    with open(f'/proc/{pid}/smaps_rollup') as file:
+        for line in file:
+            name, _, value = line.partition(':')
+
+            if name in SMAPS_FIELDS:
+                values[name] = int(value.split()[0])
+
+    return values
+
+
+def get_children(pid):
+    children = []
+
+    for name in os.listdir('/proc'):
+        if not name.isdigit():
+            continue
+
+        try:
+            with open(f'/proc/{name}/stat') as file:
+                # The command name may contain spaces, the fields after it
+                # are state and parent pid
+                fields = file.read().rsplit(')', 1)[1].split()
+        except OSError:
+            continue
+
+        if int(fields[1]) == pid:
+            children.append(int(name))
+
+    return sorted(children)
+
+
+class Command(BaseCommand):
+    help = (
+        'Shows the resident, proportional and private memory of a gunicorn '
+        'master and its workers, to check how much copy-on-write sharing '
+        'preload_app and gc.freeze() achieve.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('pid', nargs='?', type=int)
+        parser.add_argument('--pidfile')
+
+    def get_master_pid(self, options):
+        if options['pidfile']:
+            with open(options['pidfile']) as file:
+                return int(file.read().strip())
+
+        if options['pid']:
+            return options['pid']
+
+        raise CommandError('Give the master pid or --pidfile')
+
+    def write_row(self, label, values):
+        private = values['Private_Clean'] + values['Private_Dirty']
+        shared = values['Shared_Clean'] + values['Shared_Dirty']
+        self.stdout.write(
+            f'{label:<12} {values["Rss"] / 1024:>9.1f} '
+            f'{values["Pss"] / 1024:>9.1f} {shared / 1024:>9.1f} '
+            f'{private / 1024:>9.1f}'
+        )
+
+    def handle(self, *args, **options):
+        if not os.path.exists('/proc/self/smaps_rollup'):
+            raise CommandError('Needs Linux 4.14+ (/proc/<pid>/smaps_rollup)')
+
+        master = self.get_master_pid(options)
+        workers = get_children(master)
+        self.stdout.write(
+            f'{"process":<12} {"rss MB":>9} {"pss MB":>9} {"shared MB":>9} '
+            f'{"private MB":>9}'
+        )
+        self.write_row(f'master {master}', read_smaps_rollup(master))
+        totals = dict.fromkeys(SMAPS_FIELDS, 0)
+
+        for pid in workers:
+            values = read_smaps_rollup(pid)
+            self.write_row(f'worker {pid}', values)
+
+            for name in SMAPS_FIELDS:
+                totals[name] += values[name]
+
+        if workers:
+            average = {
+                name: value / len(workers) for name, value in totals.items()
+            }
+            self.write_row('worker avg', average)
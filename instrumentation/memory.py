@@ -0,0 +1,147 @@
+import random
+import threading
+import tracemalloc
+from collections import Counter
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+from .frames import is_project_file
+from .metrics import REGISTRY
+from .middleware import get_route_name
+
+REQUEST_MEMORY_PEAK = REGISTRY.histogram(
+    'http_request_memory_peak_bytes',
+    'Peak memory traced by tracemalloc during the request.', ['route'],
+    buckets=tuple(2 ** power * 1024 for power in range(0, 18, 2)),
+)
+# Allocation sites kept per route, the smallest are dropped
+MAX_SITES_PER_ROUTE = 50
+SNAPSHOT_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>'),
+    tracemalloc.Filter(False, '<unknown>'),
+)
+
+
+class RouteMemoryStats:
+    def __init__(self):
+        self.requests = 0
+        self.peak_total = 0
+        self.peak_max = 0
+        self.net_total = 0
+        self.snapshots = 0
+        self.sites = Counter()
+
+    def as_dict(self, route, limit):
+        return {
+            'route': route,
+            'requests': self.requests,
+            'peak_avg_bytes': self.peak_total // max(self.requests, 1),
+            'peak_max_bytes': self.peak_max,
+            'net_avg_bytes': self.net_total // max(self.requests, 1),
+            'snapshots': self.snapshots,
+            'top_sites': [
+                {'site': site, 'net_bytes': size}
+                for site, size in self.sites.most_common(limit)
+            ],
+        }
+
+
+memory_stats = {}
+memory_stats_lock = threading.Lock()
+
+
+def get_site(traceback):
+    """The innermost project frame of an allocation, or the top frame."""
+    for frame in reversed(traceback):
+        if is_project_file(frame.filename):
+            return f'{frame.filename}:{frame.lineno}'
+    frame = traceback[-1]
+    return f'{frame.filename}:{frame.lineno}'
+
+
+def get_allocation_sites(before, after):
+    """Net bytes allocated between two snapshots, by allocation site."""
+    sites = Counter()
+    after = after.filter_traces(SNAPSHOT_FILTERS)
+
+    for diff in after.compare_to(
+        before.filter_traces(SNAPSHOT_FILTERS), 'traceback'
+    ):
+        if diff.size_diff > 0:
+            sites[get_site(diff.traceback)] += diff.size_diff
+
+    return sites
+
+
+def record_memory(route, peak, net, sites=None):
+    with memory_stats_lock:
+        stats = memory_stats.setdefault(route, RouteMemoryStats())
+        stats.requests += 1
+        stats.peak_total += peak
+        stats.peak_max = max(stats.peak_max, peak)
+        stats.net_total += net
+
+        if sites is not None:
+            stats.snapshots += 1
+            stats.sites.update(sites)
+            stats.sites = Counter(
+                dict(stats.sites.most_common(MAX_SITES_PER_ROUTE))
+            )
+
+    REQUEST_MEMORY_PEAK.observe(peak, route=route)
+
+
+def get_memory_report(route=None, limit=10):
+    with memory_stats_lock:
+        reports = [
+            stats.as_dict(name, limit)
+            for name, stats in memory_stats.items()
+            if route is None or name == route
+        ]
+    return sorted(reports, key=lambda report: -report['peak_max_bytes'])
+
+
+class MemoryProfilerMiddleware:
+    """Records tracemalloc peak and net allocation per URL name.
+
+    Opt-in with MEMORY_PROFILING, tracing slows every allocation down. A
+    MEMORY_PROFILING_SNAPSHOT_RATE share of the requests also compares
+    snapshots taken around the view to find the top allocation sites.
+    tracemalloc is process wide, so the numbers are only exact when a
+    worker serves one request at a time, like gunicorn sync workers do.
+    """
+
+    def __init__(self, get_response):
+        if not settings.MEMORY_PROFILING:
+            raise MiddlewareNotUsed()
+
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(settings.MEMORY_PROFILING_FRAMES)
+
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not tracemalloc.is_tracing():
+            return self.get_response(request)
+
+        take_snapshots = \
+            random.random() < settings.MEMORY_PROFILING_SNAPSHOT_RATE
+        before = tracemalloc.take_snapshot() if take_snapshots else None
+        start, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+
+        response = self.get_response(request)
+
+        current, peak = tracemalloc.get_traced_memory()
+        sites = None
+
+        if take_snapshots:
+            sites = get_allocation_sites(before, tracemalloc.take_snapshot())
+
+        record_memory(
+            get_route_name(request), peak - start, current - start, sites
+        )
+        return response
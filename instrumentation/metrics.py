@@ -0,0 +1,332 @@
+import atexit
+import json
+import os
+import tempfile
+import threading
+import time
+
+from django.conf import settings
+
+DEFAULT_BUCKETS = (
+    .005, .01, .025, .05, .075, .1, .25, .5, .75, 1, 2.5, 5, 10,
+)
+# Values of the processes that exited, see archive_process()
+ARCHIVE_NAME = 'metrics-archive.json'
+# Seconds an archived pid is remembered, for scrapes that read its file
+# just before it was removed
+ARCHIVED_PID_TTL = 300
+
+
+def format_value(value):
+    """
+    >>> format_value(3.0), format_value(0.25), format_value(float('inf'))
+    ('3', '0.25', '+Inf')
+    """
+    if value == float('inf'):
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def format_labels(labels):
+    """
+    >>> format_labels({'route': 'recipes:home', 'le': '0.5'})
+    '{route="recipes:home",le="0.5"}'
+    """
+    if not labels:
+        return ''
+    escaped = (
+        (name, str(value).replace('\\', r'\\').replace('"', r'\"')
+         .replace('\n', r'\n'))
+        for name, value in labels.items()
+    )
+    return '{' + ','.join(f'{name}="{value}"' for name, value in escaped) + '}'
+
+
+def merge_values(values, other):
+    """Adds counter values and histogram states up, in place.
+
+    >>> merge_values({'["a"]': 1, '[]': [1, 0, 0.5, 1]},
+    ...              {'["a"]': 2, '[]': [0, 1, 2.0, 1], '["b"]': 3})
+    {'["a"]': 3, '[]': [1, 1, 2.5, 2], '["b"]': 3}
+    """
+    for key, value in other.items():
+        if key not in values:
+            values[key] = value if isinstance(value, (int, float)) \
+                else list(value)
+        elif isinstance(value, (int, float)):
+            values[key] += value
+        else:
+            values[key] = [a + b for a, b in zip(values[key], value)]
+
+    return values
+
+
+def write_file(directory, name, data):
+    # Written aside and renamed so readers never see half a file
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-')
+
+    with os.fdopen(fd, 'w') as file:
+        json.dump(data, file)
+
+    os.replace(temp_path, os.path.join(directory, name))
+
+
+def read_archive(directory):
+    try:
+        with open(os.path.join(directory, ARCHIVE_NAME)) as file:
+            return json.load(file)
+    except FileNotFoundError:
+        return {'metrics': {}, 'pids': {}}
+
+
+def archive_process(directory, pid):
+    """Moves the values of a process that exited into the archive file.
+
+    Counters and histograms only go up, if the file of a recycled worker
+    was just deleted Prometheus would see a reset of every sum. Both merge
+    by adding up, a gauge would have to be dropped here instead. Runs in
+    the gunicorn master, without Django settings.
+    """
+    path = os.path.join(directory, f'metrics-{pid}.json')
+
+    try:
+        with open(path) as file:
+            snapshot = json.load(file)
+    except (FileNotFoundError, ValueError):
+        return
+
+    archive = read_archive(directory)
+    now = time.time()
+
+    for name, values in snapshot.items():
+        merge_values(archive['metrics'].setdefault(name, {}), values)
+
+    # Readers skip the file of an archived pid if it is older than this
+    archive['pids'] = {
+        archived_pid: archived_at
+        for archived_pid, archived_at in archive['pids'].items()
+        if now - archived_at < ARCHIVED_PID_TTL
+    }
+    archive['pids'][str(pid)] = now
+    write_file(directory, ARCHIVE_NAME, archive)
+    os.remove(path)
+
+
+class Metric:
+    type = ''
+
+    def __init__(self, registry, name, documentation, labelnames=()):
+        self.registry = registry
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.values = {}
+
+    def get_key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(
+                f'{self.name} expects labels {self.labelnames}, '
+                f'got {tuple(labels)}'
+            )
+        return json.dumps([str(labels[name]) for name in self.labelnames])
+
+
+class Counter(Metric):
+    type = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = self.get_key(labels)
+
+        with self.registry.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def merge(self, values, other):
+        merge_values(values, other)
+
+    def render(self, values):
+        for key, value in sorted(values.items()):
+            labels = dict(zip(self.labelnames, json.loads(key)))
+            yield f'{self.name}{format_labels(labels)} {format_value(value)}'
+
+
+class Histogram(Metric):
+    type = 'histogram'
+
+    def __init__(self, *args, buckets=DEFAULT_BUCKETS, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.buckets = tuple(sorted(buckets)) + (float('inf'),)
+
+    def observe(self, value, **labels):
+        key = self.get_key(labels)
+
+        with self.registry.lock:
+            # One count per bucket, then sum and count
+            state = self.values.setdefault(
+                key, [0] * len(self.buckets) + [0, 0]
+            )
+
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[index] += 1
+                    break
+
+            state[-2] += value
+            state[-1] += 1
+
+    def merge(self, values, other):
+        merge_values(values, other)
+
+    def render(self, values):
+        for key, state in sorted(values.items()):
+            labels = dict(zip(self.labelnames, json.loads(key)))
+            cumulative = 0
+
+            for bound, count in zip(self.buckets, state):
+                cumulative += count
+                bucket_labels = {**labels, 'le': format_value(bound)}
+                yield (
+                    f'{self.name}_bucket{format_labels(bucket_labels)} '
+                    f'{cumulative}'
+                )
+
+            yield f'{self.name}_sum{format_labels(labels)} ' \
+                f'{format_value(state[-2])}'
+            yield f'{self.name}_count{format_labels(labels)} {state[-1]}'
+
+
+class Registry:
+    """Counters and histograms of this process.
+
+    With METRICS_DIR set, every process (e.g. each gunicorn worker) writes
+    its values to its own file in that directory, at most once every
+    METRICS_FLUSH_INTERVAL seconds, and collect() adds up all the files. The
+    directory must be shared by the workers and emptied when the server
+    starts, and archive_process() must run for every worker that exits.
+    """
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.metrics = {}
+        self.last_flush = 0.0
+
+    def get_or_create(self, metric_class, name, documentation,
+                      labelnames=(), **kwargs):
+        with self.lock:
+            metric = self.metrics.get(name)
+
+            if metric is None:
+                metric = metric_class(
+                    self, name, documentation, labelnames, **kwargs
+                )
+                self.metrics[name] = metric
+            elif not isinstance(metric, metric_class) \
+                    or metric.labelnames != tuple(labelnames):
+                raise ValueError(f'Metric {name} is already registered')
+
+            return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        return self.get_or_create(Counter, name, documentation, labelnames)
+
+    def histogram(self, name, documentation, labelnames=(),
+                  buckets=DEFAULT_BUCKETS):
+        return self.get_or_create(
+            Histogram, name, documentation, labelnames, buckets=buckets
+        )
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                name: {key: value if isinstance(value, (int, float))
+                       else list(value)
+                       for key, value in metric.values.items()}
+                for name, metric in self.metrics.items()
+            }
+
+    def get_directory(self):
+        return getattr(settings, 'METRICS_DIR', '') or ''
+
+    def flush(self):
+        directory = self.get_directory()
+
+        if not directory:
+            return
+
+        os.makedirs(directory, exist_ok=True)
+        write_file(directory, f'metrics-{os.getpid()}.json', self.snapshot())
+        self.last_flush = time.monotonic()
+
+    def maybe_flush(self):
+        interval = getattr(settings, 'METRICS_FLUSH_INTERVAL', 1)
+
+        if self.get_directory() \
+                and time.monotonic() - self.last_flush >= interval:
+            self.flush()
+
+    def load_snapshots(self):
+        directory = self.get_directory()
+
+        if not directory:
+            return [self.snapshot()]
+
+        self.flush()
+        snapshots = {}
+
+        for entry in os.scandir(directory):
+            if not entry.name.startswith('metrics-') \
+                    or entry.name == ARCHIVE_NAME:
+                continue
+
+            try:
+                with open(entry.path) as file:
+                    modified = os.fstat(file.fileno()).st_mtime
+                    snapshots[entry.name[8:-5]] = (modified, json.load(file))
+            except (OSError, ValueError):
+                # Removed or replaced while reading, the next scrape sees it
+                continue
+
+        # Read after the files, a worker archived in between is in both
+        archive = read_archive(directory)
+
+        return [archive['metrics']] + [
+            snapshot for pid, (modified, snapshot) in snapshots.items()
+            if modified > archive['pids'].get(pid, 0)
+        ]
+
+    def collect(self):
+        """Returns {name: values} added up across processes."""
+        collected = {}
+
+        for snapshot in self.load_snapshots():
+            for name, values in snapshot.items():
+                metric = self.metrics.get(name)
+
+                if metric is not None:
+                    metric.merge(collected.setdefault(name, {}), values)
+
+        return collected
+
+    def render(self):
+        """Prometheus text exposition format (version 0.0.4)."""
+        lines = []
+        collected = self.collect()
+
+        for name, metric in sorted(self.metrics.items()):
+            lines.append(f'# HELP {name} {metric.documentation}')
+            lines.append(f'# TYPE {name} {metric.type}')
+            lines.extend(metric.render(collected.get(name, {})))
+
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = Registry()
+
+
+@atexit.register
+def _flush_on_exit():
+    try:
+        REGISTRY.flush()
+    except Exception:
+        pass
@@ -0,0 +1,86 @@
+import logging
+
+from django.conf import settings
+
+from .metrics import REGISTRY
+from .timings import track_request
+
+logger = logging.getLogger('instrumentation.requests')
+
+REQUESTS = REGISTRY.counter(
+    'http_requests_total', 'Requests by route, method and status.',
+    ['route', 'method', 'status'],
+)
+REQUEST_DURATION = REGISTRY.histogram(
+    'http_request_duration_seconds', 'Request latency by route.', ['route'],
+)
+REQUEST_DB_DURATION = REGISTRY.histogram(
+    'http_request_db_duration_seconds', 'Time spent in SQL per request.',
+    ['route'],
+)
+REQUEST_QUERIES = REGISTRY.histogram(
+    'http_request_queries', 'SQL queries per request.', ['route'],
+    buckets=(0, 1, 2, 5, 10, 20, 50, 100, 200),
+)
+
+
+def get_route_name(request):
+    resolver_match = getattr(request, 'resolver_match', None)
+    return resolver_match.view_name if resolver_match else '<unresolved>'
+
+
+def format_server_timing(timings):
+    return ', '.join((
+        f'db;dur={timings.db_time * 1000:.1f};'
+        f'desc="{timings.queries} queries"',
+        f'tpl;dur={timings.template_time * 1000:.1f}',
+        f'total;dur={timings.total_time * 1000:.1f}',
+    ))
+
+
+class ServerTimingMiddleware:
+    """Measures every request and reports it in logs, metrics and
+    Server-Timing.
+
+    Keep it first in MIDDLEWARE so the total covers the other middlewares.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def record_metrics(self, request, response, route, timings):
+        REQUESTS.inc(
+            route=route, method=request.method, status=response.status_code
+        )
+        REQUEST_DURATION.observe(timings.total_time, route=route)
+        REQUEST_DB_DURATION.observe(timings.db_time, route=route)
+        REQUEST_QUERIES.observe(timings.queries, route=route)
+        REGISTRY.maybe_flush()
+
+    def __call__(self, request):
+        with track_request() as timings:
+            response = self.get_response(request)
+
+        route = get_route_name(request)
+        self.record_metrics(request, response, route, timings)
+
+        if settings.SERVER_TIMING_HEADER:
+            response['Server-Timing'] = format_server_timing(timings)
+
+        logger.info(
+            'route=%s method=%s status=%s total_ms=%.1f db_ms=%.1f '
+            'queries=%d template_ms=%.1f',
+            route, request.method, response.status_code,
+            timings.total_time * 1000, timings.db_time * 1000,
+            timings.queries, timings.template_time * 1000,
+            extra={
+                'route': route,
+                'method': request.method,
+                'status': response.status_code,
+                'total_ms': round(timings.total_time * 1000, 1),
+                'db_ms': round(timings.db_time * 1000, 1),
+                'queries': timings.queries,
+                'template_ms': round(timings.template_time * 1000, 1),
+            },
+        )
+        return response
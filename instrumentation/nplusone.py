@@ -0,0 +1,134 @@
+import logging
+import sys
+import warnings
+from contextlib import ExitStack, contextmanager
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+from .frames import is_project_file
+from .sql import fingerprint
+
+logger = logging.getLogger('instrumentation.nplusone')
+
+
+class NPlusOneWarning(UserWarning):
+    pass
+
+
+class NPlusOneError(AssertionError):
+    pass
+
+
+def get_query_origin():
+    """The template line or the project code line that ran the query."""
+    frame = sys._getframe(1)
+    code_location = None
+
+    while frame is not None:
+        code = frame.f_code
+
+        # The innermost template node being rendered
+        if code.co_name == 'render_annotated':
+            node = frame.f_locals.get('self')
+            origin = getattr(node, 'origin', None)
+            token = getattr(node, 'token', None)
+
+            if origin is not None and token is not None:
+                return f'{origin.template_name}:{token.lineno}'
+
+        # Frames inside the cursor call belong to other execute wrappers
+        if code.co_name == '_execute_with_wrappers':
+            code_location = None
+        elif code_location is None and is_project_file(code.co_filename):
+            code_location = f'{code.co_filename}:{frame.f_lineno}'
+
+        frame = frame.f_back
+
+    return code_location or '<unknown>'
+
+
+class NPlusOneDetector:
+    """Execute wrapper that counts queries by fingerprint.
+
+    A statement repeated `threshold` times or more, only changing its
+    parameters, is reported with the location of its second execution.
+    """
+
+    def __init__(self, threshold=None):
+        self.threshold = threshold or settings.N_PLUS_ONE_THRESHOLD
+        self.counts = {}
+        self.origins = {}
+
+    def __call__(self, execute, sql, params, many, context):
+        key = fingerprint(sql)
+        count = self.counts.get(key, 0) + 1
+        self.counts[key] = count
+
+        # Looking up the origin is slow, only do it for repeated statements
+        if count == 2:
+            self.origins[key] = get_query_origin()
+
+        return execute(sql, params, many, context)
+
+    def get_problems(self):
+        return [
+            (key, count, self.origins.get(key, '<unknown>'))
+            for key, count in self.counts.items()
+            if count >= self.threshold
+        ]
+
+    def format_problems(self, label=''):
+        return '\n'.join(
+            f'{label}{count} similar queries from {origin}: {sql}'
+            for sql, count, origin in self.get_problems()
+        )
+
+
+@contextmanager
+def detect_n_plus_one(mode='raise', threshold=None, label=''):
+    """Reports repeated queries run inside the block.
+
+    mode is 'warn' (NPlusOneWarning and a log line) or 'raise'
+    (NPlusOneError, e.g. to fail a test).
+    """
+    detector = NPlusOneDetector(threshold)
+
+    with ExitStack() as stack:
+        for alias in connections:
+            stack.enter_context(connections[alias].execute_wrapper(detector))
+        yield detector
+
+    message = detector.format_problems(label)
+
+    if not message:
+        return
+
+    if mode == 'raise':
+        raise NPlusOneError(f'N+1 queries detected:\n{message}')
+
+    logger.warning(message)
+    warnings.warn(message, NPlusOneWarning, stacklevel=3)
+
+
+class NPlusOneMiddleware:
+    """Runs every request under detect_n_plus_one().
+
+    Enabled by N_PLUS_ONE_DETECTION ('warn' or 'raise'), otherwise it
+    removes itself from the middleware chain.
+    """
+
+    def __init__(self, get_response):
+        self.mode = settings.N_PLUS_ONE_DETECTION
+
+        if self.mode not in ('warn', 'raise'):
+            raise MiddlewareNotUsed()
+
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with detect_n_plus_one(
+            self.mode, label=f'{request.method} {request.path}: '
+        ):
+            return self.get_response(request)
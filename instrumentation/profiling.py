@@ -0,0 +1,126 @@
+import cProfile
+import hmac
+import os
+import random
+import re
+import threading
+import time
+import uuid
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+from .middleware import get_route_name
+
+PROFILE_HEADER = 'HTTP_X_PROFILE'
+PROFILE_EXTENSION = '.prof'
+UNSAFE_FILENAME_RE = re.compile(r'[^\w.-]')
+
+# cProfile slows the request down a lot, never profile two at once
+profiling_lock = threading.Lock()
+
+
+def get_route_slug(route):
+    """
+    >>> get_route_slug('recipes:recipes-api-list')
+    'recipes.recipes-api-list'
+    >>> get_route_slug('<unresolved>')
+    '_unresolved_'
+    """
+    return UNSAFE_FILENAME_RE.sub('_', route.replace(':', '.'))
+
+
+def make_profile_name(route):
+    return (
+        f'{time.strftime("%Y%m%d-%H%M%S")}--{get_route_slug(route)}--'
+        f'{os.getpid()}-{uuid.uuid4().hex[:8]}{PROFILE_EXTENSION}'
+    )
+
+
+def get_profile_route_slug(file_name):
+    """
+    >>> get_profile_route_slug('20240101-120000--recipes.search--12-ab.prof')
+    'recipes.search'
+    """
+    parts = file_name.split('--')
+    return parts[1] if len(parts) == 3 else ''
+
+
+def list_profiles(directory):
+    """Profile paths in directory, oldest first."""
+    try:
+        entries = [
+            entry for entry in os.scandir(directory)
+            if entry.name.endswith(PROFILE_EXTENSION) and entry.is_file()
+        ]
+    except FileNotFoundError:
+        return []
+
+    entries.sort(key=lambda entry: entry.stat().st_mtime)
+    return [entry.path for entry in entries]
+
+
+def rotate_profiles(directory, max_files):
+    for path in list_profiles(directory)[:-max_files or None]:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+class ProfilerMiddleware:
+    """Runs cProfile around the view for selected requests.
+
+    A request is profiled when its X-Profile header matches PROFILER_TOKEN
+    or when it falls in the PROFILER_SAMPLE_RATE sample. Profiles are saved
+    to PROFILER_DIR with the URL name in the file name and only the newest
+    PROFILER_MAX_FILES are kept. Keep it last in MIDDLEWARE so it measures
+    the view and not the other middlewares.
+    """
+
+    def __init__(self, get_response):
+        self.token = settings.PROFILER_TOKEN
+        self.sample_rate = settings.PROFILER_SAMPLE_RATE
+
+        if not self.token and not self.sample_rate:
+            raise MiddlewareNotUsed()
+
+        self.get_response = get_response
+
+    def is_requested(self, request):
+        header = request.META.get(PROFILE_HEADER, '')
+        return bool(self.token and header) and hmac.compare_digest(
+            header.encode(), self.token.encode()
+        )
+
+    def save_profile(self, profiler, route):
+        directory = settings.PROFILER_DIR
+        os.makedirs(directory, exist_ok=True)
+        name = make_profile_name(route)
+        temp_path = os.path.join(directory, f'.{name}.tmp')
+        # Written aside so profile_summary never reads half a file
+        profiler.dump_stats(temp_path)
+        os.replace(temp_path, os.path.join(directory, name))
+        rotate_profiles(directory, settings.PROFILER_MAX_FILES)
+        return name
+
+    def __call__(self, request):
+        requested = self.is_requested(request)
+
+        if not requested and random.random() >= self.sample_rate:
+            return self.get_response(request)
+
+        if not profiling_lock.acquire(blocking=False):
+            return self.get_response(request)
+
+        try:
+            profiler = cProfile.Profile()
+            response = profiler.runcall(self.get_response, request)
+            name = self.save_profile(profiler, get_route_name(request))
+        finally:
+            profiling_lock.release()
+
+        if requested:
+            response['X-Profile-File'] = name
+
+        return response
@@ -0,0 +1,124 @@
+import json
+import logging
+import random
+import time
+from contextlib import ExitStack, contextmanager
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import DatabaseError, connections
+
+from .metrics import REGISTRY
+from .middleware import get_route_name
+from .sql import explain, fingerprint, params_fingerprint, short_hash
+
+logger = logging.getLogger('instrumentation.slow_queries')
+
+SLOW_QUERIES = REGISTRY.counter(
+    'db_slow_queries_total', 'Queries over SLOW_QUERY_THRESHOLD_MS.',
+    ['route'],
+)
+# Fingerprints already explained by this process, their first slow run is
+# always explained, later ones only on a sample
+MAX_EXPLAINED_FINGERPRINTS = 1000
+explained_fingerprints = set()
+
+
+class SlowQueryLogger:
+    """Execute wrapper that logs statements slower than the threshold.
+
+    Each entry is a JSON object on the instrumentation.slow_queries logger
+    (see the slow_query_report command) with the route, the normalized
+    statement and a hash of its parameters. SELECT plans are captured with
+    the backend's EXPLAIN on a sample of the entries.
+    """
+
+    def __init__(self, route=''):
+        self.route = route
+        self.threshold = settings.SLOW_QUERY_THRESHOLD_MS / 1000
+        self.sample_rate = settings.SLOW_QUERY_EXPLAIN_SAMPLE_RATE
+
+    def get_route(self):
+        return self.route() if callable(self.route) else self.route
+
+    def should_explain(self, sql, key):
+        if not sql.lstrip()[:6].upper() == 'SELECT':
+            return False
+
+        if key not in explained_fingerprints:
+            if len(explained_fingerprints) < MAX_EXPLAINED_FINGERPRINTS:
+                explained_fingerprints.add(key)
+                return True
+
+        return random.random() < self.sample_rate
+
+    def get_plan(self, connection, sql, params, many, key):
+        if many or not self.should_explain(sql, key):
+            return None
+
+        try:
+            return explain(connection, sql, params)
+        except DatabaseError as error:
+            return f'EXPLAIN failed: {error}'
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        result = execute(sql, params, many, context)
+        duration = time.perf_counter() - start
+
+        if duration >= self.threshold:
+            self.log(context['connection'], sql, params, many, duration)
+
+        return result
+
+    def log(self, connection, sql, params, many, duration):
+        route = self.get_route()
+        key = fingerprint(sql)
+        SLOW_QUERIES.inc(route=route)
+        entry = {
+            'event': 'slow_query',
+            'route': route,
+            'database': connection.alias,
+            'vendor': connection.vendor,
+            'duration_ms': round(duration * 1000, 2),
+            'fingerprint_id': short_hash(key),
+            'fingerprint': key,
+            'params_fingerprint': '' if many else params_fingerprint(params),
+            'plan': self.get_plan(connection, sql, params, many, key),
+        }
+        logger.warning(json.dumps(entry), extra={'slow_query': entry})
+
+
+@contextmanager
+def log_slow_queries(route=''):
+    """Logs slow queries run inside the block, on every database.
+
+    route may be a callable, it is called when a slow query is logged.
+    """
+    slow_query_logger = SlowQueryLogger(route)
+
+    with ExitStack() as stack:
+        for alias in connections:
+            stack.enter_context(
+                connections[alias].execute_wrapper(slow_query_logger)
+            )
+        yield slow_query_logger
+
+
+class SlowQueryMiddleware:
+    """Runs every request under log_slow_queries().
+
+    Removes itself when SLOW_QUERY_THRESHOLD_MS is 0.
+    """
+
+    def __init__(self, get_response):
+        if not settings.SLOW_QUERY_THRESHOLD_MS:
+            raise MiddlewareNotUsed()
+
+        self.get_response = get_response
+
+    def __call__(self, request):
+        # The URL is resolved after the middlewares run, so the route name
+        # is only looked up when a query is logged
+        with log_slow_queries(lambda: get_route_name(request)):
+            return self.get_response(request)
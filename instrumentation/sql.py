@@ -0,0 +1,75 @@
+import hashlib
+import re
+
+NUMBER_RE = re.compile(r'\b\d+(\.\d+)?\b')
+STRING_RE = re.compile(r"'(?:[^']|'')*'")
+PLACEHOLDER_LIST_RE = re.compile(r'\((?:\s*(?:%s|\?)\s*,)*\s*(?:%s|\?)\s*\)')
+EXPLAIN_SAVEPOINT = 'instrumentation_explain'
+
+
+def fingerprint(sql):
+    """Normalizes the parts of a statement that change between rows.
+
+    >>> fingerprint('SELECT * FROM "a" WHERE "a"."id" = %s LIMIT 21')
+    'SELECT * FROM "a" WHERE "a"."id" = ? LIMIT ?'
+    >>> fingerprint("SELECT * FROM a WHERE id IN (%s, %s, %s) AND n = 'x'")
+    'SELECT * FROM a WHERE id IN (...) AND n = ?'
+    """
+    sql = STRING_RE.sub('?', sql)
+    sql = PLACEHOLDER_LIST_RE.sub('(...)', sql)
+    sql = NUMBER_RE.sub('?', sql).replace('%s', '?')
+    return ' '.join(sql.split())
+
+
+def short_hash(value):
+    """
+    >>> short_hash('SELECT ?')
+    'd41673f80456'
+    """
+    return hashlib.sha1(str(value).encode('utf-8')).hexdigest()[:12]
+
+
+def params_fingerprint(params):
+    """Hash of the parameter values, equal params give equal hashes.
+
+    The values themselves are never logged, they may be personal data.
+    """
+    if params is None:
+        return ''
+    return short_hash(repr(tuple(params) if isinstance(params, list)
+                           else params))
+
+
+def explain(connection, sql, params):
+    """The backend's plan for sql, one line per plan row.
+
+    Runs on a bare backend cursor so execute wrappers do not see it. Inside
+    a transaction it runs in a savepoint: on PostgreSQL a failed EXPLAIN
+    would abort the transaction and every later query of the request.
+    """
+    ops = connection.ops
+    prefix = ops.explain_query_prefix()
+    savepoint = not connection.get_autocommit() \
+        and connection.features.uses_savepoints
+
+    with connection.wrap_database_errors:
+        cursor = connection.create_cursor()
+
+        try:
+            if savepoint:
+                cursor.execute(ops.savepoint_create_sql(EXPLAIN_SAVEPOINT))
+
+            try:
+                cursor.execute(f'{prefix} {sql}', params)
+                return '\n'.join(str(row[-1]) for row in cursor.fetchall())
+            except Exception:
+                if savepoint:
+                    cursor.execute(
+                        ops.savepoint_rollback_sql(EXPLAIN_SAVEPOINT)
+                    )
+                raise
+            finally:
+                if savepoint:
+                    cursor.execute(ops.savepoint_commit_sql(EXPLAIN_SAVEPOINT))
+        finally:
+            cursor.close()
@@ -0,0 +1,220 @@
+import json
+import os
+import tempfile
+import threading
+from unittest import mock
+
+from django.db import OperationalError, connection
+from django.test import SimpleTestCase, TestCase
+
+from instrumentation.db import pool
+from instrumentation.db.base import (CONNECTIONS_OPENED, CONNECTIONS_REUSED,
+                                     HEALTH_CHECK_FAILURES, POOL_WAITS,
+                                     DatabaseWrapper)
+from instrumentation.db.pool import ConnectionPool, PoolTimeout
+
+
+def get_count(counter, alias):
+    return counter.values.get(json.dumps([alias]), 0)
+
+
+def remove_pools(alias):
+    for key in [key for key in pool.pools if key[0] == alias]:
+        pool.pools.pop(key).close()
+
+
+class FakeConnection:
+    closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class ConnectionPoolTest(SimpleTestCase):
+    def test_pool_reuses_released_connections(self):
+        connection_pool = ConnectionPool(2, timeout=1)
+        first, reused, waited = connection_pool.acquire(FakeConnection)
+        self.assertFalse(reused)
+        self.assertIsNone(waited)
+
+        connection_pool.release(first)
+        second, reused, waited = connection_pool.acquire(FakeConnection)
+
+        self.assertIs(second, first)
+        self.assertTrue(reused)
+        self.assertEqual(connection_pool.size, 1)
+
+    def test_pool_times_out_when_all_connections_are_in_use(self):
+        connection_pool = ConnectionPool(1, timeout=0.01)
+        connection_pool.acquire(FakeConnection)
+
+        with self.assertRaises(PoolTimeout):
+            connection_pool.acquire(FakeConnection)
+
+    def test_pool_waits_for_a_connection_to_be_released(self):
+        connection_pool = ConnectionPool(1, timeout=5)
+        first = connection_pool.acquire(FakeConnection)[0]
+        timer = threading.Timer(0.05, connection_pool.release, [first])
+        timer.start()
+
+        second, reused, waited = connection_pool.acquire(FakeConnection)
+        timer.join()
+
+        self.assertIs(second, first)
+        self.assertIsNotNone(waited)
+
+    def test_discard_frees_a_place_and_close_closes_the_idle_ones(self):
+        connection_pool = ConnectionPool(1, timeout=0.01)
+        connection_pool.acquire(FakeConnection)
+        connection_pool.discard()
+        idle = connection_pool.acquire(FakeConnection)[0]
+        connection_pool.release(idle)
+
+        connection_pool.close()
+
+        self.assertTrue(idle.closed)
+        self.assertEqual(connection_pool.size, 0)
+
+    def test_failed_connect_does_not_keep_its_place(self):
+        connection_pool = ConnectionPool(1, timeout=0.01)
+
+        with self.assertRaises(OSError):
+            connection_pool.acquire(mock.Mock(side_effect=OSError))
+
+        self.assertEqual(connection_pool.size, 0)
+
+
+class DatabaseWrapperTest(TestCase):
+    # TestCase lets pytest-django's database blocker through, the queries
+    # go to the temporary files below, not to the test database
+
+    def make_connection(self, alias, **settings):
+        # A file database, sqlite never closes the in-memory ones
+        file = tempfile.NamedTemporaryFile(suffix='.sqlite3', delete=False)
+        file.close()
+        self.addCleanup(os.remove, file.name)
+        self.addCleanup(remove_pools, alias)
+
+        wrapper = DatabaseWrapper({
+            **connection.settings_dict, 'NAME': file.name,
+            'WRAPPED_ENGINE': 'django.db.backends.sqlite3', **settings,
+        }, alias)
+        self.addCleanup(wrapper.close)
+        return wrapper
+
+    def query(self, wrapper):
+        with wrapper.cursor() as cursor:
+            cursor.execute('SELECT 1')
+            return cursor.fetchone()[0]
+
+    def test_wrapper_subclasses_the_wrapped_engine(self):
+        wrapper = self.make_connection('wrapped')
+
+        self.assertEqual(wrapper.vendor, 'sqlite')
+        self.assertEqual(type(wrapper).__name__, 'DatabaseWrapper')
+        self.assertEqual(self.query(wrapper), 1)
+
+    def test_persistent_connection_is_counted_as_reused(self):
+        wrapper = self.make_connection('persistent', CONN_MAX_AGE=60)
+        opened = get_count(CONNECTIONS_OPENED, 'persistent')
+        reused = get_count(CONNECTIONS_REUSED, 'persistent')
+
+        for _ in range(3):
+            wrapper.close_if_unusable_or_obsolete()
+            self.query(wrapper)
+            self.query(wrapper)
+            wrapper.close_if_unusable_or_obsolete()
+
+        self.assertEqual(get_count(CONNECTIONS_OPENED, 'persistent'),
+                         opened + 1)
+        self.assertEqual(get_count(CONNECTIONS_REUSED, 'persistent'),
+                         reused + 2)
+
+    def test_broken_persistent_connection_is_replaced(self):
+        wrapper = self.make_connection('broken', CONN_MAX_AGE=60)
+        self.query(wrapper)
+        wrapper.close_if_unusable_or_obsolete()
+        failures = get_count(HEALTH_CHECK_FAILURES, 'broken')
+        old_connection = wrapper.connection
+
+        with mock.patch.object(type(wrapper), 'is_usable', return_value=False):
+            self.query(wrapper)
+
+        self.assertIsNot(wrapper.connection, old_connection)
+        self.assertEqual(get_count(HEALTH_CHECK_FAILURES, 'broken'),
+                         failures + 1)
+
+    def test_pooled_connection_goes_back_to_the_pool_on_close(self):
+        wrapper = self.make_connection('pooled', POOL_SIZE=1)
+        opened = get_count(CONNECTIONS_OPENED, 'pooled')
+        reused = get_count(CONNECTIONS_REUSED, 'pooled')
+
+        self.query(wrapper)
+        raw_connection = wrapper.connection
+        connection_pool = wrapper.pool
+        wrapper.close()
+
+        self.assertIsNone(wrapper.connection)
+        self.assertEqual(connection_pool.idle, [raw_connection])
+
+        self.query(wrapper)
+
+        self.assertIs(wrapper.connection, raw_connection)
+        self.assertEqual(get_count(CONNECTIONS_OPENED, 'pooled'), opened + 1)
+        self.assertEqual(get_count(CONNECTIONS_REUSED, 'pooled'), reused + 1)
+
+    def test_pooled_connection_is_closed_inside_a_transaction(self):
+        wrapper = self.make_connection('atomic', POOL_SIZE=1)
+        self.query(wrapper)
+        connection_pool = wrapper.pool
+        wrapper.in_atomic_block = True
+
+        try:
+            wrapper.close()
+        finally:
+            wrapper.in_atomic_block = False
+
+        self.assertEqual(connection_pool.idle, [])
+        self.assertEqual(connection_pool.size, 0)
+
+    def test_pooled_connections_follow_database_settings_changes(self):
+        wrapper = self.make_connection('renamed', POOL_SIZE=2)
+        self.query(wrapper)
+        wrapper.close()
+        other_file = tempfile.NamedTemporaryFile(
+            suffix='.sqlite3', delete=False
+        )
+        other_file.close()
+        self.addCleanup(os.remove, other_file.name)
+
+        wrapper.settings_dict['NAME'] = other_file.name
+
+        with wrapper.cursor() as cursor:
+            cursor.execute('PRAGMA database_list')
+            self.assertEqual(cursor.fetchone()[2], other_file.name)
+
+    def test_threads_wait_for_the_pooled_connection(self):
+        wrapper = self.make_connection('waits', POOL_SIZE=1, POOL_TIMEOUT=5)
+        other = DatabaseWrapper(wrapper.settings_dict, 'waits')
+        self.addCleanup(other.close)
+        waits = get_count(POOL_WAITS, 'waits')
+        self.query(wrapper)
+
+        wrapper.inc_thread_sharing()
+        self.addCleanup(wrapper.dec_thread_sharing)
+        timer = threading.Timer(0.05, wrapper.close)
+        timer.start()
+        self.query(other)
+        timer.join()
+
+        self.assertEqual(get_count(POOL_WAITS, 'waits'), waits + 1)
+
+    def test_pool_timeout_raises_the_driver_error(self):
+        wrapper = self.make_connection('timeout', POOL_SIZE=1,
+                                       POOL_TIMEOUT=0.01)
+        other = DatabaseWrapper(wrapper.settings_dict, 'timeout')
+        self.addCleanup(other.close)
+        self.query(wrapper)
+
+        with self.assertRaises(OperationalError):
+            self.query(other)
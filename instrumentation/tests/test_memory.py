@@ -0,0 +1,57 @@
+import tracemalloc
+
+from django.contrib.auth.models import User
+from django.test import override_settings
+from django.urls import reverse
+from recipes.tests.test_recipe_base import RecipeTestBase
+
+from instrumentation import memory
+
+
+@override_settings(MEMORY_PROFILING=True, MEMORY_PROFILING_SNAPSHOT_RATE=1)
+class MemoryProfilerMiddlewareTest(RecipeTestBase):
+    def setUp(self):
+        memory.memory_stats.clear()
+        self.make_recipe_in_batch(5)
+        return super().setUp()
+
+    def tearDown(self):
+        tracemalloc.stop()
+        memory.memory_stats.clear()
+        return super().tearDown()
+
+    def test_memory_is_recorded_per_route(self):
+        self.client.get(reverse('recipes:recipes_api_v1'))
+        self.client.get(reverse('recipes:recipes_api_v1'))
+
+        report, = memory.get_memory_report('recipes:recipes_api_v1')
+        self.assertEqual(report['requests'], 2)
+        self.assertEqual(report['snapshots'], 2)
+        self.assertGreater(report['peak_max_bytes'], 0)
+        self.assertGreater(report['peak_max_bytes'], report['net_avg_bytes'])
+        self.assertTrue(report['top_sites'])
+        self.assertNotIn('tracemalloc', report['top_sites'][0]['site'])
+
+    def test_memory_report_is_staff_only(self):
+        url = reverse('instrumentation:memory')
+        self.client.get(reverse('recipes:home'))
+
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 302)
+
+        User.objects.create_user('staff', password='pass', is_staff=True)
+        self.client.login(username='staff', password='pass')
+        response = self.client.get(url + '?route=recipes:home&limit=3')
+
+        routes = response.json()['routes']
+        self.assertEqual(
+            [route['route'] for route in routes], ['recipes:home']
+        )
+        self.assertLessEqual(len(routes[0]['top_sites']), 3)
+
+    @override_settings(MEMORY_PROFILING=False)
+    def test_memory_profiling_is_opt_in(self):
+        self.client.get(reverse('recipes:home'))
+
+        self.assertFalse(tracemalloc.is_tracing())
+        self.assertEqual(memory.get_memory_report(), [])
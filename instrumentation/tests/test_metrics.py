@@ -0,0 +1,192 @@
+import json
+import os
+import tempfile
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from recipes.tests.test_recipe_base import RecipeTestBase, User
+
+from instrumentation.metrics import (ARCHIVE_NAME, REGISTRY, Registry,
+                                     archive_process)
+
+
+def get_sample(text, sample):
+    for line in text.splitlines():
+        if line.startswith(sample + ' '):
+            return float(line.rsplit(' ', 1)[1])
+    return 0
+
+
+class RegistryTest(SimpleTestCase):
+    def setUp(self):
+        self.registry = Registry()
+        self.counter = self.registry.counter(
+            'jobs_total', 'Jobs done.', ['kind']
+        )
+        self.histogram = self.registry.histogram(
+            'job_seconds', 'Job duration.', buckets=(0.1, 1)
+        )
+
+    def test_registry_renders_prometheus_text_format(self):
+        self.counter.inc(kind='a')
+        self.counter.inc(2, kind='a')
+        self.histogram.observe(0.05)
+        self.histogram.observe(0.5)
+        self.histogram.observe(5)
+
+        self.assertEqual(self.registry.render().splitlines(), [
+            '# HELP job_seconds Job duration.',
+            '# TYPE job_seconds histogram',
+            'job_seconds_bucket{le="0.1"} 1',
+            'job_seconds_bucket{le="1"} 2',
+            'job_seconds_bucket{le="+Inf"} 3',
+            'job_seconds_sum 5.55',
+            'job_seconds_count 3',
+            '# HELP jobs_total Jobs done.',
+            '# TYPE jobs_total counter',
+            'jobs_total{kind="a"} 3',
+        ])
+
+    def test_registry_returns_existing_metric_with_the_same_name(self):
+        self.assertIs(
+            self.registry.counter('jobs_total', 'Jobs done.', ['kind']),
+            self.counter,
+        )
+
+        with self.assertRaises(ValueError):
+            self.registry.histogram('jobs_total', 'Jobs done.', ['kind'])
+
+    def test_counter_rejects_unknown_labels(self):
+        with self.assertRaises(ValueError):
+            self.counter.inc(route='x')
+
+    def test_registry_adds_up_the_files_of_every_process(self):
+        with tempfile.TemporaryDirectory() as directory, \
+                override_settings(METRICS_DIR=directory):
+            self.counter.inc(kind='a')
+            self.histogram.observe(0.5)
+            # Values flushed by another worker
+            with open(os.path.join(directory, 'metrics-1.json'), 'w') as f:
+                json.dump({
+                    'jobs_total': {'["a"]': 2, '["b"]': 1},
+                    'job_seconds': {'[]': [1, 0, 0, 0.05, 1]},
+                }, f)
+
+            text = self.registry.render()
+
+            self.assertTrue(os.path.exists(
+                os.path.join(directory, f'metrics-{os.getpid()}.json')
+            ))
+
+        self.assertEqual(get_sample(text, 'jobs_total{kind="a"}'), 3)
+        self.assertEqual(get_sample(text, 'jobs_total{kind="b"}'), 1)
+        self.assertEqual(get_sample(text, 'job_seconds_bucket{le="1"}'), 2)
+        self.assertEqual(get_sample(text, 'job_seconds_count'), 2)
+
+    def write_process_file(self, directory, pid, values):
+        with open(os.path.join(directory, f'metrics-{pid}.json'), 'w') as f:
+            json.dump({'jobs_total': values}, f)
+
+    def test_values_of_exited_processes_are_kept_in_the_archive(self):
+        with tempfile.TemporaryDirectory() as directory, \
+                override_settings(METRICS_DIR=directory):
+            self.write_process_file(directory, 1, {'["a"]': 2})
+            self.write_process_file(directory, 2, {'["a"]': 3})
+            before = self.registry.render()
+
+            archive_process(directory, 1)
+            archive_process(directory, 2)
+            # Recycled workers, counting again from zero
+            self.write_process_file(directory, 3, {'["a"]': 1})
+            after = self.registry.render()
+
+            self.assertEqual(set(os.listdir(directory)), {
+                ARCHIVE_NAME, 'metrics-3.json', f'metrics-{os.getpid()}.json',
+            })
+
+        self.assertEqual(get_sample(before, 'jobs_total{kind="a"}'), 5)
+        self.assertEqual(get_sample(after, 'jobs_total{kind="a"}'), 6)
+
+    def test_file_of_an_archived_process_is_not_counted_twice(self):
+        with tempfile.TemporaryDirectory() as directory, \
+                override_settings(METRICS_DIR=directory):
+            self.write_process_file(directory, 1, {'["a"]': 2})
+            # A scrape read the file just before the master removed it
+            with patch('os.remove'):
+                archive_process(directory, 1)
+
+            text = self.registry.render()
+
+        self.assertEqual(get_sample(text, 'jobs_total{kind="a"}'), 2)
+
+
+@override_settings(METRICS_TOKEN='s3cret')
+class MetricsEndpointTest(RecipeTestBase):
+    def get_metrics(self):
+        response = self.client.get(
+            reverse('instrumentation:metrics'),
+            HTTP_AUTHORIZATION='Bearer s3cret',
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain'))
+        return response.content.decode('utf-8')
+
+    def test_metrics_endpoint_counts_requests_by_route(self):
+        sample = (
+            'http_requests_total'
+            '{route="recipes:home",method="GET",status="200"}'
+        )
+        before = get_sample(self.get_metrics(), sample)
+        self.client.get(reverse('recipes:home'))
+        after = get_sample(self.get_metrics(), sample)
+
+        self.assertEqual(after - before, 1)
+        self.assertIn(
+            'http_request_duration_seconds_bucket{route="recipes:home",',
+            self.get_metrics(),
+        )
+
+    def test_metrics_endpoint_reports_cache_hits_and_misses(self):
+        hit = 'cache_requests_total{cache="default",result="hit"}'
+        miss = 'cache_requests_total{cache="default",result="miss"}'
+        before = self.get_metrics()
+        cache.set('metrics-test', 1)
+        cache.get('metrics-test')
+        cache.get_many(['metrics-test', 'metrics-test-missing'])
+        after = self.get_metrics()
+
+        self.assertEqual(get_sample(after, hit) - get_sample(before, hit), 2)
+        self.assertEqual(
+            get_sample(after, miss) - get_sample(before, miss), 1
+        )
+
+    def test_metrics_endpoint_reports_search_results(self):
+        self.make_recipe()
+        before = get_sample(self.get_metrics(), 'recipe_search_results_sum')
+        self.client.get(reverse('recipes:search') + '?q=Recipe')
+        after = get_sample(self.get_metrics(), 'recipe_search_results_sum')
+
+        self.assertEqual(after - before, 1)
+        self.assertIn('recipe_search_results', REGISTRY.metrics)
+
+    def test_metrics_endpoint_needs_the_token_or_a_staff_user(self):
+        url = reverse('instrumentation:metrics')
+
+        self.assertEqual(self.client.get(url).status_code, 403)
+        self.assertEqual(self.client.get(
+            url, HTTP_AUTHORIZATION='Bearer wrong'
+        ).status_code, 403)
+
+        User.objects.create_user('staff', password='pass', is_staff=True)
+        self.client.login(username='staff', password='pass')
+        self.assertEqual(self.client.get(url).status_code, 200)
+
+    @override_settings(METRICS_TOKEN='')
+    def test_metrics_endpoint_without_a_token_is_staff_only(self):
+        response = self.client.get(
+            reverse('instrumentation:metrics'), HTTP_AUTHORIZATION='Bearer '
+        )
+
+        self.assertEqual(response.status_code, 403)
@@ -0,0 +1,106 @@
+from django.http import HttpResponse
+from django.template import Context, Engine
+from django.test import override_settings
+from django.urls import path, reverse
+from recipes.tests.test_recipe_base import Recipe, RecipeTestBase
+from rest_framework.test import APIClient
+
+from instrumentation.nplusone import (NPlusOneError, NPlusOneWarning,
+                                      detect_n_plus_one)
+
+
+class NPlusOneDetectorTest(RecipeTestBase):
+    def setUp(self):
+        self.recipes = self.make_recipe_in_batch(4)
+        return super().setUp()
+
+    def test_detector_raises_for_repeated_queries(self):
+        with self.assertRaises(NPlusOneError) as error:
+            with detect_n_plus_one('raise'):
+                for recipe in Recipe.objects.all():
+                    recipe.author.username
+
+        message = str(error.exception)
+        self.assertIn('4 similar queries from ', message)
+        self.assertIn(f'{__file__}:', message)
+        self.assertIn('"auth_user"', message)
+
+    def test_detector_ignores_queries_below_the_threshold(self):
+        with detect_n_plus_one('raise', threshold=5):
+            for recipe in Recipe.objects.all():
+                recipe.author.username
+
+    def test_detector_ignores_select_related(self):
+        with detect_n_plus_one('raise', threshold=2):
+            for recipe in Recipe.objects.select_related('author'):
+                recipe.author.username
+
+    def test_detector_warns(self):
+        with self.assertWarns(NPlusOneWarning), \
+                self.assertLogs('instrumentation.nplusone', 'WARNING'):
+            with detect_n_plus_one('warn'):
+                for recipe in Recipe.objects.all():
+                    recipe.author.username
+
+    def test_detector_points_to_the_template_line(self):
+        engine = Engine(loaders=[('django.template.loaders.locmem.Loader', {
+            'list.html': (
+                'Recipes\n'
+                '{% for recipe in recipes %}{{ recipe.author }}{% endfor %}'
+            ),
+        })])
+        template = engine.get_template('list.html')
+
+        with self.assertRaisesMessage(NPlusOneError, 'from list.html:2: '):
+            with detect_n_plus_one('raise'):
+                template.render(Context({'recipes': Recipe.objects.all()}))
+
+
+@override_settings(N_PLUS_ONE_DETECTION='raise', N_PLUS_ONE_THRESHOLD=2)
+class NPlusOneMiddlewareTest(RecipeTestBase):
+    def setUp(self):
+        self.recipes = self.make_recipe_in_batch(4)
+        return super().setUp()
+
+    def test_middleware_fails_requests_with_repeated_queries(self):
+        with self.assertRaises(NPlusOneError):
+            with override_settings(ROOT_URLCONF=__name__):
+                self.client.get('/n-plus-one/')
+
+    def test_recipe_pages_have_no_repeated_queries(self):
+        recipe = self.recipes[0]
+
+        for url in (
+            reverse('recipes:home'),
+            reverse('recipes:search') + '?q=Recipe',
+            reverse('recipes:recipe', args=(recipe.pk,)),
+            reverse('recipes:recipes_api_v1'),
+            reverse('recipes:recipes_api_v1_detail', args=(recipe.pk,)),
+        ):
+            with self.subTest(url=url):
+                self.assertEqual(self.client.get(url).status_code, 200)
+
+    def test_recipe_api_has_no_repeated_queries(self):
+        client = APIClient()
+        client.force_authenticate(self.recipes[0].author)
+
+        response = client.get(reverse('recipes:recipes-api-list'))
+        self.assertEqual(response.status_code, 200)
+
+        response = client.post(reverse('recipes:recipes-api-list'), data={
+            'title': 'New recipe', 'description': 'Description',
+            'preparation_time': 10, 'preparation_time_unit': 'Minutos',
+            'servings': 2, 'servings_unit': 'Porções',
+            'preparation_steps': 'Steps',
+        })
+        self.assertEqual(response.status_code, 201)
+
+
+def n_plus_one_view(request):
+    names = [recipe.author.username for recipe in Recipe.objects.all()]
+    return HttpResponse(', '.join(names))
+
+
+urlpatterns = [
+    path('n-plus-one/', n_plus_one_view),
+]
@@ -0,0 +1,65 @@
+import os
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.test import override_settings
+from django.urls import reverse
+from recipes.tests.test_recipe_base import (RecipeTestBase,
+                                            TemporaryDirectoryMixin)
+
+
+class ProfilerMiddlewareTest(TemporaryDirectoryMixin, RecipeTestBase):
+    def get_directory_settings(self, directory):
+        return {'PROFILER_DIR': directory, 'PROFILER_TOKEN': 's3cret'}
+
+    def get_profiles(self):
+        return sorted(os.listdir(self.directory))
+
+    def test_requests_with_the_token_are_profiled(self):
+        response = self.client.get(
+            reverse('recipes:home'), HTTP_X_PROFILE='s3cret'
+        )
+
+        self.assertEqual(self.get_profiles(), [response['X-Profile-File']])
+        self.assertIn('--recipes.home--', response['X-Profile-File'])
+
+    def test_requests_with_a_wrong_token_are_not_profiled(self):
+        response = self.client.get(
+            reverse('recipes:home'), HTTP_X_PROFILE='wrong'
+        )
+
+        self.assertNotIn('X-Profile-File', response)
+        self.assertEqual(self.get_profiles(), [])
+
+    @override_settings(PROFILER_SAMPLE_RATE=1, PROFILER_MAX_FILES=2)
+    def test_sampled_profiles_are_rotated(self):
+        for _ in range(3):
+            response = self.client.get(reverse('recipes:home'))
+
+        # Sampled requests do not reveal the profile
+        self.assertNotIn('X-Profile-File', response)
+        self.assertEqual(len(self.get_profiles()), 2)
+
+    @override_settings(PROFILER_TOKEN='', PROFILER_SAMPLE_RATE=0)
+    def test_profiler_is_off_by_default(self):
+        self.client.get(reverse('recipes:home'), HTTP_X_PROFILE='')
+        self.assertEqual(self.get_profiles(), [])
+
+    def test_profile_summary_shows_the_top_functions_per_route(self):
+        self.client.get(reverse('recipes:home'), HTTP_X_PROFILE='s3cret')
+        self.client.get(
+            reverse('recipes:search') + '?q=a', HTTP_X_PROFILE='s3cret'
+        )
+        out = StringIO()
+        call_command(
+            'profile_summary', '--route', 'recipes:search', '--limit', '5',
+            stdout=out,
+        )
+
+        self.assertIn('1 profiles, routes: recipes.search', out.getvalue())
+        self.assertIn('cumulative', out.getvalue())
+        self.assertIn('function calls', out.getvalue())
+
+    def test_profile_summary_fails_without_profiles(self):
+        with self.assertRaises(CommandError):
+            call_command('profile_summary', stdout=StringIO())
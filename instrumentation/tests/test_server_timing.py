@@ -0,0 +1,84 @@
+import re
+from unittest import skipUnless
+
+from django.conf import settings
+from django.test import override_settings
+from django.urls import reverse
+from recipes.tests.test_recipe_base import RecipeTestBase
+
+from instrumentation.timings import RequestTimings
+
+
+def parse_server_timing(header):
+    metrics = {}
+
+    for metric in header.split(', '):
+        name, *params = metric.split(';')
+        metrics[name] = dict(param.split('=', 1) for param in params)
+
+    return metrics
+
+
+class ServerTimingMiddlewareTest(RecipeTestBase):
+    def test_server_timing_reports_db_template_and_total_time(self):
+        self.make_recipe()
+        response = self.client.get(reverse('recipes:home'))
+        metrics = parse_server_timing(response['Server-Timing'])
+
+        self.assertEqual(set(metrics), {'db', 'tpl', 'total'})
+        self.assertRegex(metrics['db']['desc'], r'^"[1-9]\d* queries"$')
+        self.assertGreater(float(metrics['tpl']['dur']), 0)
+        self.assertGreaterEqual(
+            float(metrics['total']['dur']), float(metrics['tpl']['dur'])
+        )
+
+    @skipUnless(settings.JINJA2, 'Jinja2 is not installed')
+    @override_settings(PUBLIC_TEMPLATE_ENGINE='jinja2')
+    def test_server_timing_reports_jinja2_template_time(self):
+        self.make_recipe()
+        response = self.client.get(reverse('recipes:home'))
+        metrics = parse_server_timing(response['Server-Timing'])
+
+        self.assertGreater(float(metrics['tpl']['dur']), 0)
+
+    def test_server_timing_has_no_template_time_for_json_views(self):
+        response = self.client.get(reverse('recipes:recipes-api-list'))
+        metrics = parse_server_timing(response['Server-Timing'])
+
+        self.assertEqual(metrics['tpl']['dur'], '0.0')
+
+    def test_requests_are_logged_with_their_route_name(self):
+        with self.assertLogs('instrumentation.requests', 'INFO') as logs:
+            self.client.get(reverse('recipes:home'))
+
+        record = logs.records[0]
+        self.assertEqual(record.route, 'recipes:home')
+        self.assertEqual(record.status, 200)
+        self.assertTrue(re.match(
+            r'route=recipes:home method=GET status=200 total_ms=',
+            record.getMessage(),
+        ))
+
+    def test_unresolved_requests_are_logged(self):
+        with self.assertLogs('instrumentation.requests', 'INFO') as logs:
+            self.client.get('/this-url-does-not-exist/')
+
+        self.assertEqual(logs.records[0].route, '<unresolved>')
+
+    @override_settings(SERVER_TIMING_HEADER=False)
+    def test_server_timing_header_can_be_disabled(self):
+        with self.assertLogs('instrumentation.requests', 'INFO'):
+            response = self.client.get(reverse('recipes:home'))
+
+        self.assertNotIn('Server-Timing', response)
+
+    def test_nested_templates_are_counted_once(self):
+        timings = RequestTimings()
+
+        with timings.time_template():
+            with timings.time_template():
+                pass
+            inner_time = timings.template_time
+
+        self.assertEqual(inner_time, 0)
+        self.assertGreater(timings.template_time, 0)
@@ -0,0 +1,123 @@
+import json
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.test import override_settings
+from django.urls import reverse
+from recipes.tests.test_recipe_base import Recipe, RecipeTestBase
+
+from instrumentation import slow_queries
+from instrumentation.slow_queries import SlowQueryLogger, log_slow_queries
+
+
+@override_settings(
+    SLOW_QUERY_THRESHOLD_MS=0.000001, SLOW_QUERY_EXPLAIN_SAMPLE_RATE=0,
+)
+class SlowQueryLogTest(RecipeTestBase):
+    def setUp(self):
+        slow_queries.explained_fingerprints.clear()
+        self.make_recipe()
+        return super().setUp()
+
+    def get_entries(self, logs):
+        return [record.slow_query for record in logs.records]
+
+    def test_slow_queries_are_logged_with_route_and_plan(self):
+        with self.assertLogs('instrumentation.slow_queries') as logs:
+            self.client.get(reverse('recipes:home'))
+
+        entries = self.get_entries(logs)
+        select = next(
+            entry for entry in entries
+            if '"recipes_recipe"' in entry['fingerprint']
+        )
+        self.assertEqual(select['route'], 'recipes:home')
+        self.assertEqual(select['vendor'], 'sqlite')
+        self.assertEqual(len(select['fingerprint_id']), 12)
+        self.assertIn('recipes_recipe', select['plan'])
+        self.assertEqual(
+            json.loads(logs.records[0].getMessage()), entries[0]
+        )
+
+    def test_only_the_first_run_of_a_statement_is_explained(self):
+        with self.assertLogs('instrumentation.slow_queries') as logs:
+            with log_slow_queries('test'):
+                list(Recipe.objects.filter(pk=1))
+                list(Recipe.objects.filter(pk=2))
+
+        first, second = self.get_entries(logs)
+        self.assertEqual(first['fingerprint_id'], second['fingerprint_id'])
+        self.assertNotEqual(
+            first['params_fingerprint'], second['params_fingerprint']
+        )
+        self.assertIsNotNone(first['plan'])
+        self.assertIsNone(second['plan'])
+
+    def test_failed_explain_in_a_transaction_is_rolled_back(self):
+        statements = []
+        create_cursor = connection.create_cursor
+
+        def recording_cursor(*args):
+            cursor = create_cursor(*args)
+            execute = cursor.execute
+
+            def record(sql, params=None):
+                statements.append(sql)
+                return execute(sql, params)
+
+            cursor.execute = record
+            return cursor
+
+        with transaction.atomic(), mock.patch.object(
+            connection, 'create_cursor', recording_cursor
+        ):
+            plan = SlowQueryLogger().get_plan(
+                connection, 'SELECT * FROM missing_table', None, False, 'x'
+            )
+            # The transaction is still usable
+            self.assertTrue(Recipe.objects.exists())
+
+        self.assertTrue(plan.startswith('EXPLAIN failed:'))
+        self.assertEqual(
+            [statement.split(' "')[0] for statement in statements[:4]],
+            ['SAVEPOINT', 'EXPLAIN QUERY PLAN SELECT * FROM missing_table',
+             'ROLLBACK TO SAVEPOINT', 'RELEASE SAVEPOINT'],
+        )
+
+    def test_queries_under_the_threshold_are_not_logged(self):
+        with override_settings(SLOW_QUERY_THRESHOLD_MS=60000):
+            with self.assertNoLogs('instrumentation.slow_queries'):
+                self.client.get(reverse('recipes:home'))
+
+    def test_slow_query_report_aggregates_by_fingerprint(self):
+        with self.assertLogs('instrumentation.slow_queries') as logs:
+            with log_slow_queries('recipes:search'):
+                list(Recipe.objects.filter(pk=1))
+                Recipe.objects.filter(title__icontains='a').count()
+            with log_slow_queries('recipes:category'):
+                list(Recipe.objects.filter(pk=2))
+
+        entries = self.get_entries(logs)
+
+        with tempfile.NamedTemporaryFile('w', suffix='.log') as log_file:
+            log_file.write('\n'.join(
+                f'WARNING {json.dumps(entry)}' for entry in entries
+            ))
+            log_file.flush()
+            out = StringIO()
+            call_command(
+                'slow_query_report', log_file.name, '--sort', 'count',
+                '--plans', stdout=out,
+            )
+
+        lines = out.getvalue().splitlines()
+        self.assertIn(entries[0]['fingerprint_id'], lines[0])
+        self.assertIn('count=2', lines[0])
+        self.assertIn('distinct_params=2', lines[0])
+        self.assertEqual(
+            lines[1], '  routes: recipes:search (1), recipes:category (1)'
+        )
+        self.assertIn('count=1', out.getvalue())
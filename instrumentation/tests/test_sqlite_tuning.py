@@ -0,0 +1,116 @@
+import os
+import tempfile
+from unittest import mock
+
+from django.db import connection
+from django.test import TestCase, override_settings
+
+from instrumentation.db import sqlite
+from instrumentation.db.base import DatabaseWrapper
+
+PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'mmap_size': 2 ** 20,
+    'cache_size': -2000,
+    'busy_timeout': 1234,
+}
+
+
+def read_pragma(wrapper, name):
+    with wrapper.cursor() as cursor:
+        cursor.execute(f'PRAGMA {name}')
+        return cursor.fetchone()[0]
+
+
+@override_settings(SQLITE_PRAGMAS=PRAGMAS, SQLITE_OPTIMIZE_INTERVAL=0)
+class SQLiteTuningTest(TestCase):
+    # TestCase lets pytest-django's database blocker through, the queries
+    # go to the temporary file below, not to the test database
+
+    def make_connection(self):
+        file = tempfile.NamedTemporaryFile(suffix='.sqlite3', delete=False)
+        file.close()
+
+        def remove():
+            for suffix in '', '-wal', '-shm':
+                if os.path.exists(file.name + suffix):
+                    os.remove(file.name + suffix)
+
+        self.addCleanup(remove)
+        wrapper = DatabaseWrapper({
+            **connection.settings_dict, 'NAME': file.name,
+            'WRAPPED_ENGINE': 'django.db.backends.sqlite3', 'POOL_SIZE': 0,
+        }, 'sqlite-tuning')
+        self.addCleanup(wrapper.close)
+        return wrapper
+
+    def test_pragmas_are_applied_to_new_connections(self):
+        wrapper = self.make_connection()
+
+        self.assertEqual(read_pragma(wrapper, 'journal_mode'), 'wal')
+        self.assertEqual(read_pragma(wrapper, 'synchronous'), 1)
+        self.assertEqual(read_pragma(wrapper, 'mmap_size'), 2 ** 20)
+        self.assertEqual(read_pragma(wrapper, 'cache_size'), -2000)
+        self.assertEqual(read_pragma(wrapper, 'busy_timeout'), 1234)
+
+    def test_empty_profile_keeps_the_sqlite_defaults(self):
+        with self.settings(SQLITE_PRAGMAS={}):
+            wrapper = self.make_connection()
+
+            self.assertEqual(read_pragma(wrapper, 'journal_mode'), 'delete')
+
+    def test_in_memory_databases_are_left_alone(self):
+        self.assertTrue(sqlite.is_memory_database(connection))
+
+        with mock.patch.object(sqlite, 'apply_pragmas') as apply_pragmas:
+            sqlite.configure_connection(None, connection)
+
+        apply_pragmas.assert_not_called()
+
+    def test_optimize_runs_once_per_interval(self):
+        raw_connection = mock.Mock()
+
+        with mock.patch.object(sqlite, 'last_optimize', None), \
+                self.settings(SQLITE_OPTIMIZE_INTERVAL=3600):
+            self.assertTrue(sqlite.optimize(raw_connection))
+            self.assertFalse(sqlite.optimize(raw_connection))
+
+        raw_connection.execute.assert_called_once_with('PRAGMA optimize')
+
+    def test_optimize_analyzes_the_tables_when_a_used_connection_closes(self):
+        wrapper = self.make_connection()
+
+        with wrapper.cursor() as cursor:
+            cursor.execute('CREATE TABLE item (id INTEGER, name TEXT)')
+            cursor.execute('CREATE INDEX item_name ON item (name)')
+            cursor.executemany(
+                'INSERT INTO item VALUES (%s, %s)',
+                [(number, f'item {number}') for number in range(100)],
+            )
+            cursor.execute("SELECT id FROM item WHERE name = 'item 1'")
+
+        with mock.patch.object(sqlite, 'last_optimize', None), \
+                self.settings(SQLITE_OPTIMIZE_INTERVAL=3600):
+            wrapper.close()
+
+        with wrapper.cursor() as cursor:
+            cursor.execute(
+                "SELECT name FROM sqlite_master WHERE name = 'sqlite_stat1'"
+            )
+            self.assertIsNotNone(cursor.fetchone())
+
+    def test_optimize_skips_connections_that_ran_no_queries(self):
+        wrapper = self.make_connection()
+        wrapper.ensure_connection()
+
+        with mock.patch.object(sqlite, 'optimize') as optimize:
+            wrapper.close()
+            wrapper.ensure_connection()
+            read_pragma(wrapper, 'journal_mode')
+            wrapper.close()
+
+        optimize.assert_called_once()
+
+    def test_optimize_is_off_with_a_zero_interval(self):
+        self.assertFalse(sqlite.optimize(mock.Mock()))
@@ -0,0 +1,29 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import SimpleTestCase
+
+
+class StartupProfileCommandTest(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.out = StringIO()
+        call_command('startup_profile', '--limit', '5', stdout=cls.out)
+
+    def test_startup_profile_reports_phases_and_ready_times(self):
+        out = self.out.getvalue()
+
+        for heading in (
+            'Startup phases', 'App ready()', 'Imports by package',
+        ):
+            self.assertIn(heading, out)
+
+        self.assertRegex(out, r'total +\d+\.\d ms')
+        self.assertRegex(out, r'instrumentation +\d+\.\d\d ms')
+
+    def test_heavy_modules_are_not_loaded_at_startup(self):
+        out = self.out.getvalue()
+
+        for module in ('PIL', 'selenium', 'debug_toolbar'):
+            self.assertRegex(out, rf'{module} +not loaded')
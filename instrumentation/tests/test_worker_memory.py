@@ -0,0 +1,37 @@
+import os
+import subprocess
+import sys
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import SimpleTestCase
+
+from instrumentation.management.commands.worker_memory import (
+    get_children, read_smaps_rollup)
+
+
+class WorkerMemoryCommandTest(SimpleTestCase):
+    def setUp(self):
+        self.child = subprocess.Popen(
+            [sys.executable, '-c', 'import time; time.sleep(30)']
+        )
+        self.addCleanup(self.child.wait)
+        self.addCleanup(self.child.kill)
+
+    def test_get_children_finds_the_forked_processes(self):
+        self.assertIn(self.child.pid, get_children(os.getpid()))
+
+    def test_read_smaps_rollup_returns_sizes_in_kb(self):
+        values = read_smaps_rollup(os.getpid())
+
+        self.assertGreater(values['Rss'], 0)
+        self.assertLessEqual(values['Pss'], values['Rss'])
+
+    def test_command_lists_master_workers_and_average(self):
+        out = StringIO()
+        call_command('worker_memory', os.getpid(), stdout=out)
+        output = out.getvalue()
+
+        self.assertIn(f'master {os.getpid()}', output)
+        self.assertIn(f'worker {self.child.pid}', output)
+        self.assertIn('worker avg', output)
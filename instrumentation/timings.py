@@ -0,0 +1,103 @@
+import time
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from importlib.util import find_spec
+
+from django.db import connections
+
+_current_timings = ContextVar('request_timings', default=None)
+
+
+class RequestTimings:
+    """Queries, DB time and template time of the request being served."""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.total_time = 0.0
+        self.queries = 0
+        self.db_time = 0.0
+        self.template_time = 0.0
+        self.template_depth = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - start
+            self.queries += 1
+
+    @contextmanager
+    def time_template(self):
+        # Templates rendered from inside another template are already
+        # counted by the outer one
+        self.template_depth += 1
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.template_depth -= 1
+
+            if not self.template_depth:
+                self.template_time += time.perf_counter() - start
+
+    def stop(self):
+        self.total_time = time.perf_counter() - self.start
+
+
+def get_current_timings():
+    return _current_timings.get()
+
+
+@contextmanager
+def track_request():
+    timings = RequestTimings()
+    token = _current_timings.set(timings)
+
+    try:
+        with ExitStack() as stack:
+            for alias in connections:
+                stack.enter_context(
+                    connections[alias].execute_wrapper(timings)
+                )
+            yield timings
+    finally:
+        timings.stop()
+        _current_timings.reset(token)
+
+
+def get_template_classes():
+    from django.template.backends.django import Template
+
+    yield Template
+
+    # The Jinja2 backend imports jinja2, which is optional
+    if find_spec('jinja2') is not None:
+        from django.template.backends.jinja2 import Template
+
+        yield Template
+
+
+def instrument_template_rendering():
+    """Wraps the template backends so their render time is recorded."""
+    for template_class in get_template_classes():
+        if getattr(template_class.render, 'instrumented', False):
+            continue
+
+        template_class.render = time_render(template_class.render)
+
+
+def time_render(render):
+    @wraps(render)
+    def timed_render(self, *args, **kwargs):
+        timings = _current_timings.get()
+
+        if timings is None:
+            return render(self, *args, **kwargs)
+
+        with timings.time_template():
+            return render(self, *args, **kwargs)
+
+    timed_render.instrumented = True
+    return timed_render
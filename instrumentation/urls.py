@@ -0,0 +1,10 @@
+from django.urls import path
+
+from . import views
+
+app_name = 'instrumentation'
+
+urlpatterns = [
+    path('metrics', views.metrics, name='metrics'),
+    path('instrumentation/memory/', views.memory, name='memory'),
+]
@@ -0,0 +1,50 @@
+import hmac
+import os
+
+from django.conf import settings
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import HttpResponse, HttpResponseForbidden, JsonResponse
+
+from .memory import get_memory_report
+from .metrics import REGISTRY
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def has_metrics_access(request):
+    """Staff users, or a scraper sending `Authorization: Bearer <token>`
+    with METRICS_TOKEN."""
+    token = settings.METRICS_TOKEN
+    scheme, _, credentials = request.META.get(
+        'HTTP_AUTHORIZATION', ''
+    ).partition(' ')
+
+    if token and scheme.lower() == 'bearer' and hmac.compare_digest(
+        credentials.encode(), token.encode()
+    ):
+        return True
+
+    return request.user.is_active and request.user.is_staff
+
+
+def metrics(request):
+    if not has_metrics_access(request):
+        return HttpResponseForbidden()
+
+    return HttpResponse(
+        REGISTRY.render(), content_type=PROMETHEUS_CONTENT_TYPE
+    )
+
+
+@staff_member_required
+def memory(request):
+    """Memory recorded by MemoryProfilerMiddleware in this worker."""
+    try:
+        limit = int(request.GET.get('limit', 10))
+    except ValueError:
+        limit = 10
+
+    return JsonResponse({
+        'pid': os.getpid(),
+        'routes': get_memory_report(request.GET.get('route'), limit),
+    })
@@ -9,6 +9,7 @@ https://docs.djangoproject.com/en/3.2/howto/deployment/asgi/
 
 import os
 
+from django.conf import settings
 from django.core.asgi import get_asgi_application
 from dotenv import load_dotenv
 
@@ -16,3 +17,8 @@ os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'project.settings')
 
 load_dotenv()
 application = get_asgi_application()
+
+if settings.TEMPLATES_WARMUP:
+    from utils.warmup import warm_templates
+
+    warm_templates()
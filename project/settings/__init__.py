@@ -4,10 +4,13 @@ from .installed_apps import *  # isort:skip
 from .middlewares import *  # isort:skip
 
 from .assets import *
+from .caches import *
 from .databases import *
 from .i18n import *
+from .instrumentation import *
 from .messages import *
 from .security import *
 from .templates import *
+from .uploads import *
 
 from .debug_toolbar import *  # isort:skip
@@ -1,4 +1,8 @@
+import os
+from importlib.util import find_spec
+
 from .environment import BASE_DIR
+from .middlewares import MIDDLEWARE
 
 # Static files (CSS, JavaScript, Images)
 # https://docs.djangoproject.com/en/3.2/howto/static-files/
@@ -11,3 +15,17 @@ STATIC_ROOT = BASE_DIR / 'static'
 
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
+# Internal nginx location of MEDIA_ROOT, e.g. /protected-media/. When set,
+# the media view only checks access and nginx sends the file.
+MEDIA_ACCEL_REDIRECT = os.environ.get('MEDIA_ACCEL_REDIRECT', '')
+
+# Served by the workers, with far future caching for the fingerprinted
+# names, when nginx is not in front of them (deploy/nginx-http.txt)
+WHITENOISE = find_spec('whitenoise') is not None
+
+if WHITENOISE:
+    MIDDLEWARE.insert(
+        MIDDLEWARE.index('django.middleware.security.SecurityMiddleware') + 1,
+        'whitenoise.middleware.WhiteNoiseMiddleware',
+    )
+    STATICFILES_STORAGE = 'utils.staticfiles.ManifestStaticFilesStorage'
@@ -0,0 +1,9 @@
+CACHES = {
+    'default': {
+        # LocMemCache that reports hits and misses to /metrics
+        'BACKEND': 'instrumentation.cache.LocMemCache',
+        'OPTIONS': {
+            'METRICS_NAME': 'default',
+        },
+    },
+}
@@ -1,15 +1,78 @@
 import os
 
+from .middlewares import MIDDLEWARE
+
 # Database
 # https://docs.djangoproject.com/en/3.2/ref/settings/#databases
 
+DATABASE_ENGINE = os.environ.get('DATABASE_ENGINE')
+
+# Connections opened per process and reused, 0 = one per request
+DATABASE_POOL_SIZE = int(os.environ.get('DATABASE_POOL_SIZE') or 0)
+
 DATABASES = {
     'default': {
-        'ENGINE': os.environ.get('DATABASE_ENGINE'),
+        # Wraps DATABASE_ENGINE with health checks, pooling and metrics
+        'ENGINE': 'instrumentation.db' if DATABASE_ENGINE else None,
+        'WRAPPED_ENGINE': DATABASE_ENGINE,
         'NAME': os.environ.get('DATABASE_NAME'),
         'USER': os.environ.get('DATABASE_USER'),
         'PASSWORD': os.environ.get('DATABASE_PASSWORD'),
         'HOST': os.environ.get('DATABASE_HOST'),
         'PORT': os.environ.get('DATABASE_PORT'),
+        # Pooled connections go back to the pool at the end of the request
+        # instead of staying open in the thread that used them
+        'CONN_MAX_AGE': 0 if DATABASE_POOL_SIZE else int(
+            os.environ.get('DATABASE_CONN_MAX_AGE') or 60
+        ),
+        'HEALTH_CHECKS': os.environ.get(
+            'DATABASE_CONN_HEALTH_CHECKS', '1'
+        ) == '1',
+        'POOL_SIZE': DATABASE_POOL_SIZE,
+        'POOL_TIMEOUT': int(os.environ.get('DATABASE_POOL_TIMEOUT') or 10),
     }
 }
+
+# Applied to every SQLite connection by instrumentation.db.sqlite, see there
+# why. SQLITE_TUNING=0 keeps SQLite's defaults.
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'mmap_size': int(os.environ.get('SQLITE_MMAP_SIZE') or 256 * 2 ** 20),
+    # Negative values are KiB instead of pages
+    'cache_size': -int(os.environ.get('SQLITE_CACHE_SIZE_KB') or 20000),
+    'busy_timeout': int(os.environ.get('SQLITE_BUSY_TIMEOUT_MS') or 5000),
+} if os.environ.get('SQLITE_TUNING', '1') == '1' else {}
+
+# Seconds between PRAGMA optimize runs in each process (0 = never). Before
+# SQLite 3.46 it runs when a connection is closed, see CONN_MAX_AGE.
+SQLITE_OPTIMIZE_INTERVAL = int(
+    os.environ.get('SQLITE_OPTIMIZE_INTERVAL') or 3600
+)
+
+# Read replicas, comma separated hosts (file names with SQLite) that share
+# the settings above. Only views with read_replica = True read from them.
+DATABASE_REPLICAS = []
+
+for number, replica in enumerate(filter(None, (
+    value.strip()
+    for value in os.environ.get('DATABASE_REPLICAS', '').split(',')
+)), 1):
+    alias = f'replica{number}'
+    DATABASES[alias] = {
+        **DATABASES['default'],
+        'NAME' if 'sqlite' in (DATABASE_ENGINE or '') else 'HOST': replica,
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_REPLICAS.append(alias)
+
+# Seconds a client reads from the primary after writing, at least how far
+# the replicas fall behind
+DATABASE_REPLICA_LAG = int(os.environ.get('DATABASE_REPLICA_LAG') or 5)
+
+if DATABASE_REPLICAS:
+    DATABASE_ROUTERS = ['utils.replicas.ReplicaRouter']
+    MIDDLEWARE.insert(
+        MIDDLEWARE.index('django.middleware.security.SecurityMiddleware') + 1,
+        'utils.replicas.ReplicaRoutingMiddleware',
+    )
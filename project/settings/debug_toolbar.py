@@ -1,11 +1,19 @@
+from importlib.util import find_spec
+
+from .environment import DEBUG
 from .installed_apps import INSTALLED_APPS
 from .middlewares import MIDDLEWARE
 
-INSTALLED_APPS += ['debug_toolbar', ]
+# Only in development, and only where django-debug-toolbar is installed, so
+# production workers and management commands never import it
+DEBUG_TOOLBAR = DEBUG and find_spec('debug_toolbar') is not None
+
+if DEBUG_TOOLBAR:
+    INSTALLED_APPS += ['debug_toolbar', ]
 
-MIDDLEWARE = [
-    'debug_toolbar.middleware.DebugToolbarMiddleware',
-] + MIDDLEWARE
+    MIDDLEWARE = [
+        'debug_toolbar.middleware.DebugToolbarMiddleware',
+    ] + MIDDLEWARE
 
 INTERNAL_IPS = [
     '127.0.0.1',
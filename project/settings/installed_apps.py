@@ -15,4 +15,5 @@ INSTALLED_APPS = [
     'recipes',
     'authors',
     'tag',
+    'instrumentation',
 ]
@@ -0,0 +1,60 @@
+import os
+
+from .environment import BASE_DIR
+
+# Server-Timing exposes DB and template timings to whoever makes the
+# request, set SERVER_TIMING_HEADER=0 to keep them in the logs only.
+SERVER_TIMING_HEADER = os.environ.get('SERVER_TIMING_HEADER', '1') == '1'
+
+# Shared by every worker so /metrics adds up all of them. Empty it when the
+# server starts, leave it unset for a single process.
+METRICS_DIR = os.environ.get('METRICS_DIR', '')
+METRICS_FLUSH_INTERVAL = float(os.environ.get('METRICS_FLUSH_INTERVAL', 1))
+# /metrics answers staff users and `Authorization: Bearer <METRICS_TOKEN>`
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN', '')
+
+# 'warn' or 'raise' to report statements repeated per row in a request
+N_PLUS_ONE_DETECTION = os.environ.get('N_PLUS_ONE_DETECTION', '')
+N_PLUS_ONE_THRESHOLD = int(os.environ.get('N_PLUS_ONE_THRESHOLD', 3))
+
+# Queries slower than this are logged with their plan (0 disables it).
+# EXPLAIN runs for the first slow run of each statement and then on a
+# sample, so the overhead stays bounded.
+SLOW_QUERY_THRESHOLD_MS = float(
+    os.environ.get('SLOW_QUERY_THRESHOLD_MS', 200)
+)
+SLOW_QUERY_EXPLAIN_SAMPLE_RATE = float(
+    os.environ.get('SLOW_QUERY_EXPLAIN_SAMPLE_RATE', 0.1)
+)
+
+# cProfile for requests sending `X-Profile: <PROFILER_TOKEN>` and for a
+# random share of all requests, both off by default
+PROFILER_TOKEN = os.environ.get('PROFILER_TOKEN', '')
+PROFILER_SAMPLE_RATE = float(os.environ.get('PROFILER_SAMPLE_RATE', 0))
+PROFILER_DIR = os.environ.get('PROFILER_DIR', BASE_DIR / 'profiles')
+PROFILER_MAX_FILES = int(os.environ.get('PROFILER_MAX_FILES', 200))
+
+# tracemalloc peak and net allocation per URL name, see
+# /instrumentation/memory/. Opt-in, tracing makes every allocation slower.
+MEMORY_PROFILING = os.environ.get('MEMORY_PROFILING') == '1'
+MEMORY_PROFILING_FRAMES = int(os.environ.get('MEMORY_PROFILING_FRAMES', 10))
+MEMORY_PROFILING_SNAPSHOT_RATE = float(
+    os.environ.get('MEMORY_PROFILING_SNAPSHOT_RATE', 0.1)
+)
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'instrumentation': {
+            'handlers': ['console'],
+            'level': os.environ.get('INSTRUMENTATION_LOG_LEVEL', 'INFO'),
+            'propagate': False,
+        },
+    },
+}
@@ -1,4 +1,8 @@
 MIDDLEWARE = [
+    'instrumentation.middleware.ServerTimingMiddleware',
+    'instrumentation.nplusone.NPlusOneMiddleware',
+    'instrumentation.slow_queries.SlowQueryMiddleware',
+    'instrumentation.memory.MemoryProfilerMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
@@ -8,4 +12,5 @@ MIDDLEWARE = [
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'django.middleware.locale.LocaleMiddleware',
+    'instrumentation.profiling.ProfilerMiddleware',
 ]
@@ -1,4 +1,25 @@
-from .environment import BASE_DIR
+import os
+from importlib.util import find_spec
+
+from .environment import BASE_DIR, DEBUG
+
+template_loaders = [
+    'django.template.loaders.filesystem.Loader',
+    'django.template.loaders.app_directories.Loader',
+]
+
+if not DEBUG:
+    # Templates are compiled once per process, edits need a restart
+    template_loaders = [
+        ('django.template.loaders.cached.Loader', template_loaders),
+    ]
+
+context_processors = [
+    'django.template.context_processors.debug',
+    'django.template.context_processors.request',
+    'django.contrib.auth.context_processors.auth',
+    'django.contrib.messages.context_processors.messages',
+]
 
 TEMPLATES = [
     {
@@ -6,14 +27,37 @@ TEMPLATES = [
         'DIRS': [
             BASE_DIR / 'base_templates',
         ],
-        'APP_DIRS': True,
         'OPTIONS': {
-            'context_processors': [
-                'django.template.context_processors.debug',
-                'django.template.context_processors.request',
-                'django.contrib.auth.context_processors.auth',
-                'django.contrib.messages.context_processors.messages',
-            ],
+            'context_processors': context_processors,
+            'loaders': template_loaders,
         },
     },
 ]
+
+# Jinja2 versions of the public recipe pages, under base_jinja2/ and the
+# jinja2/ directory of the apps. Only where Jinja2 is installed.
+JINJA2 = find_spec('jinja2') is not None
+
+if JINJA2:
+    TEMPLATES += [
+        {
+            'BACKEND': 'django.template.backends.jinja2.Jinja2',
+            'DIRS': [
+                BASE_DIR / 'base_jinja2',
+            ],
+            'APP_DIRS': True,
+            'OPTIONS': {
+                'environment': 'utils.jinja2_environment.environment',
+                'context_processors': context_processors,
+            },
+        },
+    ]
+
+# Engine of the public recipe pages: 'django' or 'jinja2'
+PUBLIC_TEMPLATE_ENGINE = 'jinja2' if (
+    JINJA2 and os.environ.get('PUBLIC_TEMPLATE_ENGINE') == 'jinja2'
+) else 'django'
+
+# Compiles every template when the WSGI/ASGI application is created, so the
+# first requests of each worker do not pay for it
+TEMPLATES_WARMUP = not DEBUG
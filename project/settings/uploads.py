@@ -0,0 +1,22 @@
+import os
+
+from .assets import MEDIA_ROOT
+
+# Cover uploads are streamed by utils.uploads.CoverUploadHandler, which
+# enforces the limits below before the file is fully received.
+FILE_UPLOAD_HANDLERS = [
+    'utils.uploads.CoverUploadHandler',
+    'django.core.files.uploadhandler.MemoryFileUploadHandler',
+    'django.core.files.uploadhandler.TemporaryFileUploadHandler',
+]
+
+COVER_UPLOAD_FIELDS = ['cover', ]
+COVER_UPLOAD_MAX_BYTES = int(
+    os.environ.get('COVER_UPLOAD_MAX_BYTES', 10 * 1024 * 1024)
+)
+COVER_UPLOAD_MAX_WIDTH = int(os.environ.get('COVER_UPLOAD_MAX_WIDTH', 8000))
+COVER_UPLOAD_MAX_HEIGHT = int(
+    os.environ.get('COVER_UPLOAD_MAX_HEIGHT', 8000)
+)
+# Must be on the same filesystem as MEDIA_ROOT so the final save is a rename
+COVER_UPLOAD_TEMP_DIR = MEDIA_ROOT / 'recipes' / 'covers' / '.uploads'
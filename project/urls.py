@@ -17,13 +17,26 @@ from django.conf import settings
 from django.conf.urls.static import static
 from django.contrib import admin
 from django.urls import include, path
+from recipes.views import serve_media
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('', include('recipes.urls')),
     path('authors/', include('authors.urls')),
-    path('__debug__/', include('debug_toolbar.urls')),
+    path('', include('instrumentation.urls')),
 ]
 
-urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
-urlpatterns += static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
+if settings.DEBUG_TOOLBAR:
+    urlpatterns += [path('__debug__/', include('debug_toolbar.urls'))]
+
+urlpatterns += [
+    path(
+        settings.MEDIA_URL.lstrip('/') + '<path:path>', serve_media,
+        name='media',
+    ),
+]
+
+if not settings.WHITENOISE:
+    urlpatterns += static(
+        settings.STATIC_URL, document_root=settings.STATIC_ROOT
+    )
@@ -9,6 +9,7 @@ https://docs.djangoproject.com/en/3.2/howto/deployment/wsgi/
 
 import os
 
+from django.conf import settings
 from django.core.wsgi import get_wsgi_application
 from dotenv import load_dotenv
 
@@ -16,3 +17,8 @@ os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'project.settings')
 
 load_dotenv()
 application = get_wsgi_application()
+
+if settings.TEMPLATES_WARMUP:
+    from utils.warmup import warm_templates
+
+    warm_templates()
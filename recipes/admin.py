@@ -1,4 +1,6 @@
 from django.contrib import admin
+from django.db import models
+from utils.django_forms import CoverImageField
 
 from .models import Category, Recipe
 
@@ -21,6 +23,10 @@ class RecipeAdmin(admin.ModelAdmin):
         "slug": ('title',)
     }
     autocomplete_fields = 'tags',
+    # Reports the errors of covers refused by CoverUploadHandler
+    formfield_overrides = {
+        models.ImageField: {'form_class': CoverImageField},
+    }
 
 
 admin.site.register(Category, CategoryAdmin)
@@ -0,0 +1,156 @@
+import time
+from collections import Counter, defaultdict
+
+from authors.models import Profile
+from django.apps import apps
+from django.core import serializers
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from utils.json_stream import iter_json_objects
+
+
+class Command(BaseCommand):
+    help = (
+        'Loads db.json-style fixtures or JSONL dumps with batched '
+        'bulk_create calls. Model save() and signals are skipped, their side '
+        'effects are reconciled once at the end. Meant for empty databases.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('files', nargs='+')
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument(
+            '--database', default=DEFAULT_DB_ALIAS,
+        )
+        parser.add_argument(
+            '-e', '--exclude', action='append', default=[],
+            help='An app_label or app_label.ModelName to skip.',
+        )
+        parser.add_argument(
+            '--ignore-conflicts', action='store_true',
+            help='Skip rows whose primary key or unique values already exist.',
+        )
+
+    def is_excluded(self, label, excluded):
+        app_label = label.split('.')[0]
+        return label.lower() in excluded or app_label.lower() in excluded
+
+    def iter_fixture_objects(self, files, excluded):
+        for file_name in files:
+            with open(file_name, encoding='utf-8') as file:
+                for obj in iter_json_objects(file):
+                    if self.is_excluded(obj['model'], excluded):
+                        continue
+                    yield obj
+
+    def flush(self, model, rows):
+        if not rows:
+            return
+
+        model._default_manager.db_manager(self.using).bulk_create(
+            rows,
+            batch_size=self.batch_size,
+            ignore_conflicts=self.ignore_conflicts,
+        )
+        self.inserted[model._meta.label] += len(rows)
+        rows.clear()
+
+    def add_m2m_rows(self, deserialized):
+        obj = deserialized.object
+
+        for field_name, values in (deserialized.m2m_data or {}).items():
+            field = obj._meta.get_field(field_name)
+            through = field.remote_field.through
+            source = f'{field.m2m_field_name()}_id'
+            target = f'{field.m2m_reverse_field_name()}_id'
+
+            rows = self.pending[through]
+            rows.extend(
+                through(**{source: obj.pk, target: value})
+                for value in values
+            )
+
+            if len(rows) >= self.batch_size:
+                self.flush(through, rows)
+
+    def reconcile(self):
+        # bulk_create skips the post_save signal that creates profiles
+        profiles = Profile.objects.db_manager(self.using).create_missing()
+
+        if profiles:
+            self.stdout.write(f'Created {len(profiles)} missing profiles')
+
+        if self.inserted['recipes.Recipe']:
+            self.stdout.write(
+                'Cover sizes and placeholders were not computed, run '
+                '`python manage.py reprocess_covers` to fill them in'
+            )
+
+        models = [apps.get_model(label) for label in self.inserted]
+        connection = connections[self.using]
+        sequence_sql = connection.ops.sequence_reset_sql(no_style(), models)
+
+        if sequence_sql:
+            with connection.cursor() as cursor:
+                for sql in sequence_sql:
+                    cursor.execute(sql)
+
+    def handle(self, *args, **options):
+        self.using = options['database']
+        self.batch_size = options['batch_size']
+        self.ignore_conflicts = options['ignore_conflicts']
+        self.inserted = Counter()
+        self.pending = defaultdict(list)
+        excluded = {label.lower() for label in options['exclude']}
+        connection = connections[self.using]
+        start = time.perf_counter()
+
+        objects = serializers.deserialize(
+            'python',
+            self.iter_fixture_objects(options['files'], excluded),
+            using=self.using,
+            ignorenonexistent=True,
+        )
+
+        try:
+            with transaction.atomic(using=self.using), \
+                    connection.constraint_checks_disabled():
+                for deserialized in objects:
+                    model = type(deserialized.object)
+                    rows = self.pending[model]
+                    rows.append(deserialized.object)
+
+                    if deserialized.m2m_data:
+                        # Through rows need the object's primary key
+                        if deserialized.object.pk is None:
+                            raise CommandError(
+                                f'{model._meta.label} objects with '
+                                'many-to-many data need a pk'
+                            )
+                        self.add_m2m_rows(deserialized)
+
+                    if len(rows) >= self.batch_size:
+                        self.flush(model, rows)
+
+                for model, rows in list(self.pending.items()):
+                    self.flush(model, rows)
+
+                connection.check_constraints(table_names=[
+                    apps.get_model(label)._meta.db_table
+                    for label in self.inserted
+                ])
+                self.reconcile()
+        except serializers.base.DeserializationError as error:
+            raise CommandError(str(error))
+
+        elapsed = time.perf_counter() - start
+        total = sum(self.inserted.values())
+
+        for label, count in self.inserted.most_common():
+            self.stdout.write(f'{label}: {count} rows')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Inserted {total} rows in {elapsed:.2f}s '
+            f'({total / elapsed if elapsed else 0:.0f} rows/s)'
+        ))
@@ -0,0 +1,111 @@
+import os
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from recipes.models import Recipe
+
+COVERS_DIR = os.path.join('recipes', 'covers')
+
+
+class Command(BaseCommand):
+    help = (
+        'Finds cover files under MEDIA_ROOT/recipes/covers that no recipe '
+        'references. Only reports them unless --delete is given.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--delete', action='store_true',
+            help='Remove the orphaned files instead of only listing them.',
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=500,
+            help='Number of files checked against the database per query.',
+        )
+        parser.add_argument(
+            '--min-age', type=int, default=3600,
+            help=(
+                'Ignore files modified less than this many seconds ago, '
+                'they may belong to an upload that is not committed yet.'
+            ),
+        )
+
+    def iter_files(self, path):
+        # scandir keeps memory flat no matter how many covers exist
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.name.startswith('.'):
+                    continue
+
+                if entry.is_dir(follow_symlinks=False):
+                    yield from self.iter_files(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    yield entry
+
+    def iter_batches(self, entries, batch_size):
+        batch = []
+
+        for entry in entries:
+            batch.append(entry)
+
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+
+        if batch:
+            yield batch
+
+    def get_cover_name(self, entry):
+        name = os.path.relpath(entry.path, settings.MEDIA_ROOT)
+        return name.replace(os.sep, '/')
+
+    def handle(self, *args, **options):
+        covers_path = os.path.join(settings.MEDIA_ROOT, COVERS_DIR)
+        newest_mtime = time.time() - options['min_age']
+        scanned = orphans = orphan_bytes = 0
+
+        if not os.path.isdir(covers_path):
+            self.stdout.write(f'{covers_path} does not exist')
+            return
+
+        batches = self.iter_batches(
+            self.iter_files(covers_path), options['batch_size']
+        )
+
+        for batch in batches:
+            names = {self.get_cover_name(entry): entry for entry in batch}
+            referenced = set(
+                Recipe.objects.filter(
+                    cover__in=names.keys()
+                ).values_list('cover', flat=True)
+            )
+            scanned += len(batch)
+
+            for name, entry in names.items():
+                if name in referenced:
+                    continue
+
+                stat = entry.stat(follow_symlinks=False)
+
+                if stat.st_mtime > newest_mtime:
+                    continue
+
+                orphans += 1
+                orphan_bytes += stat.st_size
+
+                if options['delete']:
+                    try:
+                        os.remove(entry.path)
+                    except FileNotFoundError:
+                        ...
+                    self.stdout.write(f'Removed {name}')
+                else:
+                    self.stdout.write(f'Orphan {name}')
+
+        action = 'removed' if options['delete'] else 'found'
+        self.stdout.write(self.style.SUCCESS(
+            f'{scanned} files scanned, {orphans} orphans {action} '
+            f'({orphan_bytes / 1024 / 1024:.2f} MB)'
+        ))
@@ -0,0 +1,229 @@
+import random
+import time
+
+from authors.models import Profile
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.db.models import Max
+from faker import Faker
+from tag.models import Tag
+
+from recipes.models import Category, Recipe
+
+User = get_user_model()
+
+PREPARATION_TIME_UNITS = 'Minutos', 'Horas',
+SERVINGS_UNITS = 'Porções', 'Pedaços', 'Pessoas',
+# Sampling from pre-built pools is what makes millions of rows feasible,
+# calling Faker for every recipe would dominate the run time.
+POOL_SIZE = 2000
+
+
+class Command(BaseCommand):
+    help = (
+        'Generates a reproducible synthetic dataset (users, categories, '
+        'tags and recipes) with batched inserts for scale testing.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=100)
+        parser.add_argument('--categories', type=int, default=10)
+        parser.add_argument('--tags', type=int, default=50)
+        parser.add_argument('--recipes', type=int, default=1000)
+        parser.add_argument(
+            '--publish-ratio', type=float, default=0.9,
+            help='Share of recipes created as published.',
+        )
+        parser.add_argument(
+            '--max-tags', type=int, default=5,
+            help='Maximum number of tags per recipe.',
+        )
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--batch-size', type=int, default=2000)
+        parser.add_argument(
+            '--password', default='P4ssw0rd',
+            help='Password for every generated user (hashed once).',
+        )
+
+    def next_pk(self, model):
+        return (model.objects.aggregate(pk=Max('pk'))['pk'] or 0) + 1
+
+    def make_pools(self, fake):
+        return {
+            'titles': [
+                fake.sentence(nb_words=self.rng.randint(2, 6))[:65]
+                .rstrip('.')
+                for _ in range(POOL_SIZE)
+            ],
+            'descriptions': [
+                fake.sentence(nb_words=self.rng.randint(8, 22))[:165]
+                for _ in range(POOL_SIZE)
+            ],
+            'paragraphs': [
+                fake.paragraph(nb_sentences=self.rng.randint(3, 8))
+                for _ in range(POOL_SIZE)
+            ],
+        }
+
+    def report(self, label, count, start):
+        elapsed = time.perf_counter() - start
+        self.stdout.write(
+            f'{label}: {count} rows in {elapsed:.2f}s '
+            f'({count / elapsed if elapsed else 0:.0f} rows/s)'
+        )
+
+    def create_users(self, fake, count, password):
+        start = time.perf_counter()
+        first_pk = self.next_pk(User)
+        hashed_password = make_password(password)
+        users = (
+            User(
+                pk=pk,
+                username=f'{fake.user_name()}{pk}',
+                first_name=fake.first_name(),
+                last_name=fake.last_name(),
+                email=f'user{pk}@{fake.free_email_domain()}',
+                password=hashed_password,
+            )
+            for pk in range(first_pk, first_pk + count)
+        )
+        User.objects.bulk_create(users, batch_size=self.batch_size)
+        # bulk_create skips the signal that creates profiles
+        Profile.objects.create_missing(batch_size=self.batch_size)
+        self.report('Users', count, start)
+        return list(range(first_pk, first_pk + count))
+
+    def create_categories(self, fake, count):
+        start = time.perf_counter()
+        first_pk = self.next_pk(Category)
+        Category.objects.bulk_create(
+            (
+                Category(pk=pk, name=fake.word().title()[:65])
+                for pk in range(first_pk, first_pk + count)
+            ),
+            batch_size=self.batch_size,
+        )
+        self.report('Categories', count, start)
+        return list(range(first_pk, first_pk + count))
+
+    def create_tags(self, fake, count):
+        start = time.perf_counter()
+        first_pk = self.next_pk(Tag)
+        Tag.objects.bulk_create(
+            (
+                Tag(pk=pk, name=fake.word())
+                for pk in range(first_pk, first_pk + count)
+            ),
+            batch_size=self.batch_size,
+        )
+        self.report('Tags', count, start)
+        return list(range(first_pk, first_pk + count))
+
+    def make_recipe(self, pk, pools, user_pks, category_pks, publish_ratio):
+        rng = self.rng
+        steps = rng.sample(pools['paragraphs'], rng.randint(2, 6))
+        category = rng.choice(category_pks) if category_pks else None
+
+        # A few recipes without category, like the real data has
+        if rng.random() < 0.05:
+            category = None
+
+        return Recipe(
+            pk=pk,
+            title=rng.choice(pools['titles']),
+            description=rng.choice(pools['descriptions']),
+            preparation_time=rng.randint(5, 180),
+            preparation_time_unit=rng.choice(PREPARATION_TIME_UNITS),
+            servings=rng.randint(1, 12),
+            servings_unit=rng.choice(SERVINGS_UNITS),
+            preparation_steps='\n\n'.join(steps),
+            is_published=rng.random() < publish_ratio,
+            author_id=rng.choice(user_pks) if user_pks else None,
+            category_id=category,
+        )
+
+    def create_recipes(self, count, pools, user_pks, category_pks, tag_pks,
+                       publish_ratio, max_tags):
+        start = time.perf_counter()
+        first_pk = self.next_pk(Recipe)
+        last_pk = first_pk + count
+        Through = Recipe.tags.through
+        # Zipf-like popularity, a handful of tags are used by most recipes
+        tag_weights = [1 / (rank + 1) for rank in range(len(tag_pks))]
+
+        for batch_start in range(first_pk, last_pk, self.batch_size):
+            batch_end = min(batch_start + self.batch_size, last_pk)
+            recipes = []
+            recipe_tags = []
+
+            for pk in range(batch_start, batch_end):
+                recipes.append(self.make_recipe(
+                    pk, pools, user_pks, category_pks, publish_ratio,
+                ))
+
+                if tag_pks and max_tags:
+                    chosen = set(self.rng.choices(
+                        tag_pks, tag_weights,
+                        k=self.rng.randint(0, max_tags),
+                    ))
+                    recipe_tags.extend(
+                        Through(recipe_id=pk, tag_id=tag_pk)
+                        for tag_pk in sorted(chosen)
+                    )
+
+            with transaction.atomic():
+                Recipe.objects.bulk_create(recipes)
+                Through.objects.bulk_create(
+                    recipe_tags, batch_size=self.batch_size
+                )
+
+            done = batch_end - first_pk
+            elapsed = time.perf_counter() - start
+            self.stdout.write(
+                f'Recipes: {done}/{count} '
+                f'({done / elapsed if elapsed else 0:.0f} rows/s)'
+            )
+
+        self.report('Recipes', count, start)
+
+    def reset_sequences(self):
+        # Rows were inserted with explicit pks, the sequences (PostgreSQL)
+        # would still hand out the old ones
+        models = [User, Category, Tag, Recipe, Recipe.tags.through]
+        sequence_sql = connection.ops.sequence_reset_sql(no_style(), models)
+
+        if sequence_sql:
+            with connection.cursor() as cursor:
+                for sql in sequence_sql:
+                    cursor.execute(sql)
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+        fake = Faker('pt_BR')
+        fake.seed_instance(options['seed'])
+        start = time.perf_counter()
+
+        with transaction.atomic():
+            user_pks = self.create_users(
+                fake, options['users'], options['password']
+            )
+            category_pks = self.create_categories(
+                fake, options['categories']
+            )
+            tag_pks = self.create_tags(fake, options['tags'])
+
+        pools = self.make_pools(fake)
+        self.create_recipes(
+            options['recipes'], pools, user_pks, category_pks, tag_pks,
+            options['publish_ratio'], options['max_tags'],
+        )
+        self.reset_sequences()
+
+        elapsed = time.perf_counter() - start
+        self.stdout.write(self.style.SUCCESS(
+            f'Dataset generated in {elapsed:.2f}s'
+        ))
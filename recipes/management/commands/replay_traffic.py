@@ -0,0 +1,245 @@
+import asyncio
+import json
+import time
+from collections import defaultdict
+from urllib.parse import urlsplit
+
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import Resolver404, resolve
+from utils.json_stream import iter_json_objects
+from utils.stats import percentile
+
+DEFAULT_BASE_URL = 'http://127.0.0.1:8000'
+UNRESOLVED_ROUTE = '<unresolved>'
+
+
+def get_route_name(path):
+    try:
+        return resolve(urlsplit(path).path).view_name
+    except Resolver404:
+        return UNRESOLVED_ROUTE
+
+
+class HTTPConnection:
+    """Minimal keep-alive HTTP/1.1 client on top of asyncio streams.
+
+    Only what a replay needs: one request at a time, Content-Length and
+    chunked bodies, and reconnecting when the server closes the connection
+    (gunicorn sync workers do after every response).
+    """
+
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self.reader = self.writer = None
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except OSError:
+                pass
+        self.reader = self.writer = None
+
+    async def read_body(self, headers):
+        if headers.get('transfer-encoding', '').lower() == 'chunked':
+            body = b''
+
+            while True:
+                size = int((await self.reader.readline()).split(b';')[0], 16)
+                chunk = await self.reader.readexactly(size + 2)
+
+                if not size:
+                    return body
+                body += chunk[:-2]
+
+        return await self.reader.readexactly(
+            int(headers.get('content-length', 0))
+        )
+
+    async def request(self, method, path, headers, body):
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(
+                self.host, self.port
+            )
+
+        head = [f'{method} {path} HTTP/1.1', f'Host: {self.host}']
+        head += [f'{name}: {value}' for name, value in headers.items()]
+        head.append(f'Content-Length: {len(body)}')
+        self.writer.write(('\r\n'.join(head) + '\r\n\r\n').encode() + body)
+        await self.writer.drain()
+
+        status_line = await self.reader.readline()
+
+        if not status_line:
+            raise ConnectionResetError('Connection closed by the server')
+
+        status = int(status_line.split()[1])
+        response_headers = {}
+
+        while (line := await self.reader.readline()) not in (b'\r\n', b''):
+            name, _, value = line.decode('latin-1').partition(':')
+            response_headers[name.strip().lower()] = value.strip()
+
+        response_body = b'' if method == 'HEAD' else \
+            await self.read_body(response_headers)
+
+        if response_headers.get('connection', '').lower() == 'close':
+            await self.close()
+
+        return status, response_body
+
+
+class Command(BaseCommand):
+    help = (
+        'Replays a JSONL request trace against a running server and reports '
+        'latency percentiles, throughput and error rate per route. Each line '
+        'is {"method": "GET", "path": "/?page=2"} with optional "headers" '
+        'and "body", lines without method and path are skipped.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('trace')
+        parser.add_argument('--base-url', default=DEFAULT_BASE_URL)
+        parser.add_argument('--concurrency', type=int, default=10)
+        parser.add_argument(
+            '--rate', type=float, default=0,
+            help='Requests per second to send, 0 sends as fast as possible.',
+        )
+        parser.add_argument(
+            '--repeat', type=int, default=1,
+            help='How many times the trace is replayed.',
+        )
+        parser.add_argument('--timeout', type=float, default=30)
+
+    def load_trace(self, file_name):
+        requests = []
+        skipped = 0
+
+        with open(file_name, encoding='utf-8') as file:
+            for obj in iter_json_objects(file):
+                if not isinstance(obj, dict) or not obj.get('path') \
+                        or not obj.get('method'):
+                    skipped += 1
+                    continue
+
+                body = obj.get('body') or ''
+
+                if not isinstance(body, str):
+                    body = json.dumps(body)
+
+                requests.append((
+                    obj['method'].upper(),
+                    obj['path'],
+                    obj.get('headers') or {},
+                    body.encode('utf-8'),
+                    get_route_name(obj['path']),
+                ))
+
+        if skipped:
+            self.stderr.write(f'Skipped {skipped} lines without method/path')
+
+        return requests
+
+    async def worker(self, queue, host, port, timeout):
+        connection = HTTPConnection(host, port)
+
+        while True:
+            item = await queue.get()
+
+            if item is None:
+                await connection.close()
+                return
+
+            method, path, headers, body, route = item
+            start = time.perf_counter()
+
+            try:
+                status, _ = await asyncio.wait_for(
+                    connection.request(method, path, headers, body), timeout
+                )
+                failed = status >= 500
+            except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError,
+                    ValueError, IndexError):
+                await connection.close()
+                failed = True
+
+            self.latencies[route].append(time.perf_counter() - start)
+            self.errors[route] += failed
+
+    async def replay(self, requests, host, port, options):
+        queue = asyncio.Queue(maxsize=options['concurrency'] * 2)
+        workers = [
+            asyncio.create_task(
+                self.worker(queue, host, port, options['timeout'])
+            )
+            for _ in range(options['concurrency'])
+        ]
+        interval = 1 / options['rate'] if options['rate'] else 0
+        start = time.perf_counter()
+        sent = 0
+
+        for _ in range(options['repeat']):
+            for item in requests:
+                if interval:
+                    delay = start + sent * interval - time.perf_counter()
+
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+
+                await queue.put(item)
+                sent += 1
+
+        for _ in workers:
+            await queue.put(None)
+
+        await asyncio.gather(*workers)
+        return time.perf_counter() - start
+
+    def report(self, elapsed):
+        header = (
+            f'{"route":<40} {"count":>7} {"rps":>8} {"p50 ms":>8} '
+            f'{"p95 ms":>8} {"p99 ms":>8} {"errors":>7}'
+        )
+        self.stdout.write(header)
+        self.stdout.write('-' * len(header))
+        rows = sorted(self.latencies.items(), key=lambda item: -len(item[1]))
+        all_latencies = []
+
+        for route, latencies in rows + [('TOTAL', all_latencies)]:
+            if route != 'TOTAL':
+                all_latencies.extend(latencies)
+                errors = self.errors[route]
+            else:
+                errors = sum(self.errors.values())
+
+            latencies = sorted(latencies)
+            count = len(latencies)
+            self.stdout.write(
+                f'{route:<40} {count:>7} {count / elapsed:>8.1f} '
+                f'{percentile(latencies, 50) * 1000:>8.1f} '
+                f'{percentile(latencies, 95) * 1000:>8.1f} '
+                f'{percentile(latencies, 99) * 1000:>8.1f} '
+                f'{errors / count if count else 0:>7.1%}'
+            )
+
+    def handle(self, *args, **options):
+        base_url = urlsplit(options['base_url'])
+
+        if base_url.scheme != 'http' or not base_url.hostname:
+            raise CommandError('--base-url must be an http:// URL')
+        if options['concurrency'] < 1:
+            raise CommandError('--concurrency must be at least 1')
+
+        requests = self.load_trace(options['trace'])
+
+        if not requests:
+            raise CommandError(f'No requests found in {options["trace"]}')
+
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        elapsed = asyncio.run(self.replay(
+            requests, base_url.hostname, base_url.port or 80, options
+        ))
+        self.report(elapsed)
@@ -0,0 +1,185 @@
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from utils.images import reprocess_image
+
+from recipes.models import Recipe
+
+
+class Command(BaseCommand):
+    help = (
+        'Resizes and re-encodes existing recipe covers to the current '
+        'Recipe.COVER_WIDTH / Recipe.COVER_QUALITY spec and backfills '
+        'their stored dimensions and placeholder.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size', type=int, default=200,
+            help='Number of recipes fetched and processed per chunk.',
+        )
+        parser.add_argument(
+            '--workers', type=int, default=os.cpu_count() or 1,
+            help='Size of the process pool.',
+        )
+        parser.add_argument(
+            '--width', type=int, default=Recipe.COVER_WIDTH,
+        )
+        parser.add_argument(
+            '--quality', type=int, default=Recipe.COVER_QUALITY,
+        )
+        parser.add_argument(
+            '--force', action='store_true',
+            help='Re-encode covers already encoded with this width and '
+                 'quality.',
+        )
+        parser.add_argument(
+            '--state-file',
+            default=os.path.join(
+                settings.MEDIA_ROOT, '.reprocess_covers.json'
+            ),
+            help='Where progress is stored so the command can be resumed.',
+        )
+        parser.add_argument(
+            '--restart', action='store_true',
+            help='Ignore any saved progress and start from the first recipe.',
+        )
+
+    def load_state(self, state_file, spec):
+        try:
+            with open(state_file) as file:
+                state = json.load(file)
+        except (FileNotFoundError, ValueError):
+            return 0
+
+        # Progress made against another spec does not count.
+        if state.get('spec') != spec:
+            return 0
+
+        return state.get('last_pk', 0)
+
+    def save_state(self, state_file, spec, last_pk):
+        tmp_file = f'{state_file}.tmp'
+        with open(tmp_file, 'w') as file:
+            json.dump({'spec': spec, 'last_pk': last_pk}, file)
+        os.replace(tmp_file, state_file)
+
+    def iter_chunks(self, last_pk, chunk_size):
+        qs = Recipe.objects.exclude(cover='').order_by('pk')
+
+        while True:
+            chunk = list(
+                qs.filter(pk__gt=last_pk).values_list(
+                    'pk', 'cover', 'cover_width', 'cover_spec',
+                )[:chunk_size]
+            )
+
+            if not chunk:
+                return
+
+            yield chunk
+            last_pk = chunk[-1][0]
+
+    def save_metadata(self, processed):
+        recipes = [
+            Recipe(
+                pk=pk,
+                cover_width=metadata['width'],
+                cover_height=metadata['height'],
+                cover_placeholder=metadata['placeholder'],
+                cover_spec=cover_spec,
+            )
+            for pk, metadata, cover_spec in processed
+        ]
+        Recipe.objects.bulk_update(
+            recipes,
+            ['cover_width', 'cover_height', 'cover_placeholder', 'cover_spec'],
+        )
+
+    def handle(self, *args, **options):
+        width = options['width']
+        quality = options['quality']
+        force = options['force']
+        state_file = options['state_file']
+        spec = {'width': width, 'quality': quality, 'force': force}
+        cover_spec = Recipe.get_cover_spec(width, quality)
+
+        last_pk = 0 if options['restart'] else self.load_state(
+            state_file, spec
+        )
+
+        if last_pk:
+            self.stdout.write(f'Resuming after recipe {last_pk}')
+
+        totals = {'resized': 0, 'skipped': 0, 'missing': 0, 'failed': 0}
+        failures = []
+        start = time.perf_counter()
+
+        with ProcessPoolExecutor(max_workers=options['workers']) as pool:
+            for chunk in self.iter_chunks(last_pk, options['chunk_size']):
+                paths = [
+                    os.path.join(settings.MEDIA_ROOT, cover)
+                    for _, cover, _, _ in chunk
+                ]
+                results = pool.map(
+                    reprocess_image,
+                    paths,
+                    [width] * len(paths),
+                    [quality] * len(paths),
+                    # Covers encoded with another width or quality are
+                    # re-encoded even when they are narrow enough
+                    [force or encoded != cover_spec for *_, encoded in chunk],
+                    # The width of covers without a spec is read from the
+                    # file, see below
+                    [cover_width is None or not encoded
+                     for _, _, cover_width, encoded in chunk],
+                    # Covers saved before cover_spec existed have none, the
+                    # ones already at the target width are not encoded again
+                    [not force and not encoded for *_, encoded in chunk],
+                )
+                processed = []
+
+                for (pk, cover, _, old_spec), result in zip(chunk, results):
+                    status, error, metadata = result
+                    totals[status] += 1
+
+                    if status in ('missing', 'failed'):
+                        failures.append((pk, cover, status, error))
+
+                    if metadata:
+                        processed.append((
+                            pk, metadata,
+                            cover_spec if status == 'resized' or (
+                                not old_spec and metadata['width'] == width
+                            ) else old_spec,
+                        ))
+
+                self.save_metadata(processed)
+
+                last_pk = chunk[-1][0]
+                self.save_state(state_file, spec, last_pk)
+
+                done = sum(totals.values())
+                elapsed = time.perf_counter() - start
+                self.stdout.write(
+                    f'{done} covers processed, last recipe {last_pk} '
+                    f'({done / elapsed:.1f} covers/s)'
+                )
+
+        elapsed = time.perf_counter() - start
+        done = sum(totals.values())
+
+        for pk, cover, status, error in failures:
+            self.stderr.write(f'Recipe {pk}: {status} {cover} {error}'.strip())
+
+        summary = ', '.join(
+            f'{count} {name}' for name, count in totals.items()
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'Done: {summary} in {elapsed:.2f}s '
+            f'({done / elapsed if elapsed else 0:.1f} covers/s)'
+        ))
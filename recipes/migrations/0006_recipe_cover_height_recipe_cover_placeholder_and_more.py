@@ -0,0 +1,28 @@
+# Generated by Django 4.0 on 2026-10-19 15:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0005_alter_recipe_options_alter_recipe_title'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='recipe',
+            name='cover_height',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='recipe',
+            name='cover_placeholder',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.AddField(
+            model_name='recipe',
+            name='cover_width',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.0 on 2026-10-19 16:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0006_recipe_cover_height_recipe_cover_placeholder_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='recipe',
+            name='cover',
+            field=models.ImageField(blank=True, db_index=True, default='', upload_to='recipes/covers/%Y/%m/%d/'),
+        ),
+    ]
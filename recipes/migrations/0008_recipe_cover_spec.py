@@ -0,0 +1,18 @@
+# Generated by Django 4.0 on 2026-10-19 17:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0007_recipe_cover_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='recipe',
+            name='cover_spec',
+            field=models.CharField(blank=True, default='', editable=False, max_length=20),
+        ),
+    ]
@@ -1,19 +1,19 @@
 import os
-import string
 # from collections import defaultdict
-from random import SystemRandom
+from functools import partial
 
 from django.conf import settings
 from django.contrib.auth.models import User
-from django.db import models
+from django.db import models, router
 from django.db.models import F, Value
 from django.db.models.functions import Concat
 # from django.forms import ValidationError
 from django.urls import reverse
-from django.utils.text import slugify
 from django.utils.translation import gettext_lazy as _
-from PIL import Image
 from tag.models import Tag
+from utils.images import get_image_metadata, resize_image
+from utils.slugs import (SlugAllocatingManagerMixin, allocate_slugs,
+                         save_with_new_slugs)
 
 
 class Category(models.Model):
@@ -23,7 +23,9 @@ class Category(models.Model):
         return self.name
 
 
-class RecipeManager(models.Manager):
+class RecipeManager(SlugAllocatingManagerMixin, models.Manager):
+    slug_source_field = 'title'
+
     def get_published(self):
         return self.filter(
             is_published=True
@@ -40,6 +42,11 @@ class RecipeManager(models.Manager):
 
 
 class Recipe(models.Model):
+    # Target spec for covers. Changing these only affects new uploads, run
+    # `python manage.py reprocess_covers` to bring existing covers in line.
+    COVER_WIDTH = 840
+    COVER_QUALITY = 50
+
     objects = RecipeManager()
     title = models.CharField(max_length=65, verbose_name=_('Title'))
     description = models.CharField(max_length=165)
@@ -53,8 +60,21 @@ class Recipe(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     is_published = models.BooleanField(default=False)
+    # Indexed for the access check of the media view
     cover = models.ImageField(
-        upload_to='recipes/covers/%Y/%m/%d/', blank=True, default='')
+        upload_to='recipes/covers/%Y/%m/%d/', blank=True, default='',
+        db_index=True)
+    # Filled in once when the cover is processed, see process_cover()
+    cover_width = models.PositiveIntegerField(
+        null=True, blank=True, editable=False)
+    cover_height = models.PositiveIntegerField(
+        null=True, blank=True, editable=False)
+    cover_placeholder = models.TextField(
+        blank=True, default='', editable=False)
+    # Width and quality the cover file was last encoded with, see
+    # get_cover_spec(). Empty when it was stored as uploaded.
+    cover_spec = models.CharField(
+        max_length=20, blank=True, default='', editable=False)
     category = models.ForeignKey(
         Category, on_delete=models.SET_NULL, null=True, blank=True,
         default=None,
@@ -70,40 +90,144 @@ class Recipe(models.Model):
     def get_absolute_url(self):
         return reverse('recipes:recipe', args=(self.id,))
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Keeps what was loaded so save() and the signals know what changed
+        # without querying the database again.
+        instance._loaded_values = {
+            field.attname: field.get_prep_value(value)
+            for field, value in zip(
+                (cls._meta.get_field(name) for name in field_names), values
+            )
+        }
+        return instance
+
+    def refresh_from_db(self, using=None, fields=None):
+        super().refresh_from_db(using, fields)
+        # The snapshot must follow the database, or save() would skip
+        # fields that were changed back to their old value
+        if not hasattr(self, '_loaded_values'):
+            self._loaded_values = {}
+        self._loaded_values.update(self.get_current_values(fields))
+
+    def get_current_values(self, field_names=None):
+        deferred_fields = self.get_deferred_fields()
+        return {
+            field.attname: field.get_prep_value(getattr(self, field.attname))
+            for field in self._meta.concrete_fields
+            if field.attname not in deferred_fields and (
+                field_names is None or field.name in field_names
+                or field.attname in field_names
+            )
+        }
+
+    def get_loaded_cover(self):
+        """Cover name as loaded from the database, None when unknown."""
+        return getattr(self, '_loaded_values', {}).get('cover')
+
+    def get_changed_fields(self):
+        """Names of the fields changed since the instance was loaded.
+
+        Returns None when the instance was not loaded from the database.
+        """
+        loaded_values = getattr(self, '_loaded_values', None)
+
+        if self._state.adding or loaded_values is None:
+            return None
+
+        deferred_fields = self.get_deferred_fields()
+
+        # Fields that were deferred and then set have no loaded value, they
+        # count as changed
+        return [
+            field.name
+            for field in self._meta.concrete_fields
+            if not field.primary_key
+            and field.attname not in deferred_fields
+            and (
+                field.attname not in loaded_values
+                or field.get_prep_value(getattr(self, field.attname))
+                != loaded_values[field.attname]
+            )
+        ]
+
+    @classmethod
+    def get_cover_spec(cls, width=None, quality=None):
+        width = cls.COVER_WIDTH if width is None else width
+        quality = cls.COVER_QUALITY if quality is None else quality
+        return f'{width}w-q{quality}'
+
     @staticmethod
-    def resize_image(image, new_width=800):
+    def resize_image(image, new_width=800, quality=50):
         image_full_path = os.path.join(settings.MEDIA_ROOT, image.name)
-        image_pillow = Image.open(image_full_path)
-        original_width, original_height = image_pillow.size
+        return resize_image(image_full_path, new_width, quality)
 
-        if original_width <= new_width:
-            image_pillow.close()
-            return
+    def reset_cover_metadata(self):
+        self.cover_width = None
+        self.cover_height = None
+        self.cover_placeholder = ''
+        self.cover_spec = ''
 
-        new_height = round((new_width * original_height) / original_width)
+    def process_cover(self):
+        resized = self.resize_image(
+            self.cover, self.COVER_WIDTH, self.COVER_QUALITY
+        )
+        metadata = get_image_metadata(
+            os.path.join(settings.MEDIA_ROOT, self.cover.name)
+        )
 
-        new_image = image_pillow.resize((new_width, new_height), Image.LANCZOS)
-        new_image.save(
-            image_full_path,
-            optimize=True,
-            quality=50,
+        self.cover_width = metadata['width']
+        self.cover_height = metadata['height']
+        self.cover_placeholder = metadata['placeholder']
+        # Covers narrower than COVER_WIDTH are kept as uploaded,
+        # reprocess_covers re-encodes them once
+        self.cover_spec = self.get_cover_spec() if resized else ''
+
+        Recipe.objects.filter(pk=self.pk).update(
+            cover_width=self.cover_width,
+            cover_height=self.cover_height,
+            cover_placeholder=self.cover_placeholder,
+            cover_spec=self.cover_spec,
         )
+        self._loaded_values.update(self.get_current_values(
+            ['cover_width', 'cover_height', 'cover_placeholder',
+             'cover_spec']
+        ))
 
     def save(self, *args, **kwargs):
-        if not self.slug:
-            rand_letters = ''.join(
-                SystemRandom().choices(
-                    string.ascii_letters + string.digits,
-                    k=5,
-                )
-            )
-            self.slug = slugify(f'{self.title}-{rand_letters}')
+        using = kwargs.get('using') or router.db_for_write(
+            Recipe, instance=self
+        )
+        allocated = [] if self.slug else [self]
+        allocate_slugs(Recipe, allocated, 'title', using=using)
+
+        if self.get_loaded_cover() not in (None, self.cover.name):
+            self.reset_cover_metadata()
+
+        changed_fields = self.get_changed_fields()
+        update_fields = kwargs.get('update_fields')
+
+        # Only write what changed, so a publish toggle does not rewrite the
+        # whole row. Without changes it is a full save, which still runs the
+        # signals and bumps updated_at.
+        if changed_fields and update_fields is None \
+                and not args and not kwargs.get('force_insert'):
+            update_fields = changed_fields + ['updated_at']
+            kwargs['update_fields'] = update_fields
+
+        saved = save_with_new_slugs(
+            Recipe, [self], allocated, 'title',
+            partial(super().save, *args, **kwargs), using,
+        )
 
-        saved = super().save(*args, **kwargs)
+        if not hasattr(self, '_loaded_values'):
+            self._loaded_values = {}
+        self._loaded_values.update(self.get_current_values(update_fields))
 
-        if self.cover:
+        if self.cover and self.cover_width is None:
             try:
-                self.resize_image(self.cover, 840)
+                self.process_cover()
             except FileNotFoundError:
                 ...
 
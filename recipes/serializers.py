@@ -1,6 +1,8 @@
 from authors.validators import AuthorRecipeValidator
+from django.core.exceptions import ValidationError
 from rest_framework import serializers
 from tag.models import Tag
+from utils.uploads import validate_cover_upload
 
 from .models import Recipe
 
@@ -11,6 +13,20 @@ class TagSerializer(serializers.ModelSerializer):
         fields = ['id', 'name', 'slug']
 
 
+class CoverImageField(serializers.ImageField):
+    def to_internal_value(self, data):
+        # Anything but an upload (e.g. a string in a JSON body) gets DRF's
+        # own "not a file" error
+        if not hasattr(data, 'size'):
+            return super().to_internal_value(data)
+
+        try:
+            validate_cover_upload(data)
+        except ValidationError as error:
+            raise serializers.ValidationError(error.messages)
+        return super().to_internal_value(data)
+
+
 class RecipeSerializer(serializers.ModelSerializer):
     class Meta:
         model = Recipe
@@ -20,7 +36,8 @@ class RecipeSerializer(serializers.ModelSerializer):
             'tag_objects', 'tag_links',
             'preparation_time', 'preparation_time_unit', 'servings',
             'servings_unit',
-            'preparation_steps', 'cover'
+            'preparation_steps', 'cover',
+            'cover_width', 'cover_height', 'cover_placeholder',
         ]
 
     public = serializers.BooleanField(
@@ -38,6 +55,9 @@ class RecipeSerializer(serializers.ModelSerializer):
         many=True, source='tags',
         read_only=True,
     )
+    cover = CoverImageField(
+        required=False,
+    )
     tag_links = serializers.HyperlinkedRelatedField(
         many=True,
         source='tags',
@@ -1,34 +1,64 @@
 import os
 
+from django.conf import settings
 from django.db.models.signals import pre_delete, pre_save
 from django.dispatch import receiver
+from utils.background import run_in_background_on_commit
 
 from recipes.models import Recipe
 
 
-def delete_cover(instance):
+def remove_file(path):
     try:
-        os.remove(instance.cover.path)
-    except (ValueError, FileNotFoundError):
+        os.remove(path)
+    except FileNotFoundError:
         ...
 
 
+def delete_cover(cover_name):
+    if not cover_name:
+        return
+
+    # The file is only removed once the row change is committed, a rollback
+    # leaves it in place.
+    run_in_background_on_commit(
+        remove_file, os.path.join(settings.MEDIA_ROOT, cover_name),
+    )
+
+
+def get_old_cover(instance):
+    old_cover = instance.get_loaded_cover()
+
+    # Only instances that were not loaded through the ORM need a query
+    if old_cover is None:
+        old_cover = Recipe.objects.filter(
+            pk=instance.pk
+        ).values_list('cover', flat=True).first()
+
+    return old_cover
+
+
 @receiver(pre_delete, sender=Recipe)
 def recipe_cover_delete(sender, instance, *args, **kwargs):
-    old_instance = Recipe.objects.filter(pk=instance.pk).first()
-
-    if old_instance:
-        delete_cover(old_instance)
+    delete_cover(get_old_cover(instance))
 
 
 @receiver(pre_save, sender=Recipe)
-def recipe_cover_update(sender, instance, *args, **kwargs):
-    old_instance = Recipe.objects.filter(pk=instance.pk).first()
+def recipe_cover_update(sender, instance, update_fields=None, *args,
+                        **kwargs):
+    if instance.pk is None:
+        return
+
+    if update_fields is not None and 'cover' not in update_fields:
+        return
+
+    old_cover = get_old_cover(instance)
 
-    if not old_instance:
+    if old_cover is None:
         return
 
-    is_new_cover = old_instance.cover != instance.cover
+    is_new_cover = old_cover != instance.cover.name
 
     if is_new_cover:
-        delete_cover(old_instance)
+        delete_cover(old_cover)
+        instance.reset_cover_metadata()
@@ -1,7 +1,31 @@
-from django.test import TestCase
+import tempfile
+
+from django.test import TestCase, override_settings
 from recipes.models import Category, Recipe, User
 
 
+class TemporaryDirectoryMixin:
+    """Runs each test with MEDIA_ROOT in a new temporary directory.
+
+    ``self.directory`` is its path. Override get_directory_settings() to
+    point other settings at it.
+    """
+
+    def get_directory_settings(self, directory):
+        return {'MEDIA_ROOT': directory}
+
+    def setUp(self) -> None:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        settings_override = override_settings(
+            **self.get_directory_settings(self.directory)
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        return super().setUp()
+
+
 class RecipeMixin:
     def make_category(self, name='Category'):
         return Category.objects.create(name=name)
@@ -0,0 +1,98 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from authors.models import Profile
+from django.core.management import call_command
+from tag.models import Tag
+
+from .test_recipe_base import Recipe, RecipeTestBase, User
+
+FIXTURE = [
+    {'model': 'auth.user', 'pk': 10, 'fields': {
+        'username': 'with_profile', 'password': '!', 'groups': [],
+        'user_permissions': [],
+    }},
+    {'model': 'auth.user', 'pk': 11, 'fields': {
+        'username': 'without_profile', 'password': '!', 'groups': [],
+        'user_permissions': [],
+    }},
+    {'model': 'recipes.category', 'pk': 1, 'fields': {'name': 'Category'}},
+    {'model': 'recipes.recipe', 'pk': 1, 'fields': {
+        'title': 'Fixture recipe', 'description': 'Description',
+        'slug': 'fixture-recipe', 'preparation_time': 10,
+        'preparation_time_unit': 'Minutos', 'servings': 5,
+        'servings_unit': 'Pessoas', 'preparation_steps': 'Steps',
+        'preparation_steps_is_html': False,
+        'created_at': '2021-11-17T12:26:04.596Z',
+        'updated_at': '2021-11-30T12:32:39.733Z', 'is_published': True,
+        'cover': '', 'category': 1, 'author': 10, 'tags': [1, 2],
+    }},
+    {'model': 'authors.profile', 'pk': 1, 'fields': {
+        'author': 10, 'bio': 'Bio',
+    }},
+    {'model': 'tag.tag', 'pk': 1, 'fields': {'name': 'One', 'slug': ''}},
+    {'model': 'tag.tag', 'pk': 2, 'fields': {'name': 'Two', 'slug': 'two'}},
+]
+
+
+class RecipeBulkLoaddataCommandTest(RecipeTestBase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        return super().setUp()
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+        return super().tearDown()
+
+    def write_fixture(self, name, jsonl=False):
+        path = os.path.join(self.tmp_dir.name, name)
+
+        with open(path, 'w') as file:
+            if jsonl:
+                file.writelines(json.dumps(obj) + '\n' for obj in FIXTURE)
+            else:
+                json.dump(FIXTURE, file)
+
+        return path
+
+    def load(self, *args):
+        out = StringIO()
+        call_command('bulk_loaddata', *args, stdout=out)
+        return out.getvalue()
+
+    def assert_fixture_loaded(self):
+        recipe = Recipe.objects.get(pk=1)
+        self.assertEqual(recipe.author.username, 'with_profile')
+        self.assertEqual(
+            sorted(recipe.tags.values_list('pk', flat=True)), [1, 2]
+        )
+        self.assertEqual(Profile.objects.get(author_id=10).bio, 'Bio')
+        self.assertTrue(Profile.objects.filter(author_id=11).exists())
+
+    def test_bulk_loaddata_loads_a_json_fixture(self):
+        out = self.load(self.write_fixture('db.json'))
+
+        self.assert_fixture_loaded()
+        self.assertIn('Created 1 missing profiles', out)
+        self.assertIn('rows/s', out)
+
+    def test_bulk_loaddata_loads_a_jsonl_dump(self):
+        self.load(
+            self.write_fixture('db.jsonl', jsonl=True), '--batch-size', '1'
+        )
+        self.assert_fixture_loaded()
+
+    def test_bulk_loaddata_allocates_missing_slugs(self):
+        self.load(self.write_fixture('db.json'))
+
+        self.assertRegex(Tag.objects.get(pk=1).slug, r'^one-[a-z0-9]{5}$')
+        self.assertEqual(Tag.objects.get(pk=2).slug, 'two')
+
+    def test_bulk_loaddata_skips_excluded_models(self):
+        self.load(self.write_fixture('db.json'), '-e', 'tag', '-e', 'recipes')
+
+        self.assertEqual(User.objects.count(), 2)
+        self.assertFalse(Recipe.objects.exists())
+        self.assertFalse(Tag.objects.exists())
@@ -0,0 +1,63 @@
+import os
+from io import StringIO
+
+from django.core.management import call_command
+
+from .test_recipe_base import Recipe, RecipeTestBase, TemporaryDirectoryMixin
+
+
+class RecipeCollectOrphanCoversCommandTest(TemporaryDirectoryMixin,
+                                           RecipeTestBase):
+    def make_file(self, name):
+        full_path = os.path.join(self.directory, name)
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+
+        with open(full_path, 'wb') as file:
+            file.write(b'cover')
+
+        return full_path
+
+    def collect(self, *args):
+        out = StringIO()
+        call_command(
+            'collect_orphan_covers', '--min-age', '0', '--batch-size', '1',
+            *args, stdout=out,
+        )
+        return out.getvalue()
+
+    def make_covers(self):
+        recipe = self.make_recipe()
+        used = 'recipes/covers/2022/01/01/used.jpg'
+        Recipe.objects.filter(pk=recipe.pk).update(cover=used)
+        return (
+            self.make_file(used),
+            self.make_file('recipes/covers/2022/01/02/orphan.jpg'),
+        )
+
+    def test_collect_orphan_covers_only_reports_by_default(self):
+        used_path, orphan_path = self.make_covers()
+
+        out = self.collect()
+
+        self.assertIn('Orphan recipes/covers/2022/01/02/orphan.jpg', out)
+        self.assertNotIn('used.jpg', out)
+        self.assertIn('2 files scanned, 1 orphans found', out)
+        self.assertTrue(os.path.exists(orphan_path))
+
+    def test_collect_orphan_covers_removes_orphans_with_delete(self):
+        used_path, orphan_path = self.make_covers()
+
+        self.collect('--delete')
+
+        self.assertTrue(os.path.exists(used_path))
+        self.assertFalse(os.path.exists(orphan_path))
+
+    def test_collect_orphan_covers_ignores_recent_and_hidden_files(self):
+        self.make_covers()
+        hidden_path = self.make_file('recipes/covers/.uploads/tmp.jpg')
+        out = StringIO()
+
+        call_command('collect_orphan_covers', '--delete', stdout=out)
+
+        self.assertIn('2 files scanned, 0 orphans removed', out.getvalue())
+        self.assertTrue(os.path.exists(hidden_path))
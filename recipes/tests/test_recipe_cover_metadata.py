@@ -0,0 +1,75 @@
+from io import BytesIO
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.urls import reverse
+from PIL import Image
+
+from .test_recipe_base import Recipe, RecipeTestBase, TemporaryDirectoryMixin
+
+
+def make_uploaded_image(name='cover.jpg', size=(1200, 600)):
+    buffer = BytesIO()
+    Image.new('RGB', size, color='red').save(buffer, 'JPEG')
+    return SimpleUploadedFile(
+        name, buffer.getvalue(), content_type='image/jpeg'
+    )
+
+
+class RecipeCoverMetadataTest(TemporaryDirectoryMixin, RecipeTestBase):
+    def make_recipe_with_cover(self, **kwargs):
+        recipe = self.make_recipe(**kwargs)
+        recipe.cover = make_uploaded_image()
+        recipe.save()
+        return recipe
+
+    def test_recipe_cover_metadata_is_stored_when_cover_is_saved(self):
+        recipe = self.make_recipe_with_cover()
+        recipe.refresh_from_db()
+
+        self.assertEqual(recipe.cover_width, Recipe.COVER_WIDTH)
+        self.assertEqual(recipe.cover_height, 420)
+        self.assertTrue(
+            recipe.cover_placeholder.startswith('data:image/jpeg;base64,')
+        )
+        self.assertEqual(recipe.cover_spec, Recipe.get_cover_spec())
+
+    def test_recipe_cover_metadata_is_empty_without_cover(self):
+        recipe = self.make_recipe()
+        recipe.refresh_from_db()
+
+        self.assertIsNone(recipe.cover_width)
+        self.assertEqual(recipe.cover_placeholder, '')
+
+    def test_recipe_cover_metadata_is_recomputed_when_cover_changes(self):
+        recipe = self.make_recipe_with_cover()
+
+        recipe.cover = make_uploaded_image('new.jpg', size=(400, 400))
+        recipe.save()
+        recipe.refresh_from_db()
+
+        self.assertEqual(recipe.cover_width, 400)
+        self.assertEqual(recipe.cover_height, 400)
+        # Kept as uploaded, reprocess_covers encodes it later
+        self.assertEqual(recipe.cover_spec, '')
+
+    def test_recipe_cover_metadata_is_rendered_in_the_template(self):
+        self.make_recipe_with_cover()
+
+        response = self.client.get(reverse('recipes:home'))
+
+        self.assertIn('width="840" height="420"', response.content.decode())
+
+    def test_recipe_cover_metadata_is_in_the_api_responses(self):
+        recipe = self.make_recipe_with_cover()
+
+        v1 = self.client.get(
+            reverse('recipes:recipes_api_v1_detail', args=(recipe.pk,))
+        )
+        v2 = self.client.get(
+            reverse('recipes:recipes-api-detail', args=(recipe.pk,))
+        )
+
+        for data in (v1.json(), v2.json()):
+            self.assertEqual(data['cover_width'], 840)
+            self.assertEqual(data['cover_height'], 420)
+            self.assertTrue(data['cover_placeholder'])
@@ -0,0 +1,67 @@
+from io import StringIO
+from unittest import mock
+
+from authors.models import Profile
+from django.core.management import call_command
+from django.db import connection
+from tag.models import Tag
+
+from .test_recipe_base import Category, Recipe, RecipeTestBase, User
+
+
+class RecipeGenerateDatasetCommandTest(RecipeTestBase):
+    def generate(self, *args):
+        out = StringIO()
+        call_command(
+            'generate_dataset', '--users', '5', '--categories', '3',
+            '--tags', '8', '--recipes', '30', '--batch-size', '7', *args,
+            stdout=out,
+        )
+        return out.getvalue()
+
+    def test_generate_dataset_creates_the_requested_rows(self):
+        out = self.generate()
+
+        self.assertEqual(User.objects.count(), 5)
+        self.assertEqual(Profile.objects.count(), 5)
+        self.assertEqual(Category.objects.count(), 3)
+        self.assertEqual(Tag.objects.count(), 8)
+        self.assertEqual(Recipe.objects.count(), 30)
+        self.assertFalse(Recipe.objects.filter(slug='').exists())
+        self.assertIn('Recipes: 30 rows', out)
+
+    def test_generate_dataset_resets_the_pk_sequences(self):
+        with mock.patch.object(
+            connection.ops, 'sequence_reset_sql', return_value=[]
+        ) as sequence_reset_sql:
+            self.generate()
+
+        models = sequence_reset_sql.call_args[0][1]
+        self.assertTrue({User, Category, Tag, Recipe} <= set(models))
+
+    def test_generate_dataset_respects_the_publish_ratio(self):
+        self.generate('--publish-ratio', '0')
+        self.assertFalse(Recipe.objects.filter(is_published=True).exists())
+
+    def test_generate_dataset_respects_max_tags(self):
+        self.generate('--max-tags', '2')
+
+        for recipe in Recipe.objects.prefetch_related('tags'):
+            self.assertLessEqual(len(recipe.tags.all()), 2)
+
+    def test_generate_dataset_is_reproducible_with_the_same_seed(self):
+        def snapshot():
+            return list(Recipe.objects.order_by('pk').values_list(
+                'title', 'preparation_time', 'is_published',
+            ))
+
+        self.generate('--seed', '7')
+        first = snapshot()
+        Recipe.objects.all().delete()
+        Tag.objects.all().delete()
+        Category.objects.all().delete()
+        User.objects.all().delete()
+
+        self.generate('--seed', '7')
+
+        self.assertEqual(first, snapshot())
@@ -0,0 +1,121 @@
+from html.parser import HTMLParser
+from unittest import skipUnless
+
+from django.conf import settings
+from django.test import override_settings
+from django.urls import reverse
+from tag.models import Tag
+
+from .test_recipe_base import RecipeTestBase
+
+
+class HTMLTokens(HTMLParser):
+    """Tags, attributes and text of a page, whitespace normalized.
+
+    Two pages with the same tokens are the same HTML, even if the engines
+    escaped characters or indented the markup differently.
+    """
+
+    def __init__(self, html):
+        super().__init__(convert_charrefs=True)
+        self.tokens = []
+        self.feed(html)
+        self.close()
+
+    def handle_starttag(self, tag, attrs):
+        attrs = [
+            (name, ' '.join((value or '').split()))
+            for name, value in attrs
+            # The masked CSRF token changes on every render
+            if not (name == 'value' and ('name', 'csrfmiddlewaretoken')
+                    in attrs)
+        ]
+        self.tokens.append(('start', tag, tuple(attrs)))
+
+    def handle_endtag(self, tag):
+        self.tokens.append(('end', tag))
+
+    def handle_data(self, data):
+        data = ' '.join(data.split())
+
+        if data:
+            self.tokens.append(('data', data))
+
+
+@skipUnless(settings.JINJA2, 'Jinja2 is not installed')
+class RecipeJinja2TemplatesTest(RecipeTestBase):
+    def get_both(self, url):
+        pages = []
+
+        for engine in 'django', 'jinja2':
+            with override_settings(PUBLIC_TEMPLATE_ENGINE=engine):
+                response = self.client.get(url)
+
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.using, engine)
+            pages.append(response.content.decode())
+
+        return pages
+
+    def assertSameHTML(self, url):
+        django_html, jinja2_html = self.get_both(url)
+        self.assertEqual(
+            HTMLTokens(django_html).tokens, HTMLTokens(jinja2_html).tokens
+        )
+
+    def test_home_is_the_same_with_both_engines(self):
+        self.make_recipe_in_batch(qtd=3)
+        self.assertSameHTML(reverse('recipes:home'))
+
+    def test_empty_home_is_the_same_with_both_engines(self):
+        self.assertSameHTML(reverse('recipes:home'))
+
+    def test_paginated_home_is_the_same_with_both_engines(self):
+        self.make_recipe_in_batch(qtd=20)
+        self.assertSameHTML(reverse('recipes:home') + '?page=2')
+
+    def test_category_is_the_same_with_both_engines(self):
+        recipe = self.make_recipe()
+        self.assertSameHTML(
+            reverse('recipes:category', args=(recipe.category.pk,))
+        )
+
+    def test_tag_is_the_same_with_both_engines(self):
+        recipe = self.make_recipe()
+        tag = Tag.objects.create(name='Quick & easy')
+        recipe.tags.add(tag)
+        self.assertSameHTML(reverse('recipes:tag', args=(tag.slug,)))
+
+    def test_search_is_the_same_with_both_engines(self):
+        self.make_recipe(title="Grandma's <best> \"cake\"")
+        self.assertSameHTML(reverse('recipes:search') + "?q=Grandma's")
+
+    def test_detail_is_the_same_with_both_engines(self):
+        recipe = self.make_recipe(preparation_steps='Step 1\nStep <2>')
+        recipe.tags.add(Tag.objects.create(name='Dessert'))
+        self.assertSameHTML(reverse('recipes:recipe', args=(recipe.pk,)))
+
+    def test_detail_with_html_steps_is_the_same_with_both_engines(self):
+        recipe = self.make_recipe(
+            preparation_steps='<p>Step <strong>1</strong></p>',
+            preparation_steps_is_html=True,
+        )
+        self.assertSameHTML(reverse('recipes:recipe', args=(recipe.pk,)))
+
+    def test_pages_are_the_same_for_a_logged_in_user(self):
+        recipe = self.make_recipe()
+        self.client.force_login(recipe.author)
+        self.assertSameHTML(reverse('recipes:home'))
+
+    def test_a_view_can_pin_its_engine(self):
+        from recipes.views.site import RecipeListViewHome
+
+        self.make_recipe()
+
+        with override_settings(PUBLIC_TEMPLATE_ENGINE='django'):
+            response = RecipeListViewHome.as_view(template_engine='jinja2')(
+                self.client.get('/').wsgi_request
+            )
+
+        self.assertEqual(response.using, 'jinja2')
+        self.assertIn('Recipe Title', response.rendered_content)
@@ -0,0 +1,121 @@
+import os
+import shutil
+import tempfile
+
+from django.test import override_settings
+from django.urls import reverse
+from recipes.models import Recipe
+
+from .test_recipe_base import RecipeTestBase
+
+COVER_NAME = 'recipes/covers/2022/01/01/cover.jpg'
+COVER_CONTENT = bytes(range(256)) * 4
+
+
+class RecipeMediaViewTest(RecipeTestBase):
+    def setUp(self):
+        super().setUp()
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        settings_override = override_settings(
+            MEDIA_ROOT=self.media_root, MEDIA_ACCEL_REDIRECT='',
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.write_media_file(COVER_NAME)
+        self.recipe = self.make_recipe()
+        # update() skips the cover processing done by save()
+        Recipe.objects.filter(pk=self.recipe.pk).update(cover=COVER_NAME)
+        self.url = reverse('media', args=(COVER_NAME,))
+
+    def write_media_file(self, name):
+        path = os.path.join(self.media_root, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        with open(path, 'wb') as file:
+            file.write(COVER_CONTENT)
+
+    def test_published_cover_is_served_with_public_caching(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), COVER_CONTENT)
+        self.assertEqual(response['Content-Type'], 'image/jpeg')
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        self.assertIn('public', response['Cache-Control'])
+
+    def test_range_request_returns_partial_content(self):
+        response = self.client.get(self.url, HTTP_RANGE='bytes=10-19')
+
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Content-Length'], '10')
+        self.assertEqual(
+            response['Content-Range'], f'bytes 10-19/{len(COVER_CONTENT)}'
+        )
+        self.assertEqual(
+            b''.join(response.streaming_content), COVER_CONTENT[10:20]
+        )
+
+    def test_range_past_the_end_is_not_satisfiable(self):
+        response = self.client.get(self.url, HTTP_RANGE='bytes=5000-')
+
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(
+            response['Content-Range'], f'bytes */{len(COVER_CONTENT)}'
+        )
+
+    def test_range_is_ignored_when_if_range_names_another_version(self):
+        response = self.client.get(
+            self.url, HTTP_RANGE='bytes=10-19', HTTP_IF_RANGE='"old"'
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), COVER_CONTENT)
+
+    def test_unchanged_cover_returns_not_modified(self):
+        etag = self.client.get(self.url)['ETag']
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+
+    def test_draft_cover_is_hidden_from_other_users(self):
+        Recipe.objects.filter(pk=self.recipe.pk).update(is_published=False)
+
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+
+    def test_draft_cover_is_served_privately_to_its_author(self):
+        Recipe.objects.filter(pk=self.recipe.pk).update(is_published=False)
+        self.client.force_login(self.recipe.author)
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('private', response['Cache-Control'])
+
+    def test_files_no_recipe_points_to_are_not_served(self):
+        name = 'recipes/covers/2022/01/01/orphan.jpg'
+        self.write_media_file(name)
+
+        response = self.client.get(reverse('media', args=(name,)))
+        self.assertEqual(response.status_code, 404)
+
+    def test_hidden_and_outside_paths_are_not_served(self):
+        for path in (
+            'recipes/covers/.uploads/cover.jpg',
+            'recipes/../../etc/passwd',
+        ):
+            with self.subTest(path=path):
+                response = self.client.get('/media/' + path)
+                self.assertEqual(response.status_code, 404)
+
+    def test_accel_redirect_hands_the_file_to_nginx(self):
+        with self.settings(MEDIA_ACCEL_REDIRECT='/protected-media/'):
+            response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response['X-Accel-Redirect'], '/protected-media/' + COVER_NAME
+        )
+        self.assertEqual(response['Content-Type'], 'image/jpeg')
+        self.assertEqual(response.content, b'')
@@ -0,0 +1,145 @@
+import os
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from utils.background import wait_for_background_tasks
+
+from .test_recipe_base import Recipe, RecipeTestBase, TemporaryDirectoryMixin
+from .test_recipe_cover_metadata import make_uploaded_image
+
+
+class RecipeModelSaveTest(TemporaryDirectoryMixin, RecipeTestBase):
+    def get_recipe_selects(self, queries):
+        return [
+            query['sql'] for query in queries
+            if query['sql'].startswith('SELECT')
+            and '"recipes_recipe"' in query['sql']
+        ]
+
+    def test_recipe_save_writes_only_changed_columns(self):
+        recipe = Recipe.objects.get(pk=self.make_recipe().pk)
+        recipe.is_published = False
+
+        with CaptureQueriesContext(connection) as ctx:
+            recipe.save()
+
+        self.assertEqual(len(ctx.captured_queries), 1)
+        sql = ctx.captured_queries[0]['sql']
+        self.assertIn('"is_published"', sql)
+        self.assertIn('"updated_at"', sql)
+        self.assertNotIn('"title"', sql)
+        self.assertFalse(Recipe.objects.get(pk=recipe.pk).is_published)
+
+    def test_recipe_save_without_changes_is_a_full_save(self):
+        recipe = Recipe.objects.get(pk=self.make_recipe().pk)
+        updated_at = recipe.updated_at
+
+        with CaptureQueriesContext(connection) as ctx:
+            recipe.save()
+
+        self.assertEqual(len(ctx.captured_queries), 1)
+        self.assertIn('"title"', ctx.captured_queries[0]['sql'])
+        self.assertGreater(
+            Recipe.objects.get(pk=recipe.pk).updated_at, updated_at
+        )
+
+    def test_recipe_save_after_refresh_writes_reverted_fields(self):
+        recipe = Recipe.objects.get(pk=self.make_recipe().pk)
+        Recipe.objects.filter(pk=recipe.pk).update(is_published=False)
+
+        recipe.refresh_from_db()
+        recipe.is_published = True
+        recipe.save()
+
+        self.assertTrue(Recipe.objects.get(pk=recipe.pk).is_published)
+
+    def test_recipe_save_writes_deferred_fields_that_were_set(self):
+        recipe = Recipe.objects.only('id', 'title').get(
+            pk=self.make_recipe().pk
+        )
+        recipe.description = 'A new description'
+        recipe.save()
+
+        self.assertEqual(
+            Recipe.objects.get(pk=recipe.pk).description, 'A new description'
+        )
+
+    def test_recipe_deferred_fields_loaded_later_are_tracked(self):
+        recipe = Recipe.objects.only('id', 'title').get(
+            pk=self.make_recipe().pk
+        )
+        recipe.servings  # Loaded through refresh_from_db
+        recipe.servings = 10
+
+        self.assertEqual(recipe.get_changed_fields(), ['servings'])
+
+        recipe.save()
+
+        self.assertEqual(Recipe.objects.get(pk=recipe.pk).servings, 10)
+
+    def test_recipe_save_twice_only_writes_new_changes(self):
+        recipe = Recipe.objects.get(pk=self.make_recipe().pk)
+        recipe.title = 'A new title'
+        recipe.save()
+        recipe.servings = 10
+
+        with CaptureQueriesContext(connection) as ctx:
+            recipe.save()
+
+        self.assertNotIn('"title"', ctx.captured_queries[0]['sql'])
+
+    def test_recipe_cover_signals_do_not_select_loaded_recipes(self):
+        recipe = self.make_recipe()
+        recipe.cover = make_uploaded_image()
+        recipe.save()
+        recipe = Recipe.objects.get(pk=recipe.pk)
+        recipe.cover = make_uploaded_image('new.jpg')
+
+        with CaptureQueriesContext(connection) as ctx:
+            recipe.save()
+            recipe.delete()
+
+        self.assertEqual(self.get_recipe_selects(ctx.captured_queries), [])
+
+    def test_recipe_old_cover_is_deleted_when_cover_changes(self):
+        recipe = self.make_recipe()
+        recipe.cover = make_uploaded_image()
+        recipe.save()
+        old_cover_path = recipe.cover.path
+        recipe = Recipe.objects.get(pk=recipe.pk)
+
+        recipe.cover = make_uploaded_image('new.jpg')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            recipe.save()
+
+        wait_for_background_tasks()
+        self.assertFalse(os.path.exists(old_cover_path))
+        self.assertTrue(os.path.exists(recipe.cover.path))
+
+    def test_recipe_old_cover_is_kept_until_the_transaction_commits(self):
+        recipe = self.make_recipe()
+        recipe.cover = make_uploaded_image()
+        recipe.save()
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            recipe.delete()
+
+        wait_for_background_tasks()
+        self.assertTrue(os.path.exists(recipe.cover.path))
+        self.assertEqual(len(callbacks), 1)
+
+        callbacks[0]()
+        wait_for_background_tasks()
+        self.assertFalse(os.path.exists(recipe.cover.path))
+
+    def test_recipe_cover_is_kept_when_update_fields_skip_it(self):
+        recipe = self.make_recipe()
+        recipe.cover = make_uploaded_image()
+        recipe.save()
+        cover_path = recipe.cover.path
+
+        recipe.is_published = False
+        recipe.save(update_fields=['is_published'])
+
+        self.assertTrue(os.path.exists(cover_path))
@@ -0,0 +1,74 @@
+import json
+import tempfile
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.test import LiveServerTestCase
+
+from .test_recipe_base import RecipeMixin
+
+
+class RecipeReplayTrafficCommandTest(LiveServerTestCase, RecipeMixin):
+    def write_trace(self, lines):
+        trace = tempfile.NamedTemporaryFile('w', suffix='.jsonl')
+        trace.write('\n'.join(json.dumps(line) for line in lines))
+        trace.flush()
+        self.addCleanup(trace.close)
+        return trace.name
+
+    def replay(self, lines, *args):
+        out = StringIO()
+        err = StringIO()
+        call_command(
+            'replay_traffic', self.write_trace(lines),
+            '--base-url', self.live_server_url, *args,
+            stdout=out, stderr=err,
+        )
+        return out.getvalue(), err.getvalue()
+
+    def get_row(self, out, route):
+        for line in out.splitlines():
+            if line.startswith(route + ' '):
+                return line.split()
+        self.fail(f'{route} not in report:\n{out}')
+
+    def test_replay_traffic_reports_each_route(self):
+        recipe = self.make_recipe()
+        out, _ = self.replay([
+            {'method': 'GET', 'path': '/'},
+            {'method': 'GET', 'path': '/?page=2'},
+            {'method': 'GET', 'path': f'/recipes/{recipe.pk}/'},
+            {'method': 'GET', 'path': '/recipes/search/?q=a'},
+        ], '--concurrency', '2', '--repeat', '2')
+
+        self.assertEqual(self.get_row(out, 'recipes:home')[1], '4')
+        self.assertEqual(self.get_row(out, 'recipes:recipe')[1], '2')
+        self.assertEqual(self.get_row(out, 'recipes:search')[1], '2')
+        self.assertEqual(self.get_row(out, 'TOTAL')[1], '8')
+        self.assertEqual(self.get_row(out, 'TOTAL')[-1], '0.0%')
+
+    def test_replay_traffic_skips_lines_without_method_and_path(self):
+        out, err = self.replay([
+            {'request_id': 'x', 'title': 'Not a request'},
+            {'method': 'POST', 'path': '/authors/login/create/',
+             'body': 'username=a&password=b',
+             'headers': {
+                 'Content-Type': 'application/x-www-form-urlencoded'
+             }},
+        ])
+
+        self.assertIn('Skipped 1 lines', err)
+        self.assertEqual(self.get_row(out, 'TOTAL')[1], '1')
+
+    def test_replay_traffic_counts_unreachable_server_as_errors(self):
+        out = StringIO()
+        call_command(
+            'replay_traffic',
+            self.write_trace([{'method': 'GET', 'path': '/'}]),
+            '--base-url', 'http://127.0.0.1:1', stdout=out,
+        )
+        self.assertEqual(self.get_row(out.getvalue(), 'TOTAL')[-1], '100.0%')
+
+    def test_replay_traffic_fails_on_empty_trace(self):
+        with self.assertRaises(CommandError):
+            self.replay([{'title': 'Not a request'}])
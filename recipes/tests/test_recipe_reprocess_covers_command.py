@@ -0,0 +1,142 @@
+import json
+import os
+from io import StringIO
+
+from django.core.management import call_command
+from PIL import Image
+
+from .test_recipe_base import Recipe, RecipeTestBase, TemporaryDirectoryMixin
+
+
+class RecipeReprocessCoversCommandTest(TemporaryDirectoryMixin,
+                                       RecipeTestBase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.state_file = os.path.join(self.directory, 'state.json')
+
+    def make_cover(self, recipe, name, width):
+        cover = f'recipes/covers/{name}.jpg'
+        full_path = os.path.join(self.directory, cover)
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        Image.new('RGB', (width, width // 2)).save(full_path)
+        # Bypass Recipe.save() so the cover stays at its original size
+        Recipe.objects.filter(pk=recipe.pk).update(cover=cover)
+        return full_path
+
+    def reprocess(self, *args):
+        out = StringIO()
+        err = StringIO()
+        call_command(
+            'reprocess_covers', '--workers', '1',
+            '--state-file', self.state_file, *args,
+            stdout=out, stderr=err,
+        )
+        return out.getvalue(), err.getvalue()
+
+    def test_reprocess_covers_resizes_covers_wider_than_target(self):
+        recipe = self.make_recipe()
+        full_path = self.make_cover(recipe, 'wide', 1200)
+
+        out, _ = self.reprocess()
+
+        with Image.open(full_path) as image:
+            self.assertEqual(image.size[0], Recipe.COVER_WIDTH)
+        self.assertIn('1 resized', out)
+
+    def test_reprocess_covers_backfills_cover_metadata(self):
+        recipe = self.make_recipe()
+        self.make_cover(recipe, 'wide', 1200)
+
+        self.reprocess()
+        recipe.refresh_from_db()
+
+        self.assertEqual(recipe.cover_width, Recipe.COVER_WIDTH)
+        self.assertEqual(recipe.cover_height, 420)
+        self.assertTrue(recipe.cover_placeholder)
+
+    def test_reprocess_covers_skips_covers_already_at_target_spec(self):
+        recipe = self.make_recipe()
+        self.make_cover(recipe, 'small', 400)
+
+        out, _ = self.reprocess()
+        recipe.refresh_from_db()
+
+        # Stored as uploaded, encoded once with the spec
+        self.assertIn('1 resized', out)
+        self.assertEqual(recipe.cover_spec, Recipe.get_cover_spec())
+
+        out, _ = self.reprocess('--restart')
+
+        self.assertIn('0 resized, 1 skipped', out)
+
+    def test_reprocess_covers_keeps_covers_without_spec_at_target_width(self):
+        recipe = self.make_recipe()
+        # Encoded before cover_spec was recorded
+        full_path = self.make_cover(recipe, 'legacy', Recipe.COVER_WIDTH)
+        mtime = os.stat(full_path).st_mtime_ns
+
+        out, _ = self.reprocess()
+        recipe.refresh_from_db()
+
+        self.assertIn('0 resized, 1 skipped', out)
+        self.assertEqual(os.stat(full_path).st_mtime_ns, mtime)
+        self.assertEqual(recipe.cover_spec, Recipe.get_cover_spec())
+        self.assertEqual(recipe.cover_width, Recipe.COVER_WIDTH)
+        self.assertTrue(recipe.cover_placeholder)
+
+    def test_reprocess_covers_re_encodes_when_only_the_quality_changes(self):
+        recipe = self.make_recipe()
+        full_path = self.make_cover(recipe, 'wide', 1200)
+        self.reprocess()
+        mtime = os.stat(full_path).st_mtime_ns
+
+        out, _ = self.reprocess('--quality', '90')
+        recipe.refresh_from_db()
+
+        self.assertIn('1 resized', out)
+        self.assertNotEqual(os.stat(full_path).st_mtime_ns, mtime)
+        self.assertEqual(
+            recipe.cover_spec, Recipe.get_cover_spec(quality=90)
+        )
+
+    def test_reprocess_covers_reports_missing_files(self):
+        recipe = self.make_recipe()
+        Recipe.objects.filter(pk=recipe.pk).update(
+            cover='recipes/covers/nope.jpg'
+        )
+
+        out, err = self.reprocess()
+
+        self.assertIn('1 missing', out)
+        self.assertIn(f'Recipe {recipe.pk}: missing', err)
+
+    def test_reprocess_covers_resumes_after_last_processed_recipe(self):
+        recipes = self.make_recipe_in_batch(2)
+        first_path = self.make_cover(recipes[0], 'first', 1200)
+        self.make_cover(recipes[1], 'second', 1200)
+
+        with open(self.state_file, 'w') as file:
+            json.dump({
+                'spec': {
+                    'width': Recipe.COVER_WIDTH,
+                    'quality': Recipe.COVER_QUALITY,
+                    'force': False,
+                },
+                'last_pk': recipes[0].pk,
+            }, file)
+
+        out, _ = self.reprocess()
+
+        with Image.open(first_path) as image:
+            self.assertEqual(image.size[0], 1200)
+        self.assertIn('1 resized', out)
+
+    def test_reprocess_covers_restarts_when_target_spec_changes(self):
+        recipe = self.make_recipe()
+        full_path = self.make_cover(recipe, 'wide', 1200)
+        self.reprocess('--width', '1000')
+
+        self.reprocess('--width', '500')
+
+        with Image.open(full_path) as image:
+            self.assertEqual(image.size[0], 500)
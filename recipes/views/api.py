@@ -1,3 +1,4 @@
+from django.db.models import prefetch_related_objects
 from django.shortcuts import get_object_or_404
 from rest_framework import status
 from rest_framework.decorators import api_view
@@ -25,6 +26,8 @@ class RecipeApiV2ViewSet(ModelViewSet):
     permission_classes = [IsAuthenticatedOrReadOnly, ]
     renderer_classes = [JSONRenderer, ]
     http_method_names = ['get', 'post', 'patch', 'head', 'options', 'delete', ]
+    # GETs only, see utils.replicas
+    read_replica = True
 
     def get_queryset(self):
         qs = super().get_queryset()
@@ -39,6 +42,7 @@ class RecipeApiV2ViewSet(ModelViewSet):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         serializer.save(author=request.user)
+        self.refresh_tags(serializer.instance)
         headers = self.get_success_headers(serializer.data)
         return Response(
             serializer.data,
@@ -56,8 +60,17 @@ class RecipeApiV2ViewSet(ModelViewSet):
         serializer.is_valid(raise_exception=True)
         serializer.save()
 
+        if 'tags' in serializer.validated_data:
+            self.refresh_tags(recipe)
+
         return Response(serializer.data)
 
+    def refresh_tags(self, recipe):
+        # tags, tag_objects and tag_links all read recipe.tags, fetch them
+        # once instead of once per field
+        recipe._prefetched_objects_cache = {}
+        prefetch_related_objects([recipe], 'tags')
+
     def get_object(self):
         pk = self.kwargs.get('pk', None)
         obj = get_object_or_404(self.get_queryset(), pk=pk)
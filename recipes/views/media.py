@@ -0,0 +1,71 @@
+import os
+
+from django.conf import settings
+from django.http import Http404
+from django.utils._os import safe_join
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import require_safe
+from utils.media import accel_redirect_response, file_response
+
+from recipes.models import Recipe
+
+# Covers keep their name once uploaded, a new cover gets a new name
+MEDIA_MAX_AGE = 60 * 60 * 24
+
+
+def get_cover_visibility(user, name):
+    """'public', 'private' or None when ``user`` may not see the cover.
+
+    Covers of published recipes are public, those of drafts are private to
+    their author and the staff. Files no recipe points to (orphans, uploads
+    in progress) are never served.
+    """
+    recipe = Recipe.objects.filter(cover=name).values(
+        'is_published', 'author_id'
+    ).first()
+
+    if recipe is None:
+        return None
+
+    if recipe['is_published']:
+        return 'public'
+
+    if user.is_staff or (
+        user.is_authenticated and user.pk == recipe['author_id']
+    ):
+        return 'private'
+
+    return None
+
+
+@require_safe
+def serve_media(request, path):
+    """Serves MEDIA_ROOT files after checking they may be seen.
+
+    With MEDIA_ACCEL_REDIRECT set, nginx sends the file itself. Otherwise
+    the worker does, with Range and conditional GET support.
+    """
+    name = os.path.normpath(path).replace(os.sep, '/')
+
+    if name.startswith(('.', '/')) or '/.' in name:
+        raise Http404()
+
+    try:
+        full_path = safe_join(settings.MEDIA_ROOT, name)
+    except ValueError:
+        raise Http404()
+
+    visibility = get_cover_visibility(request.user, name)
+
+    if visibility is None or not os.path.isfile(full_path):
+        raise Http404()
+
+    if settings.MEDIA_ACCEL_REDIRECT:
+        response = accel_redirect_response(settings.MEDIA_ACCEL_REDIRECT, name)
+    else:
+        response = file_response(request, full_path)
+
+    patch_cache_control(
+        response, max_age=MEDIA_MAX_AGE, **{visibility: True}
+    )
+    return response
@@ -1,5 +1,6 @@
 import os
 
+from django.conf import settings
 from django.db.models import Q
 from django.db.models.aggregates import Count
 from django.forms.models import model_to_dict
@@ -9,6 +10,7 @@ from django.shortcuts import render
 from django.utils import translation
 from django.utils.translation import gettext as _
 from django.views.generic import DetailView, ListView
+from instrumentation.metrics import REGISTRY
 from tag.models import Tag
 from utils.pagination import make_pagination
 
@@ -16,6 +18,11 @@ from recipes.models import Recipe
 
 PER_PAGE = int(os.environ.get('PER_PAGE', 6))
 
+SEARCH_RESULTS = REGISTRY.histogram(
+    'recipe_search_results', 'Number of recipes found per search.', [],
+    buckets=(0, 1, 5, 10, 50, 100, 500, 1000, 5000),
+)
+
 
 def theory(request, *args, **kwargs):
     recipes = Recipe.objects.get_published()
@@ -33,11 +40,25 @@ def theory(request, *args, **kwargs):
     )
 
 
-class RecipeListViewBase(ListView):
+class PublicTemplateMixin:
+    """Renders with the engine set in PUBLIC_TEMPLATE_ENGINE.
+
+    A view can set ``template_engine`` itself to pin one of the engines.
+    """
+
+    def setup(self, request, *args, **kwargs):
+        super().setup(request, *args, **kwargs)
+
+        if self.template_engine is None:
+            self.template_engine = settings.PUBLIC_TEMPLATE_ENGINE
+
+
+class RecipeListViewBase(PublicTemplateMixin, ListView):
     model = Recipe
     context_object_name = 'recipes'
     ordering = ['-id']
     template_name = 'recipes/pages/home.html'
+    read_replica = True
 
     def get_queryset(self, *args, **kwargs):
         qs = super().get_queryset(*args, **kwargs)
@@ -76,7 +97,7 @@ class RecipeListViewHomeApi(RecipeListViewBase):
     template_name = 'recipes/pages/home.html'
 
     def render_to_response(self, context, **response_kwargs):
-        recipes = self.get_context_data()['recipes']
+        recipes = context['recipes']
         recipes_list = recipes.object_list.values()
 
         return JsonResponse(
@@ -158,6 +179,8 @@ class RecipeListViewSearch(RecipeListViewBase):
     def get_context_data(self, *args, **kwargs):
         ctx = super().get_context_data(*args, **kwargs)
         search_term = self.request.GET.get('q', '')
+        # The paginator already counted the results for the page links
+        SEARCH_RESULTS.observe(ctx['recipes'].paginator.count)
 
         ctx.update({
             'page_title': f'Search for "{search_term}" |',
@@ -168,14 +191,17 @@ class RecipeListViewSearch(RecipeListViewBase):
         return ctx
 
 
-class RecipeDetail(DetailView):
+class RecipeDetail(PublicTemplateMixin, DetailView):
     model = Recipe
     context_object_name = 'recipe'
     template_name = 'recipes/pages/recipe-view.html'
+    read_replica = True
 
     def get_queryset(self, *args, **kwargs):
         qs = super().get_queryset(*args, **kwargs)
         qs = qs.filter(is_published=True)
+        qs = qs.select_related('author', 'category', 'author__profile')
+        qs = qs.prefetch_related('tags')
         return qs
 
     def get_context_data(self, *args, **kwargs):
@@ -190,11 +216,15 @@ class RecipeDetail(DetailView):
 
 class RecipeDetailAPI(RecipeDetail):
     def render_to_response(self, context, **response_kwargs):
-        recipe = self.get_context_data()['recipe']
+        recipe = context['recipe']
         recipe_dict = model_to_dict(recipe)
 
         recipe_dict['created_at'] = str(recipe.created_at)
         recipe_dict['updated_at'] = str(recipe.updated_at)
+        recipe_dict['cover_width'] = recipe.cover_width
+        recipe_dict['cover_height'] = recipe.cover_height
+        recipe_dict['cover_placeholder'] = recipe.cover_placeholder
+        recipe_dict['tags'] = [tag.pk for tag in recipe_dict['tags']]
 
         if recipe_dict.get('cover'):
             recipe_dict['cover'] = self.request.build_absolute_uri() + \
@@ -1,24 +1,28 @@
-import string
-from random import SystemRandom
+from functools import partial
 
-from django.db import models
-from django.utils.text import slugify
+from django.db import models, router
+from utils.slugs import (SlugAllocatingManagerMixin, allocate_slugs,
+                         save_with_new_slugs)
+
+
+class TagManager(SlugAllocatingManagerMixin, models.Manager):
+    slug_source_field = 'name'
 
 
 class Tag(models.Model):
+    objects = TagManager()
     name = models.CharField(max_length=255)
     slug = models.SlugField(unique=True)
 
     def save(self, *args, **kwargs):
-        if not self.slug:
-            rand_letters = ''.join(
-                SystemRandom().choices(
-                    string.ascii_letters + string.digits,
-                    k=5,
-                )
-            )
-            self.slug = slugify(f'{self.name}-{rand_letters}')
-        return super().save(*args, **kwargs)
+        using = kwargs.get('using') or router.db_for_write(Tag, instance=self)
+        allocated = [] if self.slug else [self]
+        allocate_slugs(Tag, allocated, 'name', using=using)
+
+        return save_with_new_slugs(
+            Tag, [self], allocated, 'name',
+            partial(super().save, *args, **kwargs), using,
+        )
 
     def __str__(self):
         return self.name
@@ -0,0 +1,111 @@
+import json
+import os
+import time
+from pathlib import Path
+
+from django.db import connection
+from django.urls import URLResolver
+
+BASELINE_PATH = Path(__file__).parent / 'baseline.json'
+RENDER_BASELINE_PATH = Path(__file__).parent / 'render_baseline.json'
+# Set to 1 to rewrite the baseline files with the current measurements
+UPDATE_BASELINE = os.environ.get('UPDATE_PERF_BASELINE') == '1'
+
+# Query counts are deterministic and must never grow. Times are noisy, so
+# they only fail when far above the baseline.
+TIME_FACTOR = 3
+TIME_SLACK_MS = 50
+BYTES_TOLERANCE = 0.1
+
+
+class QueryRecorder:
+    def __init__(self):
+        self.count = 0
+        self.time = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.time += time.perf_counter() - start
+            self.count += 1
+
+
+def measure(client, method, url, **kwargs):
+    recorder = QueryRecorder()
+    start = time.perf_counter()
+
+    with connection.execute_wrapper(recorder):
+        response = getattr(client, method.lower())(url, **kwargs)
+
+    wall_time = time.perf_counter() - start
+    return response, {
+        'queries': recorder.count,
+        'sql_ms': round(recorder.time * 1000, 2),
+        'wall_ms': round(wall_time * 1000, 2),
+        'bytes': len(response.content),
+        'status': response.status_code,
+    }
+
+
+def iter_route_names(patterns, namespace):
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            yield from iter_route_names(pattern.url_patterns, namespace)
+        elif pattern.name:
+            yield f'{namespace}:{pattern.name}'
+
+
+def load_baseline(path=BASELINE_PATH):
+    try:
+        with open(path) as file:
+            return json.load(file)
+    except FileNotFoundError:
+        return {}
+
+
+def save_baseline(results, path=BASELINE_PATH):
+    with open(path, 'w') as file:
+        json.dump(results, file, indent=2, sort_keys=True)
+        file.write('\n')
+
+
+def compare_with_baseline(case_id, result, baseline):
+    """Returns a list of budget violations of ``result``."""
+    if baseline is None:
+        return [f'{case_id}: missing from baseline.json']
+
+    errors = []
+
+    # A route that starts failing or redirecting is not comparable
+    if result.get('status') != baseline.get('status'):
+        return [
+            f'{case_id}: status {result["status"]}, '
+            f'baseline is {baseline["status"]}'
+        ]
+
+    if result['queries'] > baseline['queries']:
+        errors.append(
+            f'{case_id}: {result["queries"]} queries, '
+            f'budget is {baseline["queries"]}'
+        )
+
+    for key in 'sql_ms', 'wall_ms':
+        budget = max(
+            baseline[key] * TIME_FACTOR, baseline[key] + TIME_SLACK_MS
+        )
+
+        if result[key] > budget:
+            errors.append(
+                f'{case_id}: {key} {result[key]:.1f}, '
+                f'budget is {budget:.1f}'
+            )
+
+    if result['bytes'] > baseline['bytes'] * (1 + BYTES_TOLERANCE):
+        errors.append(
+            f'{case_id}: {result["bytes"]} bytes, '
+            f'baseline is {baseline["bytes"]}'
+        )
+
+    return errors
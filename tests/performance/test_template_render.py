@@ -0,0 +1,104 @@
+import time
+from io import StringIO
+
+import pytest
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.management import call_command
+from django.db import connection
+from django.template.loader import render_to_string
+from django.test import RequestFactory, TestCase
+from recipes.models import Recipe
+
+from .base import (RENDER_BASELINE_PATH, UPDATE_BASELINE, QueryRecorder,
+                   compare_with_baseline, load_baseline, save_baseline)
+
+RECIPE_COUNTS = (6, 60, 600)
+RUNS = 5
+ENGINES = ('django', 'jinja2') if settings.JINJA2 else ('django',)
+
+
+@pytest.mark.slow
+class TemplateRenderTest(TestCase):
+    """Render cost of recipes/pages/home.html by number of recipes.
+
+    Measured with each template engine, Jinja2 only where it is installed.
+
+    The recipes are fetched before rendering, so the numbers are those of
+    the template alone. Any query counted here is a lazy load triggered by
+    the template. Budgets live in tests/performance/render_baseline.json.
+    """
+
+    template_name = 'recipes/pages/home.html'
+
+    @classmethod
+    def setUpTestData(cls):
+        call_command(
+            'generate_dataset', '--users', '20', '--categories', '4',
+            '--tags', '10', '--recipes', str(max(RECIPE_COUNTS)),
+            '--publish-ratio', '1', '--seed', '1', stdout=StringIO(),
+        )
+
+    def get_context(self, count):
+        recipes = list(
+            Recipe.objects.filter(is_published=True)
+            .select_related('author', 'category', 'author__profile')
+            .prefetch_related('tags')
+            .order_by('-id')[:count]
+        )
+        return {'recipes': recipes, 'html_language': 'pt-br'}
+
+    def measure_render(self, context, engine):
+        request = RequestFactory().get('/')
+        request.user = AnonymousUser()
+
+        # First render compiles the template, the best of the next ones
+        # counts
+        render_to_string(self.template_name, context, request, engine)
+        recorder = QueryRecorder()
+        wall_times = []
+
+        with connection.execute_wrapper(recorder):
+            for _ in range(RUNS):
+                start = time.perf_counter()
+                content = render_to_string(
+                    self.template_name, context, request, engine
+                )
+                wall_times.append(time.perf_counter() - start)
+
+        return {
+            'queries': recorder.count // RUNS,
+            'sql_ms': round(recorder.time / RUNS * 1000, 2),
+            'wall_ms': round(min(wall_times) * 1000, 2),
+            'bytes': len(content),
+        }
+
+    def test_home_template_stays_within_its_budgets(self):
+        baseline = load_baseline(RENDER_BASELINE_PATH)
+        results = {}
+        errors = []
+
+        for count in RECIPE_COUNTS:
+            context = self.get_context(count)
+            self.assertEqual(len(context['recipes']), count)
+
+            for engine in ENGINES:
+                # Keeps the ids of the Django engine cases
+                case_id = f'home_{count}' if engine == 'django' \
+                    else f'home_{engine}_{count}'
+                results[case_id] = self.measure_render(context, engine)
+
+        if UPDATE_BASELINE:
+            save_baseline(results, RENDER_BASELINE_PATH)
+            return
+
+        for case_id, result in results.items():
+            errors += compare_with_baseline(
+                case_id, result, baseline.get(case_id)
+            )
+
+        if errors:
+            self.fail(
+                'Render budgets exceeded (run with UPDATE_PERF_BASELINE=1 '
+                'if this is intended):\n' + '\n'.join(errors)
+            )
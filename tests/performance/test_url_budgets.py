@@ -0,0 +1,223 @@
+from io import StringIO
+from unittest.mock import patch
+
+import pytest
+from authors import urls as authors_urls
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from recipes import urls as recipes_urls
+from recipes.models import Category, Recipe, User
+from rest_framework.test import APIClient
+from tag.models import Tag
+
+from .base import (UPDATE_BASELINE, compare_with_baseline, iter_route_names,
+                   load_baseline, measure, save_baseline)
+
+PASSWORD = 'P4ssw0rd'
+# The baseline was recorded with the default page size, PER_PAGE from the
+# .env must not change the response sizes
+PER_PAGE = 6
+
+
+@pytest.mark.slow
+@patch('recipes.views.site.PER_PAGE', PER_PAGE)
+class URLBudgetsTest(TestCase):
+    """Query, SQL time, wall time and size budgets for every route.
+
+    Budgets live in tests/performance/baseline.json, run with
+    UPDATE_PERF_BASELINE=1 to record new ones after an intended change.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        call_command(
+            'generate_dataset', '--users', '10', '--categories', '4',
+            '--tags', '10', '--recipes', '120', '--seed', '1',
+            '--password', PASSWORD, stdout=StringIO(),
+        )
+        cls.user = User.objects.order_by('pk').first()
+        cls.tag = Tag.objects.order_by('pk').first()
+        cls.category = Category.objects.order_by('pk').first()
+        cls.recipe = Recipe.objects.filter(
+            is_published=True
+        ).order_by('pk').first()
+        recipe_data = {
+            'description': 'Benchmark description', 'preparation_time': 10,
+            'preparation_time_unit': 'Minutos', 'servings': 2,
+            'servings_unit': 'Porções', 'preparation_steps': 'Steps',
+            'author': cls.user,
+        }
+        cls.own_recipe = Recipe.objects.create(
+            title='Own recipe', is_published=True, **recipe_data
+        )
+        cls.draft = Recipe.objects.create(title='Draft recipe', **recipe_data)
+
+    def get_jwt(self):
+        response = APIClient().post(
+            reverse('recipes:token_obtain_pair'),
+            data={'username': self.user.username, 'password': PASSWORD},
+        )
+        return response.data
+
+    def get_cases(self):
+        """(case id, route name, method, url, auth, request kwargs)."""
+        recipe_data = {
+            'title': 'Benchmark recipe', 'description': 'Benchmark',
+            'preparation_time': 10, 'preparation_time_unit': 'Minutos',
+            'servings': 2, 'servings_unit': 'Porções',
+            'preparation_steps': 'Steps',
+        }
+        return [
+            ('home', 'recipes:home', 'GET', reverse('recipes:home'),
+             None, {}),
+            ('search', 'recipes:search', 'GET',
+             reverse('recipes:search') + '?q=a', None, {}),
+            ('tag', 'recipes:tag', 'GET',
+             reverse('recipes:tag', args=(self.tag.slug,)), None, {}),
+            ('category', 'recipes:category', 'GET',
+             reverse('recipes:category', args=(self.category.pk,)),
+             None, {}),
+            ('recipe', 'recipes:recipe', 'GET',
+             reverse('recipes:recipe', args=(self.recipe.pk,)), None, {}),
+            ('theory', 'recipes:theory', 'GET',
+             reverse('recipes:theory'), None, {}),
+            ('api_v1_list', 'recipes:recipes_api_v1', 'GET',
+             reverse('recipes:recipes_api_v1'), None, {}),
+            ('api_v1_detail', 'recipes:recipes_api_v1_detail', 'GET',
+             reverse('recipes:recipes_api_v1_detail', args=(self.recipe.pk,)),
+             None, {}),
+            ('api_v2_list', 'recipes:recipes-api-list', 'GET',
+             reverse('recipes:recipes-api-list'), None, {}),
+            ('api_v2_detail', 'recipes:recipes-api-detail', 'GET',
+             reverse('recipes:recipes-api-detail', args=(self.recipe.pk,)),
+             None, {}),
+            ('api_v2_tag', 'recipes:recipes_api_v2_tag', 'GET',
+             reverse('recipes:recipes_api_v2_tag', args=(self.tag.pk,)),
+             None, {}),
+            ('api_v2_create', 'recipes:recipes-api-list', 'POST',
+             reverse('recipes:recipes-api-list'), 'jwt',
+             {'data': recipe_data}),
+            ('api_v2_patch', 'recipes:recipes-api-detail', 'PATCH',
+             reverse('recipes:recipes-api-detail',
+                     args=(self.own_recipe.pk,)),
+             'jwt', {'data': {'title': 'Patched title'}}),
+            ('token_obtain', 'recipes:token_obtain_pair', 'POST',
+             reverse('recipes:token_obtain_pair'), None,
+             {'data': {'username': self.user.username,
+                       'password': PASSWORD}}),
+            ('token_refresh', 'recipes:token_refresh', 'POST',
+             reverse('recipes:token_refresh'), 'refresh', {}),
+            ('token_verify', 'recipes:token_verify', 'POST',
+             reverse('recipes:token_verify'), 'verify', {}),
+            ('register', 'authors:register', 'GET',
+             reverse('authors:register'), None, {}),
+            ('register_create', 'authors:register_create', 'POST',
+             reverse('authors:register_create'), None,
+             {'data': {'username': 'benchmark', 'first_name': 'Bench',
+                       'last_name': 'Mark', 'email': 'bench@mark.com',
+                       'password': 'Bench123Mark', 'password2':
+                       'Bench123Mark'}}),
+            ('login', 'authors:login', 'GET', reverse('authors:login'),
+             None, {}),
+            ('login_create', 'authors:login_create', 'POST',
+             reverse('authors:login_create'), None,
+             {'data': {'username': self.user.username,
+                       'password': PASSWORD}}),
+            ('dashboard', 'authors:dashboard', 'GET',
+             reverse('authors:dashboard'), 'session', {}),
+            ('dashboard_recipe_new', 'authors:dashboard_recipe_new', 'GET',
+             reverse('authors:dashboard_recipe_new'), 'session', {}),
+            ('dashboard_recipe_edit', 'authors:dashboard_recipe_edit', 'GET',
+             reverse('authors:dashboard_recipe_edit', args=(self.draft.pk,)),
+             'session', {}),
+            ('dashboard_recipe_save', 'authors:dashboard_recipe_edit',
+             'POST',
+             reverse('authors:dashboard_recipe_edit', args=(self.draft.pk,)),
+             'session', {'data': {**recipe_data, 'title': 'Saved title'}}),
+            ('profile', 'authors:profile', 'GET',
+             reverse('authors:profile', args=(self.user.profile.pk,)),
+             None, {}),
+            ('author_api_list', 'authors:author-api-list', 'GET',
+             reverse('authors:author-api-list'), 'jwt', {}),
+            ('author_api_detail', 'authors:author-api-detail', 'GET',
+             reverse('authors:author-api-detail', args=(self.user.pk,)),
+             'jwt', {}),
+            ('author_api_me', 'authors:author-api-me', 'GET',
+             reverse('authors:author-api-me'), 'jwt', {}),
+            # Destructive cases go last
+            ('dashboard_recipe_delete', 'authors:dashboard_recipe_delete',
+             'POST', reverse('authors:dashboard_recipe_delete'), 'session',
+             {'data': {'id': self.draft.pk}}),
+            ('logout', 'authors:logout', 'POST', reverse('authors:logout'),
+             'session', {'data': {'username': self.user.username}}),
+        ]
+
+    def make_client(self, auth, kwargs):
+        client = APIClient()
+
+        if auth == 'session':
+            client.force_login(self.user)
+        elif auth == 'jwt':
+            client.credentials(
+                HTTP_AUTHORIZATION=f'Bearer {self.get_jwt()["access"]}'
+            )
+        elif auth == 'refresh':
+            kwargs = {**kwargs, 'data': {'refresh': self.get_jwt()['refresh']}}
+        elif auth == 'verify':
+            kwargs = {**kwargs, 'data': {'token': self.get_jwt()['access']}}
+
+        return client, kwargs
+
+    def run_case(self, method, url, auth, kwargs):
+        client, kwargs = self.make_client(auth, kwargs)
+
+        # Safe requests are warmed up and timed a few times, the best run
+        # counts. Writes can only run once.
+        runs = 3 if method == 'GET' else 1
+
+        if method == 'GET':
+            measure(client, method, url, **kwargs)
+
+        results = []
+
+        for _ in range(runs):
+            _, result = measure(client, method, url, **kwargs)
+            results.append(result)
+
+        return {
+            **results[-1],
+            'sql_ms': min(result['sql_ms'] for result in results),
+            'wall_ms': min(result['wall_ms'] for result in results),
+        }
+
+    def test_every_route_has_a_benchmark_case(self):
+        routes = set(iter_route_names(recipes_urls.urlpatterns, 'recipes'))
+        routes |= set(iter_route_names(authors_urls.urlpatterns, 'authors'))
+        covered = {route for _, route, *_ in self.get_cases()}
+
+        self.assertEqual(routes - covered, set())
+
+    def test_routes_stay_within_their_budgets(self):
+        baseline = load_baseline()
+        results = {}
+        errors = []
+
+        for case_id, _, method, url, auth, kwargs in self.get_cases():
+            results[case_id] = self.run_case(method, url, auth, kwargs)
+
+        if UPDATE_BASELINE:
+            save_baseline(results)
+            return
+
+        for case_id, result in results.items():
+            errors += compare_with_baseline(
+                case_id, result, baseline.get(case_id)
+            )
+
+        if errors:
+            self.fail(
+                'Performance budgets exceeded (run with '
+                'UPDATE_PERF_BASELINE=1 if this is intended):\n'
+                + '\n'.join(errors)
+            )
@@ -0,0 +1,28 @@
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from django.db import transaction
+
+# One worker keeps tasks in submission order and the I/O off the request.
+_executor = ThreadPoolExecutor(
+    max_workers=1, thread_name_prefix='background-task',
+)
+
+
+def run_in_background(func, *args, **kwargs):
+    return _executor.submit(func, *args, **kwargs)
+
+
+def run_in_background_on_commit(func, *args, using=None, **kwargs):
+    """Runs ``func`` in the background once the current transaction commits.
+
+    Nothing runs if the transaction is rolled back.
+    """
+    transaction.on_commit(
+        partial(run_in_background, func, *args, **kwargs), using=using,
+    )
+
+
+def wait_for_background_tasks(timeout=None):
+    """Blocks until every task submitted so far has finished."""
+    run_in_background(lambda: None).result(timeout=timeout)
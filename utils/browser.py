@@ -2,15 +2,16 @@ import os
 from pathlib import Path
 from time import sleep
 
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-
 ROOT_PATH = Path(__file__).parent.parent
 CHROMEDRIVER_NAME = 'chromedriver'
 CHROMEDRIVER_PATH = ROOT_PATH / 'bin' / CHROMEDRIVER_NAME
 
 
 def make_chrome_browser(*options):
+    # Selenium is only installed where the functional tests run
+    from selenium import webdriver
+    from selenium.webdriver.chrome.service import Service
+
     chrome_options = webdriver.ChromeOptions()
 
     if options is not None:
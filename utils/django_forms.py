@@ -1,6 +1,8 @@
 import re
 
+from django import forms
 from django.core.exceptions import ValidationError
+from utils.uploads import validate_cover_upload
 
 
 def add_attr(field, attr_name, attr_new_val):
@@ -23,3 +25,11 @@ def strong_password(password):
         ),
             code='invalid'
         )
+
+
+class CoverImageField(forms.ImageField):
+    def to_python(self, data):
+        # Size and dimension limits are checked before Pillow verifies the
+        # whole file.
+        validate_cover_upload(data)
+        return super().to_python(data)
@@ -0,0 +1,104 @@
+from base64 import b64encode
+from io import BytesIO
+
+# Pillow is imported inside the functions, it is only needed when covers
+# are processed and importing it slows down every worker and command start.
+
+PLACEHOLDER_SIZE = 16
+
+
+def resize_image(image_full_path, new_width=800, quality=50, force=False):
+    """Resizes the image in place to ``new_width`` keeping the aspect ratio.
+
+    Images already at (or below) the target width are left untouched unless
+    ``force`` is True, in which case they are re-encoded with ``quality``.
+    Returns True when the file on disk was rewritten.
+    """
+    from PIL import Image
+
+    image_pillow = Image.open(image_full_path)
+    original_width, original_height = image_pillow.size
+
+    if original_width <= new_width:
+        if not force:
+            image_pillow.close()
+            return False
+        new_image = image_pillow
+    else:
+        new_height = round((new_width * original_height) / original_width)
+        # JPEGs are decoded straight at the closest scale above the target
+        image_pillow.draft(image_pillow.mode, (new_width, new_height))
+        new_image = image_pillow.resize(
+            (new_width, new_height), Image.LANCZOS
+        )
+
+    new_image.save(
+        image_full_path,
+        optimize=True,
+        quality=quality,
+    )
+    image_pillow.close()
+    return True
+
+
+def make_placeholder(image_pillow, size=PLACEHOLDER_SIZE):
+    """Returns a tiny blurred JPEG of the image as a base64 data URI."""
+    from PIL import ImageFilter
+
+    # Lets JPEG decode at a reduced scale, the full image is never needed
+    image_pillow.draft('RGB', (size, size))
+    placeholder = image_pillow.convert('RGB')
+    placeholder.thumbnail((size, size))
+    placeholder = placeholder.filter(ImageFilter.GaussianBlur(1))
+
+    buffer = BytesIO()
+    placeholder.save(buffer, 'JPEG', quality=40)
+    encoded = b64encode(buffer.getvalue()).decode('ascii')
+    return f'data:image/jpeg;base64,{encoded}'
+
+
+def get_image_metadata(image_full_path):
+    """Returns the width, height and placeholder of the image on disk."""
+    from PIL import Image
+
+    with Image.open(image_full_path) as image_pillow:
+        width, height = image_pillow.size
+        placeholder = make_placeholder(image_pillow)
+
+    return {
+        'width': width,
+        'height': height,
+        'placeholder': placeholder,
+    }
+
+
+def reprocess_image(
+    image_full_path, new_width=800, quality=50, force=False,
+    with_metadata=False, keep_target_width=False,
+):
+    """Process pool friendly wrapper around `resize_image`.
+
+    Never raises, returns a ``(status, error, metadata)`` tuple where status
+    is one of ``resized``, ``skipped``, ``missing`` or ``failed``. Metadata
+    is computed whenever the file was rewritten or ``with_metadata`` is set.
+    With ``keep_target_width`` images exactly ``new_width`` wide are not
+    re-encoded even when ``force`` is set.
+    """
+    from PIL import Image
+
+    try:
+        if force and keep_target_width:
+            # Only reads the header
+            with Image.open(image_full_path) as image:
+                force = image.size[0] != new_width
+
+        resized = resize_image(image_full_path, new_width, quality, force)
+        metadata = None
+
+        if resized or with_metadata:
+            metadata = get_image_metadata(image_full_path)
+    except FileNotFoundError:
+        return 'missing', '', None
+    except Exception as error:
+        return 'failed', f'{type(error).__name__}: {error}', None
+    return ('resized' if resized else 'skipped'), '', metadata
@@ -0,0 +1,48 @@
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.template import defaultfilters
+from django.urls import reverse
+from django.utils import translation
+from django.utils.timezone import template_localtime
+
+# Jinja2 is an optional dependency, it is imported inside environment() so
+# this module can be imported (and collected by pytest) without it.
+
+
+def url(viewname, *args, **kwargs):
+    """The {% url %} tag: url('recipes:recipe', recipe.id)."""
+    return reverse(viewname, args=args or None, kwargs=kwargs or None)
+
+
+def static(path):
+    """The {% static %} tag: static('global/css/styles.css')."""
+    return staticfiles_storage.url(path)
+
+
+def date(value, arg=None):
+    """Django's date filter, in the current time zone like the tag does."""
+    return defaultfilters.date(template_localtime(value), arg)
+
+
+def environment(**options):
+    """Jinja2 environment of the templates under the jinja2 directories.
+
+    Helpers and filters mirror the Django tags the templates used, so the
+    HTML stays the same whichever engine renders a page.
+    """
+    import jinja2
+
+    # Missing variables and attributes render empty, like in the Django
+    # templates, also with DEBUG on (the backend would use DebugUndefined)
+    options['undefined'] = jinja2.ChainableUndefined
+    options.setdefault('extensions', []).append('jinja2.ext.i18n')
+
+    env = jinja2.Environment(**options)
+    env.install_gettext_callables(
+        translation.gettext, translation.ngettext, newstyle=True
+    )
+    env.globals.update({'url': url, 'static': static})
+    env.filters.update({
+        'date': date,
+        'linebreaksbr': defaultfilters.linebreaksbr,
+    })
+    return env
@@ -0,0 +1,63 @@
+import json
+
+CHUNK_SIZE = 64 * 1024
+SEPARATORS = ' \t\r\n,'
+
+
+def iter_json_objects(file, chunk_size=CHUNK_SIZE):
+    """Yields the objects of a JSON array or of a JSONL file one by one.
+
+    Only the object being decoded and the current chunk are kept in memory,
+    so dumps of any size can be read.
+
+    >>> from io import StringIO
+    >>> list(iter_json_objects(StringIO('[{"a": 1}, {"b": 2}]')))
+    [{'a': 1}, {'b': 2}]
+    >>> list(iter_json_objects(StringIO('{"a": 1}\\n{"b": 2}\\n')))
+    [{'a': 1}, {'b': 2}]
+    """
+    decoder = json.JSONDecoder()
+    buffer = ''
+    position = 0
+    eof = False
+    started = False
+
+    while True:
+        while position < len(buffer) and buffer[position] in SEPARATORS:
+            position += 1
+
+        if not started and position < len(buffer):
+            started = True
+
+            if buffer[position] == '[':
+                position += 1
+                continue
+
+        if position < len(buffer) and buffer[position] == ']':
+            return
+
+        try:
+            obj, end = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError:
+            if eof:
+                if buffer[position:].strip():
+                    raise
+                return
+
+            chunk = file.read(chunk_size)
+            eof = not chunk
+            buffer = buffer[position:] + chunk
+            position = 0
+            continue
+
+        # An object that ends exactly at the buffer end may be a truncated
+        # number or literal, read more before trusting it.
+        if end == len(buffer) and not eof and not isinstance(obj, dict):
+            chunk = file.read(chunk_size)
+            eof = not chunk
+            buffer = buffer[position:] + chunk
+            position = 0
+            continue
+
+        yield obj
+        position = end
@@ -0,0 +1,149 @@
+import mimetypes
+import os
+import re
+from urllib.parse import quote
+
+from django.http import FileResponse, HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe
+
+RANGE_RE = re.compile(r'^bytes=(?P<start>\d*)-(?P<end>\d*)$')
+
+
+def parse_range(header, size):
+    """(start, end) of a single byte range, end included.
+
+    None when there is no usable range (the whole file is sent) and
+    (size, size) when the range starts past the end of the file.
+
+    >>> parse_range('bytes=0-99', 1000)
+    (0, 99)
+    >>> parse_range('bytes=900-', 1000)
+    (900, 999)
+    >>> parse_range('bytes=-100', 1000)
+    (900, 999)
+    >>> parse_range('bytes=500-5000', 1000)
+    (500, 999)
+    >>> parse_range('bytes=1000-', 1000)
+    (1000, 1000)
+    >>> parse_range('bytes=0-9,20-29', 1000) is None
+    True
+    """
+    match = RANGE_RE.match(header.strip())
+
+    if not match or match['start'] == match['end'] == '':
+        return None
+
+    if match['start'] == '':
+        # Suffix range, the last N bytes
+        return max(size - int(match['end']), 0), size - 1
+
+    start = int(match['start'])
+    end = min(int(match['end']), size - 1) if match['end'] else size - 1
+
+    if start >= size:
+        return size, size
+
+    if end < start:
+        return None
+
+    return start, end
+
+
+class RangeFile:
+    """Reads at most ``length`` bytes of an already positioned file.
+
+    It has no fileno(), so servers stream it with read() instead of
+    sending the whole file with sendfile().
+    """
+
+    def __init__(self, file, length):
+        self.file = file
+        self.remaining = length
+
+    def read(self, size=-1):
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def close(self):
+        self.file.close()
+
+
+def get_content_type(path):
+    content_type, encoding = mimetypes.guess_type(path)
+
+    # A .gz file must not be decompressed by the browser
+    if encoding:
+        return 'application/octet-stream'
+
+    return content_type or 'application/octet-stream'
+
+
+def if_range_matches(request, etag, last_modified):
+    """A Range is only honoured while the file is the one If-Range names."""
+    if_range = request.headers.get('If-Range')
+
+    if not if_range:
+        return True
+
+    if if_range.startswith(('"', 'W/')):
+        return if_range == etag
+
+    return parse_http_date_safe(if_range) == last_modified
+
+
+def file_response(request, path):
+    """Sends a file with conditional GET and single byte Range support."""
+    stat = os.stat(path)
+    etag = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+    last_modified = int(stat.st_mtime)
+    response = get_conditional_response(
+        request, etag=etag, last_modified=last_modified
+    )
+
+    if response is not None:
+        return response
+
+    content_type = get_content_type(path)
+    byte_range = None
+    range_header = request.headers.get('Range')
+
+    if range_header and if_range_matches(request, etag, last_modified):
+        byte_range = parse_range(range_header, stat.st_size)
+
+    if byte_range is None:
+        response = FileResponse(open(path, 'rb'), content_type=content_type)
+    elif byte_range[0] >= stat.st_size:
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{stat.st_size}'
+    else:
+        start, end = byte_range
+        file = open(path, 'rb')
+        file.seek(start)
+        response = FileResponse(
+            RangeFile(file, end - start + 1), status=206,
+            content_type=content_type,
+        )
+        response['Content-Length'] = end - start + 1
+        response['Content-Range'] = f'bytes {start}-{end}/{stat.st_size}'
+
+    response['Accept-Ranges'] = 'bytes'
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+    return response
+
+
+def accel_redirect_response(prefix, name):
+    """Hands the transfer of MEDIA_ROOT/name to nginx.
+
+    nginx serves it from the internal location at ``prefix``, Range and
+    conditional requests included, and keeps the Content-Type and
+    Cache-Control set here.
+    """
+    response = HttpResponse(content_type=get_content_type(name))
+    response['X-Accel-Redirect'] = prefix.rstrip('/') + '/' + quote(name)
+    return response
@@ -0,0 +1,116 @@
+"""Routes the reads of read-only views to the replicas in DATABASE_REPLICAS.
+
+Views opt in with ``read_replica = True`` (or the read_replica decorator
+for functions), and only their GET, HEAD and OPTIONS requests use a
+replica. Everything else, including the requests of a client for
+DATABASE_REPLICA_LAG seconds after it wrote something, uses the primary so
+nobody misses their own changes.
+"""
+import random
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+PRIMARY_COOKIE = 'use_primary'
+READ_ONLY_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+_current_routing = ContextVar('database_routing', default=None)
+
+
+class RequestRouting:
+    def __init__(self, pinned=False):
+        # The client wrote recently, its replicas may not have the change
+        self.pinned = pinned
+        self.replica = None
+        self.wrote = False
+
+    def get_read_alias(self):
+        if self.replica is None or self.pinned or self.wrote:
+            return DEFAULT_DB_ALIAS
+        return self.replica
+
+
+def read_replica(view_func):
+    """Marks a function view as safe to serve from a replica."""
+    view_func.read_replica = True
+    return view_func
+
+
+def uses_read_replica(view_func):
+    # Class based views, Django's view_class and DRF's cls
+    view_class = getattr(view_func, 'view_class', None) \
+        or getattr(view_func, 'cls', None)
+    return getattr(view_class or view_func, 'read_replica', False)
+
+
+class ReplicaRouter:
+    """Reads of opted-in requests go to a replica, writes to the primary.
+
+    Outside a request (management commands, shell) everything uses the
+    primary.
+    """
+
+    def db_for_read(self, model, **hints):
+        routing = _current_routing.get()
+
+        if routing is None:
+            return DEFAULT_DB_ALIAS
+        return routing.get_read_alias()
+
+    def db_for_write(self, model, **hints):
+        routing = _current_routing.get()
+
+        if routing is not None:
+            routing.wrote = True
+
+        # Explicit, otherwise Django would save an object read from a
+        # replica back to that replica
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas get the schema from the primary through replication
+        return db == DEFAULT_DB_ALIAS
+
+
+class ReplicaRoutingMiddleware:
+    """Picks the database of each request and keeps writers on the primary.
+
+    After a write the response sets a cookie that pins the client to the
+    primary for DATABASE_REPLICA_LAG seconds, the longest the replicas are
+    expected to lag behind. It must come before SessionMiddleware, so the
+    session saved at login also counts as a write.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        routing = RequestRouting(pinned=PRIMARY_COOKIE in request.COOKIES)
+        token = _current_routing.set(routing)
+
+        try:
+            response = self.get_response(request)
+        finally:
+            _current_routing.reset(token)
+
+        if routing.wrote:
+            response.set_cookie(
+                PRIMARY_COOKIE, '1', max_age=settings.DATABASE_REPLICA_LAG,
+                httponly=True, samesite='Lax',
+            )
+
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        routing = _current_routing.get()
+
+        if routing is not None and settings.DATABASE_REPLICAS \
+                and request.method in READ_ONLY_METHODS \
+                and uses_read_replica(view_func):
+            # One replica per request, its reads see a single snapshot
+            routing.replica = random.choice(settings.DATABASE_REPLICAS)
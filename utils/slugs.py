@@ -0,0 +1,131 @@
+import string
+from functools import partial
+from random import SystemRandom
+
+from django.db import IntegrityError, router, transaction
+from django.utils.text import slugify
+
+SUFFIX_LENGTH = 5
+# Keeps each existence query well under SQLite's bound parameter limit
+QUERY_BATCH_SIZE = 900
+# Saves retried when another process took one of the new slugs first
+SAVE_ATTEMPTS = 3
+
+
+def make_slug(text, max_length=50):
+    rand_letters = ''.join(
+        SystemRandom().choices(
+            string.ascii_letters + string.digits,
+            k=SUFFIX_LENGTH,
+        )
+    )
+    base = slugify(text)[:max_length - SUFFIX_LENGTH - 1].strip('-')
+    return slugify(f'{base}-{rand_letters}')
+
+
+def get_existing_slugs(queryset, slugs, slug_field='slug'):
+    slugs = list(slugs)
+    existing = set()
+
+    for start in range(0, len(slugs), QUERY_BATCH_SIZE):
+        existing.update(
+            queryset.filter(**{
+                f'{slug_field}__in': slugs[start:start + QUERY_BATCH_SIZE]
+            }).values_list(slug_field, flat=True)
+        )
+
+    return existing
+
+
+def allocate_slugs(model, instances, source_field, slug_field='slug',
+                   using=None):
+    """Gives every instance without a slug one that is not taken yet.
+
+    Candidates for the whole batch are checked with a single query (per
+    QUERY_BATCH_SIZE instances), the few that collide with the database or
+    with each other are drawn again. The slugs are only reserved once the
+    rows are saved, see save_with_new_slugs() for concurrent saves.
+    """
+    queryset = model._default_manager.db_manager(using).all()
+    max_length = model._meta.get_field(slug_field).max_length
+    pending = [
+        instance for instance in instances
+        if not getattr(instance, slug_field)
+    ]
+    taken = {
+        getattr(instance, slug_field) for instance in instances
+        if getattr(instance, slug_field)
+    }
+
+    while pending:
+        candidates = {}
+
+        for instance in pending:
+            slug = make_slug(getattr(instance, source_field), max_length)
+
+            while slug in taken or slug in candidates:
+                slug = make_slug(getattr(instance, source_field), max_length)
+
+            candidates[slug] = instance
+
+        existing = get_existing_slugs(queryset, candidates, slug_field)
+        pending = []
+
+        for slug, instance in candidates.items():
+            if slug in existing:
+                pending.append(instance)
+                continue
+
+            setattr(instance, slug_field, slug)
+            taken.add(slug)
+
+
+def save_with_new_slugs(model, instances, allocated, source_field, save,
+                        using, slug_field='slug'):
+    """Calls save() and draws again the slugs another process took first.
+
+    ``allocated`` are the instances whose slug allocate_slugs() just drew.
+    Another process can save one of those slugs between the check and the
+    INSERT, save() then runs in a savepoint and, if one of them is taken
+    now, the rolled back instances get a new one and save() runs again, up
+    to SAVE_ATTEMPTS times.
+    """
+    if not allocated:
+        return save()
+
+    for attempt in range(1, SAVE_ATTEMPTS + 1):
+        try:
+            with transaction.atomic(using=using):
+                return save()
+        except IntegrityError:
+            taken = get_existing_slugs(
+                model._default_manager.db_manager(using).all(),
+                (getattr(instance, slug_field) for instance in allocated),
+                slug_field,
+            )
+
+            # Not a slug collision (or one in a slug given by the caller)
+            if not taken or attempt == SAVE_ATTEMPTS:
+                raise
+
+            for instance in allocated:
+                if getattr(instance, slug_field) in taken:
+                    setattr(instance, slug_field, '')
+
+            allocate_slugs(model, instances, source_field, slug_field, using)
+
+
+class SlugAllocatingManagerMixin:
+    """Allocates slugs for bulk_create, which skips Model.save()."""
+    slug_source_field = None
+
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = list(objs)
+        using = self._db or router.db_for_write(self.model)
+        allocated = [obj for obj in objs if not obj.slug]
+        allocate_slugs(self.model, objs, self.slug_source_field, using=using)
+
+        return save_with_new_slugs(
+            self.model, objs, allocated, self.slug_source_field,
+            partial(super().bulk_create, objs, *args, **kwargs), using,
+        )
@@ -0,0 +1,21 @@
+from whitenoise.storage import CompressedManifestStaticFilesStorage
+
+
+class ManifestStaticFilesStorage(CompressedManifestStaticFilesStorage):
+    """Fingerprinted, gzip and brotli precompressed static files.
+
+    collectstatic writes style.<hash>.css next to style.<hash>.css.gz and
+    .br, WhiteNoise serves those names with immutable cache headers.
+
+    Files missing from the manifest (collectstatic not run yet, as in the
+    tests, or a file added after it) are linked by their plain name instead
+    of failing the whole page.
+    """
+
+    manifest_strict = False
+
+    def stored_name(self, name):
+        try:
+            return super().stored_name(name)
+        except ValueError:
+            return name
@@ -0,0 +1,15 @@
+import math
+
+
+def percentile(sorted_values, percent):
+    """Nearest-rank percentile of an already sorted list.
+
+    >>> percentile([1, 2, 3, 4, 5, 6, 7, 8, 9, 10], 95)
+    10
+    >>> percentile([1, 2, 3, 4], 50)
+    2
+    """
+    if not sorted_values:
+        return 0
+    rank = math.ceil(percent / 100 * len(sorted_values))
+    return sorted_values[max(rank, 1) - 1]
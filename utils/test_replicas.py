@@ -0,0 +1,177 @@
+import os
+import tempfile
+from unittest import skipUnless
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import DEFAULT_DB_ALIAS, connection, connections
+from django.http import HttpResponse
+from django.test import (RequestFactory, SimpleTestCase, TestCase,
+                         override_settings)
+from django.urls import resolve, reverse
+from recipes.models import Recipe
+from recipes.tests.test_recipe_base import RecipeMixin
+
+from utils.replicas import (PRIMARY_COOKIE, ReplicaRouter,
+                            ReplicaRoutingMiddleware, read_replica,
+                            uses_read_replica)
+
+router = ReplicaRouter()
+
+
+@read_replica
+def public_view(request):
+    return HttpResponse(router.db_for_read(Recipe))
+
+
+def private_view(request):
+    return HttpResponse(router.db_for_read(Recipe))
+
+
+@read_replica
+def writing_view(request):
+    router.db_for_write(Recipe)
+    return HttpResponse(router.db_for_read(Recipe))
+
+
+@override_settings(DATABASE_REPLICAS=['replica1'], DATABASE_REPLICA_LAG=5)
+class ReplicaRoutingTest(SimpleTestCase):
+    def get_response(self, view_func, method='get', cookies=None):
+        request = getattr(RequestFactory(), method)('/')
+        request.COOKIES.update(cookies or {})
+
+        def get_response(request):
+            middleware.process_view(request, view_func, (), {})
+            return view_func(request)
+
+        middleware = ReplicaRoutingMiddleware(get_response)
+        return middleware(request)
+
+    def test_read_only_views_read_from_a_replica(self):
+        response = self.get_response(public_view)
+
+        self.assertEqual(response.content, b'replica1')
+        self.assertNotIn(PRIMARY_COOKIE, response.cookies)
+
+    def test_other_views_and_methods_use_the_primary(self):
+        self.assertEqual(self.get_response(private_view).content, b'default')
+        self.assertEqual(
+            self.get_response(public_view, 'post').content, b'default'
+        )
+
+    def test_writes_go_to_the_primary_and_pin_the_client(self):
+        response = self.get_response(writing_view)
+
+        self.assertEqual(response.content, b'default')
+        self.assertEqual(response.cookies[PRIMARY_COOKIE]['max-age'], 5)
+
+    def test_pinned_client_reads_from_the_primary(self):
+        response = self.get_response(
+            public_view, cookies={PRIMARY_COOKIE: '1'}
+        )
+
+        self.assertEqual(response.content, b'default')
+
+    def test_requests_without_replicas_use_the_primary(self):
+        with self.settings(DATABASE_REPLICAS=[]):
+            self.assertEqual(self.get_response(public_view).content,
+                             b'default')
+
+    def test_outside_a_request_everything_uses_the_primary(self):
+        self.assertEqual(router.db_for_read(Recipe), 'default')
+        self.assertEqual(router.db_for_write(Recipe), 'default')
+        self.assertFalse(router.allow_migrate('replica1', 'recipes'))
+
+    def test_public_recipe_views_are_marked_read_replica(self):
+        for url in (
+            reverse('recipes:home'), reverse('recipes:search'),
+            reverse('recipes:recipe', kwargs={'pk': 1}),
+            reverse('recipes:recipes-api-list'),
+        ):
+            with self.subTest(url=url):
+                self.assertTrue(uses_read_replica(resolve(url).func))
+
+        self.assertFalse(uses_read_replica(
+            resolve(reverse('authors:dashboard')).func
+        ))
+
+
+def with_replica_middleware(middleware):
+    # Where project/settings/databases.py puts it when replicas are set
+    middleware = list(middleware)
+    middleware.insert(
+        middleware.index('django.middleware.security.SecurityMiddleware') + 1,
+        'utils.replicas.ReplicaRoutingMiddleware',
+    )
+    return middleware
+
+
+@skipUnless(connection.vendor == 'sqlite', 'Uses a second SQLite database')
+@override_settings(
+    DATABASE_REPLICAS=['replica1'], DATABASE_REPLICA_LAG=5,
+    DATABASE_ROUTERS=['utils.replicas.ReplicaRouter'],
+    MIDDLEWARE=with_replica_middleware(settings.MIDDLEWARE),
+)
+class SQLiteReplicaTest(TestCase, RecipeMixin):
+    """Primary and replica as two separate SQLite files, as when trying
+    DATABASE_REPLICAS locally. Nothing copies the rows between them, so
+    each one tells where a request read from."""
+    databases = {DEFAULT_DB_ALIAS, 'replica1'}
+
+    @classmethod
+    def setUpClass(cls):
+        cls.replica_dir = tempfile.TemporaryDirectory()
+        name = os.path.join(cls.replica_dir.name, 'replica.sqlite3')
+        connections.settings['replica1'] = {
+            **connections.settings[DEFAULT_DB_ALIAS],
+            'NAME': name, 'TEST': {'NAME': name},
+        }
+        # Before the router is installed, it keeps migrations off replicas
+        call_command('migrate', database='replica1', verbosity=0)
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        connections['replica1'].close()
+        del connections['replica1']
+        del connections.settings['replica1']
+        cls.replica_dir.cleanup()
+
+    def setUp(self):
+        self.make_recipe(title='Primary recipe', slug='primary')
+        Recipe.objects.using('replica1').create(
+            title='Replica recipe', slug='replica', description='-',
+            preparation_time=1, preparation_time_unit='Minutos',
+            servings=1, servings_unit='Porções', preparation_steps='-',
+            is_published=True,
+        )
+        return super().setUp()
+
+    def register(self):
+        return self.client.post(reverse('authors:register_create'), data={
+            'username': 'reader', 'first_name': 'Re', 'last_name': 'Ader',
+            'email': 'reader@email.com', 'password': 'Reader123',
+            'password2': 'Reader123',
+        })
+
+    def test_public_pages_read_from_the_replica(self):
+        response = self.client.get(reverse('recipes:home'))
+
+        self.assertContains(response, 'Replica recipe')
+        self.assertNotContains(response, 'Primary recipe')
+
+    def test_writes_go_to_the_primary_and_pin_the_client(self):
+        response = self.register()
+
+        self.assertTrue(User.objects.filter(username='reader').exists())
+        self.assertFalse(
+            User.objects.using('replica1').filter(username='reader').exists()
+        )
+        self.assertEqual(response.cookies[PRIMARY_COOKIE]['max-age'], 5)
+
+        response = self.client.get(reverse('recipes:home'))
+
+        self.assertContains(response, 'Primary recipe')
+        self.assertNotContains(response, 'Replica recipe')
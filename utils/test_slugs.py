@@ -0,0 +1,127 @@
+from contextlib import contextmanager
+from unittest.mock import patch
+
+from django.db import IntegrityError, connection, transaction
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from recipes.models import Recipe
+from tag.models import Tag
+
+from utils import slugs
+from utils.slugs import allocate_slugs, make_slug
+
+
+class ReadFromReplicaRouter:
+    def db_for_read(self, model, **hints):
+        return 'replica'
+
+
+class SlugsTest(TestCase):
+    @contextmanager
+    def slug_taken_after_the_check(self):
+        """Draws tag-aaaaa, which another process saves right after the
+        check, and then tag-bbbbb."""
+        get_existing_slugs = slugs.get_existing_slugs
+
+        def insert_after_the_check(*args):
+            existing = get_existing_slugs(*args)
+            if not Tag.objects.filter(slug='tag-aaaaa').exists():
+                Tag.objects.create(name='Other', slug='tag-aaaaa')
+            return existing
+
+        with patch(
+            'utils.slugs.get_existing_slugs',
+            side_effect=insert_after_the_check,
+        ), patch(
+            'utils.slugs.SystemRandom.choices',
+            side_effect=[list('aaaaa'), list('bbbbb')],
+        ):
+            yield
+
+    def test_make_slug_fits_the_slug_field_max_length(self):
+        slug = make_slug('A very long recipe title ' * 5, max_length=50)
+        self.assertLessEqual(len(slug), 50)
+        self.assertTrue(slug.startswith('a-very-long-recipe-title'))
+
+    def test_allocate_slugs_uses_one_query_for_the_whole_batch(self):
+        tags = [Tag(name=f'Tag {i}') for i in range(50)]
+
+        with CaptureQueriesContext(connection) as ctx:
+            allocate_slugs(Tag, tags, 'name')
+
+        self.assertEqual(len(ctx.captured_queries), 1)
+        self.assertEqual(len({tag.slug for tag in tags}), 50)
+
+    def test_allocate_slugs_draws_again_when_slug_is_taken(self):
+        Tag.objects.create(name='Tag', slug='tag-aaaaa')
+        tag = Tag(name='Tag')
+
+        with patch(
+            'utils.slugs.SystemRandom.choices',
+            side_effect=[list('aaaaa'), list('aaaaa'), list('bbbbb')],
+        ):
+            allocate_slugs(Tag, [tag], 'name')
+
+        self.assertEqual(tag.slug, 'tag-bbbbb')
+
+    def test_allocate_slugs_keeps_existing_slugs(self):
+        tag = Tag(name='Tag', slug='my-slug')
+        allocate_slugs(Tag, [tag], 'name')
+        self.assertEqual(tag.slug, 'my-slug')
+
+    def test_bulk_create_allocates_slugs(self):
+        Tag.objects.bulk_create(Tag(name='Same name') for _ in range(20))
+        Recipe.objects.bulk_create(
+            Recipe(
+                title='Same title', description='Description',
+                preparation_time=1, preparation_time_unit='Minutos',
+                servings=1, servings_unit='Porções',
+                preparation_steps='Steps',
+            )
+            for _ in range(20)
+        )
+
+        tag_slugs = set(Tag.objects.values_list('slug', flat=True))
+        recipe_slugs = set(Recipe.objects.values_list('slug', flat=True))
+        self.assertEqual(len(tag_slugs), 20)
+        self.assertEqual(len(recipe_slugs), 20)
+        self.assertNotIn('', tag_slugs | recipe_slugs)
+
+    def test_bulk_create_draws_again_when_a_slug_is_taken_meanwhile(self):
+        with self.slug_taken_after_the_check():
+            tags = Tag.objects.bulk_create([Tag(name='Tag')])
+
+        self.assertEqual(tags[0].slug, 'tag-bbbbb')
+        self.assertEqual(
+            set(Tag.objects.values_list('slug', flat=True)),
+            {'tag-aaaaa', 'tag-bbbbb'},
+        )
+
+    def test_bulk_create_does_not_replace_slugs_given_by_the_caller(self):
+        Tag.objects.create(name='Tag', slug='my-slug')
+
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Tag.objects.bulk_create([Tag(name='Tag', slug='my-slug')])
+
+        self.assertEqual(Tag.objects.count(), 1)
+
+    def test_save_draws_again_when_the_slug_is_taken_meanwhile(self):
+        with self.slug_taken_after_the_check():
+            tag = Tag.objects.create(name='Tag')
+
+        self.assertEqual(tag.slug, 'tag-bbbbb')
+        self.assertEqual(Tag.objects.count(), 2)
+
+    @override_settings(DATABASE_ROUTERS=[ReadFromReplicaRouter()])
+    def test_slugs_are_checked_on_the_database_that_is_written(self):
+        tag = Tag.objects.create(name='Tag')
+        Tag.objects.bulk_create([Tag(name='Tag')])
+
+        self.assertTrue(tag.slug.startswith('tag-'))
+        self.assertEqual(
+            Tag.objects.using('default').filter(slug='').count(), 0
+        )
+
+    def test_save_allocates_slug_from_the_source_field(self):
+        tag = Tag.objects.create(name='My Tag')
+        self.assertRegex(tag.slug, r'^my-tag-[a-z0-9]{5}$')
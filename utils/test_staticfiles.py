@@ -0,0 +1,98 @@
+import json
+import os
+import shutil
+import tempfile
+from wsgiref.util import FileWrapper
+
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management import call_command
+from django.core.signals import request_finished, request_started
+from django.db import close_old_connections
+from django.test import (Client, RequestFactory, SimpleTestCase,
+                         override_settings)
+
+
+class RecordingFileWrapper(FileWrapper):
+    used = False
+
+    def __init__(self, *args, **kwargs):
+        type(self).used = True
+        super().__init__(*args, **kwargs)
+
+
+class ManifestStaticFilesStorageTest(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.static_root = tempfile.mkdtemp()
+        cls.addClassCleanup(shutil.rmtree, cls.static_root)
+        # Only the project files, the admin ones would make it slow
+        settings_override = override_settings(
+            STATIC_ROOT=cls.static_root,
+            STATICFILES_FINDERS=[
+                'django.contrib.staticfiles.finders.FileSystemFinder',
+            ],
+        )
+        settings_override.enable()
+        cls.addClassCleanup(settings_override.disable)
+        call_command('collectstatic', interactive=False, verbosity=0)
+
+        with open(os.path.join(cls.static_root, 'staticfiles.json')) as file:
+            cls.manifest = json.load(file)['paths']
+
+    def test_collectstatic_fingerprints_the_assets(self):
+        for name in (
+            'global/css/styles.css', 'global/css/global-style.css',
+            'global/js/scripts.js',
+        ):
+            self.assertNotEqual(self.manifest[name], name)
+
+    def test_collectstatic_precompresses_the_assets(self):
+        # global-style.css is empty, compressing it would not pay off
+        for name in 'global/css/styles.css', 'global/js/scripts.js':
+            hashed_name = self.manifest[name]
+
+            for suffix in '', '.gz', '.br':
+                self.assertTrue(os.path.exists(
+                    os.path.join(self.static_root, hashed_name + suffix)
+                ))
+
+    def test_url_uses_the_fingerprinted_name(self):
+        self.assertEqual(
+            staticfiles_storage.url('global/js/scripts.js'),
+            '/static/' + self.manifest['global/js/scripts.js'],
+        )
+
+    def test_url_falls_back_to_the_plain_name_outside_the_manifest(self):
+        self.assertEqual(
+            staticfiles_storage.url('global/css/not-collected.css'),
+            '/static/global/css/not-collected.css',
+        )
+
+    def test_fingerprinted_files_are_served_immutable_and_compressed(self):
+        url = staticfiles_storage.url('global/css/styles.css')
+        response = Client().get(url, HTTP_ACCEPT_ENCODING='gzip, br')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('immutable', response['Cache-Control'])
+        self.assertEqual(response['Content-Encoding'], 'br')
+
+    def test_static_files_are_handed_to_the_server_file_wrapper(self):
+        # gunicorn's file wrapper sends the file with sendfile()
+        url = staticfiles_storage.url('global/js/scripts.js')
+        environ = RequestFactory().get(url).environ
+        environ['wsgi.file_wrapper'] = RecordingFileWrapper
+        RecordingFileWrapper.used = False
+
+        # Like the test client, keeps the test database connection open
+        request_started.disconnect(close_old_connections)
+        request_finished.disconnect(close_old_connections)
+
+        try:
+            WSGIHandler()(environ, lambda status, headers: None).close()
+        finally:
+            request_started.connect(close_old_connections)
+            request_finished.connect(close_old_connections)
+
+        self.assertTrue(RecordingFileWrapper.used)
@@ -0,0 +1,43 @@
+from django.template import engines
+from django.test import SimpleTestCase
+
+from utils.warmup import get_template_dirs, get_translated_languages, warm_up
+
+
+class WarmUpTest(SimpleTestCase):
+    def test_warm_up_loads_resolvers_templates_and_translations(self):
+        timings = warm_up()
+
+        self.assertEqual(
+            list(timings), ['url resolvers', 'templates', 'translations']
+        )
+
+        for count, seconds in timings.values():
+            self.assertGreater(count, 0)
+            self.assertGreaterEqual(seconds, 0)
+
+    def test_warm_up_can_leave_the_templates_out(self):
+        self.assertEqual(
+            list(warm_up(templates=False)), ['url resolvers', 'translations']
+        )
+
+    def test_warm_up_compiles_the_project_templates(self):
+        warm_up()
+        loader = engines['django'].engine.template_loaders[0]
+
+        self.assertIn('global/base.html', loader.get_template_cache)
+
+    def test_template_dirs_include_the_app_directories(self):
+        directories = [
+            directory.as_posix()
+            for directory in get_template_dirs(engines['django'])
+        ]
+
+        self.assertTrue(directories[0].endswith('/base_templates'))
+        self.assertTrue(any(
+            directory.endswith('/recipes/templates')
+            for directory in directories
+        ))
+
+    def test_translated_languages_include_the_default_language(self):
+        self.assertIn('pt-br', get_translated_languages())
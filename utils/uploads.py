@@ -0,0 +1,199 @@
+import os
+import tempfile
+from io import BytesIO
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import (InMemoryUploadedFile,
+                                            TemporaryUploadedFile,
+                                            UploadedFile)
+from django.core.files.uploadhandler import (FileUploadHandler,
+                                             StopFutureHandlers)
+
+# Enough for the biggest EXIF/ICC blocks that come before the image size.
+# The header is parsed once, when this much arrived or the file ended.
+HEADER_MAX_BYTES = 512 * 1024
+
+
+class CoverUploadedFile(TemporaryUploadedFile):
+    """Temporary upload created under COVER_UPLOAD_TEMP_DIR.
+
+    That directory lives on the same filesystem as MEDIA_ROOT, so
+    FileSystemStorage moves the file into place with a rename instead of
+    copying it.
+    """
+
+    def __init__(self, name, content_type, size, charset,
+                 content_type_extra=None):
+        _, ext = os.path.splitext(name)
+        os.makedirs(settings.COVER_UPLOAD_TEMP_DIR, exist_ok=True)
+        file = tempfile.NamedTemporaryFile(
+            suffix='.upload' + ext, dir=settings.COVER_UPLOAD_TEMP_DIR,
+        )
+        UploadedFile.__init__(
+            self, file, name, content_type, size, charset,
+            content_type_extra,
+        )
+        self.image_size = None
+
+
+class RejectedCoverUpload(InMemoryUploadedFile):
+    """Empty placeholder for a cover refused while it was streamed."""
+
+    def __init__(self, name, content_type, charset, upload_error):
+        super().__init__(
+            BytesIO(), 'cover', name, content_type, 0, charset,
+        )
+        self.upload_error = upload_error
+
+
+def get_max_bytes_error():
+    max_mb = settings.COVER_UPLOAD_MAX_BYTES / 1024 / 1024
+    return f'Cover must be smaller than {max_mb:.1f} MB'
+
+
+def get_dimensions_error():
+    return (
+        'Cover must be at most '
+        f'{settings.COVER_UPLOAD_MAX_WIDTH}x'
+        f'{settings.COVER_UPLOAD_MAX_HEIGHT} pixels'
+    )
+
+
+def validate_cover_upload(upload):
+    """Raises ValidationError for covers over the size or dimension limits.
+
+    Covers that went through CoverUploadHandler were already checked while
+    streaming, the others are checked here from their size and header.
+    """
+    if not upload:
+        return
+
+    upload_error = getattr(upload, 'upload_error', None)
+
+    if upload_error:
+        raise ValidationError(upload_error, code='invalid_cover')
+
+    if upload.size and upload.size > settings.COVER_UPLOAD_MAX_BYTES:
+        raise ValidationError(get_max_bytes_error(), code='invalid_cover')
+
+    image_size = getattr(upload, 'image_size', None)
+
+    if image_size is None and hasattr(upload, 'seek'):
+        # Imported here so Pillow is only loaded when a cover is uploaded
+        from PIL import Image
+
+        try:
+            with Image.open(upload) as image:
+                image_size = image.size
+        except Image.DecompressionBombError:
+            raise ValidationError(get_dimensions_error(), code='invalid_cover')
+        except Exception:
+            # Invalid images are reported by the ImageField itself
+            return
+        finally:
+            upload.seek(0)
+
+    width, height = image_size
+
+    if width > settings.COVER_UPLOAD_MAX_WIDTH \
+            or height > settings.COVER_UPLOAD_MAX_HEIGHT:
+        raise ValidationError(get_dimensions_error(), code='invalid_cover')
+
+
+class CoverUploadHandler(FileUploadHandler):
+    """Streams cover uploads straight next to their final location.
+
+    The byte limit is enforced chunk by chunk and the image dimensions are
+    read from the first HEADER_MAX_BYTES, so oversized covers are refused
+    before they are fully written or decoded. Fields that are not listed in
+    COVER_UPLOAD_FIELDS are left to the next handlers. Forms must validate
+    those fields with validate_cover_upload (CoverImageField), a plain
+    ImageField reports a refused cover as an empty file.
+    """
+
+    def new_file(self, field_name, *args, **kwargs):
+        super().new_file(field_name, *args, **kwargs)
+        self.active = field_name in settings.COVER_UPLOAD_FIELDS
+
+        if not self.active:
+            return
+
+        self.upload_error = None
+        self.header = b''
+        self.file = CoverUploadedFile(
+            self.file_name, self.content_type, 0, self.charset,
+            self.content_type_extra,
+        )
+        raise StopFutureHandlers()
+
+    def reject(self, upload_error):
+        self.upload_error = upload_error
+        self.file.close()
+
+    def check_header(self):
+        from PIL import Image
+
+        try:
+            with Image.open(BytesIO(self.header)) as image:
+                self.file.image_size = image.size
+        except Image.DecompressionBombError:
+            self.reject(get_dimensions_error())
+            return
+        except Exception:
+            self.reject('Upload a valid image')
+            return
+        finally:
+            self.header = b''
+
+        width, height = self.file.image_size
+
+        if width > settings.COVER_UPLOAD_MAX_WIDTH \
+                or height > settings.COVER_UPLOAD_MAX_HEIGHT:
+            self.reject(get_dimensions_error())
+
+    def receive_data_chunk(self, raw_data, start):
+        if not self.active:
+            return raw_data
+
+        # Keep draining the stream but stop storing a refused cover
+        if self.upload_error:
+            return None
+
+        if start + len(raw_data) > settings.COVER_UPLOAD_MAX_BYTES:
+            self.reject(get_max_bytes_error())
+            return None
+
+        if self.file.image_size is None:
+            self.header += raw_data
+
+            if len(self.header) >= HEADER_MAX_BYTES:
+                self.check_header()
+
+                if self.upload_error:
+                    return None
+
+        self.file.write(raw_data)
+        return None
+
+    def file_complete(self, file_size):
+        if not self.active:
+            return None
+
+        # Smaller than HEADER_MAX_BYTES, the whole file is the header
+        if self.file.image_size is None and not self.upload_error:
+            self.check_header()
+
+        if self.upload_error:
+            return RejectedCoverUpload(
+                self.file_name, self.content_type, self.charset,
+                self.upload_error,
+            )
+
+        self.file.seek(0)
+        self.file.size = file_size
+        return self.file
+
+    def upload_interrupted(self):
+        if getattr(self, 'active', False):
+            self.file.close()
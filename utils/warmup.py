@@ -0,0 +1,124 @@
+import os
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.template import TemplateDoesNotExist, TemplateSyntaxError, engines
+from django.urls import get_resolver
+from django.utils import translation
+from django.utils.translation import to_language
+
+
+def warm_url_resolvers():
+    """Builds the reverse lookup tables of every namespace."""
+    resolvers = [get_resolver()]
+    count = 0
+
+    while resolvers:
+        resolver = resolvers.pop()
+        # Reading reverse_dict populates the resolver
+        count += len(resolver.reverse_dict)
+        resolvers.extend(
+            namespace_resolver
+            for _, namespace_resolver in resolver.namespace_dict.values()
+        )
+
+    return count
+
+
+def iter_template_names(directory):
+    for root, dirs, files in os.walk(directory):
+        dirs[:] = [name for name in dirs if not name.startswith('.')]
+
+        for file_name in files:
+            if file_name.endswith(('.html', '.txt', '.xml', '.jinja')):
+                path = Path(root, file_name)
+                yield path.relative_to(directory).as_posix()
+
+
+def get_template_dirs(engine):
+    """Directories searched by a template engine, app dirs included."""
+    django_engine = getattr(engine, 'engine', None)
+
+    if django_engine is None:
+        return list(engine.template_dirs)
+
+    # With explicit loaders APP_DIRS is off and engine.template_dirs leaves
+    # the app directories out, the loaders know every directory
+    directories = []
+
+    for loader in django_engine.template_loaders:
+        for directory in loader.get_dirs():
+            if directory not in directories:
+                directories.append(directory)
+
+    return directories
+
+
+def warm_templates():
+    """Loads and compiles every template of every engine.
+
+    Only useful with a caching loader, which keeps the compiled templates
+    for the life of the process.
+    """
+    count = 0
+
+    for engine in engines.all():
+        for directory in get_template_dirs(engine):
+            for name in iter_template_names(directory):
+                try:
+                    engine.get_template(name)
+                except (TemplateDoesNotExist, TemplateSyntaxError):
+                    # Partials that only work included from elsewhere
+                    continue
+                count += 1
+
+    return count
+
+
+def get_translated_languages():
+    languages = {settings.LANGUAGE_CODE}
+
+    for locale_path in settings.LOCALE_PATHS:
+        if os.path.isdir(locale_path):
+            languages.update(
+                to_language(name) for name in os.listdir(locale_path)
+                if not name.startswith('.')
+            )
+
+    return sorted(languages)
+
+
+def warm_translations():
+    """Loads the catalogs of the project languages."""
+    languages = get_translated_languages()
+
+    for language in languages:
+        with translation.override(language):
+            translation.gettext('')
+
+    return len(languages)
+
+
+def warm_up(templates=True):
+    """Runs every warm-up step, returns {step: (count, seconds)}.
+
+    Meant to run once in the gunicorn master (preload_app) so the work is
+    done before forking and its memory is shared by every worker. Pass
+    ``templates=False`` when project/wsgi.py already warmed them up
+    (TEMPLATES_WARMUP).
+    """
+    timings = {}
+    steps = [('url resolvers', warm_url_resolvers)]
+
+    if templates:
+        steps.append(('templates', warm_templates))
+
+    steps.append(('translations', warm_translations))
+
+    for name, step in steps:
+        start = time.perf_counter()
+        count = step()
+        timings[name] = (count, time.perf_counter() - start)
+
+    return timings